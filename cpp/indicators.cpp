@@ -1,6 +1,16 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/numpy.h>
+#include <pybind11/stl.h>
+#include <algorithm>
+#include <atomic>
+#include <cmath>
+#include <cstdint>
+#include <limits>
+#include <optional>
 #include <stdexcept>
+#include <string>
+#include <thread>
+#include <utility>
 #include <vector>
 
 namespace py = pybind11;
@@ -8,6 +18,22 @@ namespace py = pybind11;
 // Simple EMA implementation that matches a common "adjust=False" style:
 // ema[0] = x[0]
 // ema[t] = alpha*x[t] + (1-alpha)*ema[t-1]
+static void ema_row(const double *in, double *out, size_t n, int span)
+{
+    if (n == 0)
+    {
+        return;
+    }
+
+    const double alpha = 2.0 / (static_cast<double>(span) + 1.0);
+
+    out[0] = in[0];
+    for (size_t i = 1; i < n; i++)
+    {
+        out[i] = alpha * in[i] + (1.0 - alpha) * out[i - 1];
+    }
+}
+
 static py::array_t<double> ema_1d(py::array_t<double, py::array::c_style | py::array::forcecast> x,
                                   int span)
 {
@@ -22,29 +48,721 @@ static py::array_t<double> ema_1d(py::array_t<double, py::array::c_style | py::a
         throw std::invalid_argument("x must be a 1D array");
     }
 
-    const auto n = static_cast<size_t>(buf.shape[0]);
     py::array_t<double> out(buf.shape[0]);
-    auto out_buf = out.request();
+    ema_row(static_cast<const double *>(buf.ptr), out.mutable_data(), static_cast<size_t>(buf.shape[0]), span);
+    return out;
+}
 
-    auto *in_ptr = static_cast<double *>(buf.ptr);
-    auto *out_ptr = static_cast<double *>(out_buf.ptr);
+// EMA of every row of x (rows x n) for every span: out[r, k, :] is
+// ema(x[r, :], spans[k]), the same recursion as ema_1d. The (row, span) series
+// are handed out to `threads` worker threads (0 = hardware concurrency) with
+// the GIL released.
+static py::array_t<double> ema_batch(py::array_t<double, py::array::c_style | py::array::forcecast> x,
+                                     const std::vector<int> &spans,
+                                     int threads)
+{
+    for (const int span : spans)
+    {
+        if (span <= 0)
+        {
+            throw std::invalid_argument("span must be > 0");
+        }
+    }
+    if (threads < 0)
+    {
+        throw std::invalid_argument("threads must be >= 0");
+    }
 
-    if (n == 0)
+    auto buf = x.request();
+    if (buf.ndim != 2)
     {
-        return out;
+        throw std::invalid_argument("x must be a 2D array (rows x bars)");
     }
+    const auto rows = static_cast<size_t>(buf.shape[0]);
+    const auto n = static_cast<size_t>(buf.shape[1]);
+    const size_t n_spans = spans.size();
 
-    const double alpha = 2.0 / (static_cast<double>(span) + 1.0);
+    py::array_t<double> out({static_cast<py::ssize_t>(rows), static_cast<py::ssize_t>(n_spans),
+                             static_cast<py::ssize_t>(n)});
+    const double *in = static_cast<const double *>(buf.ptr);
+    double *o = out.mutable_data();
 
-    out_ptr[0] = in_ptr[0];
-    for (size_t i = 1; i < n; i++)
+    const size_t tasks = rows * n_spans;
+    size_t n_threads = threads == 0 ? std::thread::hardware_concurrency() : static_cast<size_t>(threads);
+    n_threads = std::max<size_t>(1, std::min(n_threads, tasks));
+
+    {
+        py::gil_scoped_release release;
+
+        std::atomic<size_t> next{0};
+        auto work = [&]()
+        {
+            for (size_t t = next.fetch_add(1); t < tasks; t = next.fetch_add(1))
+            {
+                const size_t r = t / n_spans, k = t % n_spans;
+                ema_row(in + r * n, o + t * n, n, spans[k]);
+            }
+        };
+
+        std::vector<std::thread> pool;
+        pool.reserve(n_threads - 1);
+        for (size_t i = 1; i < n_threads; i++)
+        {
+            pool.emplace_back(work);
+        }
+        work();
+        for (auto &th : pool)
+        {
+            th.join();
+        }
+    }
+    return out;
+}
+
+using DoubleArray = py::array_t<double, py::array::c_style | py::array::forcecast>;
+
+// Reason bits, one per ReasonCode in declaration order (src/strategies/v1/spec.py).
+namespace reason_bits
+{
+constexpr uint32_t ENTRY_CROSS = 1u << 1;
+constexpr uint32_t VOL_CONFIRM = 1u << 2;
+constexpr uint32_t ORDER_PLACED = 1u << 4;
+constexpr uint32_t LIMIT_FILLED = 1u << 5;
+constexpr uint32_t STOP = 1u << 7;
+constexpr uint32_t TAKE_PROFIT = 1u << 8;
+constexpr uint32_t TIME_STOP = 1u << 9;
+} // namespace reason_bits
+
+static const double *column_ptr(const DoubleArray &x, size_t n, const char *name)
+{
+    auto buf = x.request();
+    if (buf.ndim != 1 || static_cast<size_t>(buf.shape[0]) != n)
+    {
+        throw std::invalid_argument(std::string(name) + " must be a 1D array with the same length as the other inputs");
+    }
+    return static_cast<const double *>(buf.ptr);
+}
+
+template <typename T>
+static py::array_t<T> to_array(const std::vector<T> &v)
+{
+    py::array_t<T> out(static_cast<py::ssize_t>(v.size()));
+    std::copy(v.begin(), v.end(), out.mutable_data());
+    return out;
+}
+
+// v1 long-only state machine, bar for bar the same as run_backtest_v1:
+//   FLAT:          trend (ema50 > ema200) on bar i, close crosses above vwap between
+//                  i-1 and i, optional vol_ratio confirm => limit at vwap[i]
+//   ORDER_PENDING: fill if low <= limit <= high, else age; expire at age >= expiry
+//   IN_POSITION:   stop first, then take profit, then optional time stop (close)
+// Returns columns: entry_idx, exit_idx, entry_px, exit_px, reasons (bitmask).
+static py::dict backtest_v1(DoubleArray high,
+                            DoubleArray low,
+                            DoubleArray close,
+                            DoubleArray vwap,
+                            DoubleArray atr,
+                            DoubleArray ema50,
+                            DoubleArray ema200,
+                            std::optional<DoubleArray> vol_ratio,
+                            int limit_expiry_bars,
+                            double atr_stop_mult,
+                            double take_profit_r,
+                            std::optional<int> time_stop_bars,
+                            std::optional<double> min_vol_ratio)
+{
+    auto hbuf = high.request();
+    if (hbuf.ndim != 1)
+    {
+        throw std::invalid_argument("high must be a 1D array");
+    }
+    const auto n = static_cast<size_t>(hbuf.shape[0]);
+
+    const double *hi = static_cast<const double *>(hbuf.ptr);
+    const double *lo = column_ptr(low, n, "low");
+    const double *cl = column_ptr(close, n, "close");
+    const double *vw = column_ptr(vwap, n, "vwap");
+    const double *at = column_ptr(atr, n, "atr");
+    const double *e50 = column_ptr(ema50, n, "ema50");
+    const double *e200 = column_ptr(ema200, n, "ema200");
+    const double *vr = vol_ratio ? column_ptr(*vol_ratio, n, "vol_ratio") : nullptr;
+
+    const bool need_vol = min_vol_ratio.has_value();
+    const double min_vol = need_vol ? *min_vol_ratio : 0.0;
+    const bool has_time_stop = time_stop_bars.has_value();
+    const long time_stop = has_time_stop ? *time_stop_bars : 0;
+
+    uint32_t filled_bits = reason_bits::ENTRY_CROSS | reason_bits::ORDER_PLACED | reason_bits::LIMIT_FILLED;
+    if (need_vol)
+    {
+        filled_bits |= reason_bits::VOL_CONFIRM;
+    }
+
+    std::vector<int64_t> entry_idx, exit_idx;
+    std::vector<double> entry_px, exit_px;
+    std::vector<uint32_t> reasons;
+
+    {
+        py::gil_scoped_release release;
+
+        enum
+        {
+            FLAT,
+            ORDER_PENDING,
+            IN_POSITION
+        } state = FLAT;
+
+        double limit_px = 0.0, stop_px = 0.0, tp_px = 0.0;
+        long age = 0, hold = 0;
+        size_t fill_i = 0;
+
+        for (size_t i = 1; i < n; i++)
+        {
+            if (state == IN_POSITION)
+            {
+                hold += 1;
+                double px = 0.0;
+                uint32_t bit = 0;
+                if (lo[i] <= stop_px)
+                {
+                    px = stop_px;
+                    bit = reason_bits::STOP;
+                }
+                else if (hi[i] >= tp_px)
+                {
+                    px = tp_px;
+                    bit = reason_bits::TAKE_PROFIT;
+                }
+                else if (has_time_stop && hold >= time_stop)
+                {
+                    px = cl[i];
+                    bit = reason_bits::TIME_STOP;
+                }
+                if (bit != 0)
+                {
+                    entry_idx.push_back(static_cast<int64_t>(fill_i));
+                    exit_idx.push_back(static_cast<int64_t>(i));
+                    entry_px.push_back(limit_px);
+                    exit_px.push_back(px);
+                    reasons.push_back(filled_bits | bit);
+                    state = FLAT;
+                }
+                continue;
+            }
+
+            if (state == ORDER_PENDING)
+            {
+                if (lo[i] <= limit_px && limit_px <= hi[i])
+                {
+                    const double a = at[i];
+                    if (a <= 0)
+                    {
+                        throw std::invalid_argument("ATR must be > 0 to compute brackets.");
+                    }
+                    stop_px = limit_px - atr_stop_mult * a;
+                    const double r = limit_px - stop_px;
+                    tp_px = limit_px + take_profit_r * r;
+                    fill_i = i;
+                    hold = 0;
+                    state = IN_POSITION;
+                    continue;
+                }
+                age += 1;
+                if (age >= limit_expiry_bars)
+                {
+                    state = FLAT;
+                }
+                continue;
+            }
+
+            // FLAT
+            if (!(e50[i] > e200[i]))
+            {
+                continue;
+            }
+            if (!(cl[i - 1] <= vw[i - 1] && cl[i] > vw[i]))
+            {
+                continue;
+            }
+            if (need_vol && (vr == nullptr || vr[i] < min_vol))
+            {
+                continue;
+            }
+            limit_px = vw[i];
+            age = 0;
+            state = ORDER_PENDING;
+        }
+    }
+
+    py::dict out;
+    out["entry_idx"] = to_array(entry_idx);
+    out["exit_idx"] = to_array(exit_idx);
+    out["entry_px"] = to_array(entry_px);
+    out["exit_px"] = to_array(exit_px);
+    out["reasons"] = to_array(reasons);
+    return out;
+}
+
+// pandas ewm(adjust=False, ignore_na=False) recursion, step for step as in
+// pandas' window aggregations (com-based alpha, weight decay across NaNs), so
+// results have the same bits as Series.ewm(...).mean().
+struct EwmAdjustFalse
+{
+    double alpha;
+    double old_wt_factor;
+    long min_periods;
+    double weighted = std::numeric_limits<double>::quiet_NaN();
+    double old_wt = 1.0;
+    long nobs = 0;
+    bool started = false;
+
+    EwmAdjustFalse(double com, long minp)
+        : alpha(1.0 / (1.0 + com)), old_wt_factor(1.0 - 1.0 / (1.0 + com)), min_periods(minp)
+    {
+    }
+
+    double step(double cur)
+    {
+        const bool is_obs = cur == cur;
+        nobs += is_obs ? 1 : 0;
+        if (!started)
+        {
+            weighted = cur;
+            started = true;
+        }
+        else if (weighted == weighted)
+        {
+            old_wt *= old_wt_factor;
+            if (is_obs)
+            {
+                if (weighted != cur)
+                {
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha);
+                }
+                old_wt = 1.0;
+            }
+        }
+        else if (is_obs)
+        {
+            weighted = cur;
+        }
+        return nobs >= min_periods ? weighted : std::numeric_limits<double>::quiet_NaN();
+    }
+};
+
+// Center of mass pandas derives from ewm(alpha=1/window) (Wilder smoothing).
+static double wilder_com(long window)
+{
+    return 1.0 / (1.0 / static_cast<double>(window)) - 1.0;
+}
+
+// Window statistics from power-of-two blocks anchored at the window start
+// (window 20 = 16 bars, then 4), as fast_indicators.window_sums/window_std.
+// Level k holds every 2**k-bar block, merged from two level k-1 halves; a
+// window merges its blocks left to right. Blocks are shared by overlapping
+// windows, so a bar costs O(log window), yet each window's value depends on
+// its own bars alone, however the bars are chunked. Levels are built per
+// chunk of output positions as plain array loops (no serial dependency).
+template <typename Stat>
+class WindowBlocks
+{
+public:
+    explicit WindowBlocks(size_t window) : window_(window)
+    {
+        while ((size_t{1} << (top_ + 1)) <= window)
+        {
+            top_++;
+        }
+        for (size_t k = 1; k <= top_; k++)
+        {
+            const double half = static_cast<double>(size_t{1} << (k - 1));
+            level_merge_.push_back(Stat::weights(half, half));
+        }
+        double count = static_cast<double>(size_t{1} << top_);
+        for (size_t k = top_; k-- > 0;)
+        {
+            if ((window >> k) & 1)
+            {
+                const double part = static_cast<double>(size_t{1} << k);
+                window_merge_.push_back({k, Stat::weights(count, part)});
+                count += part;
+            }
+        }
+        levels_.resize(top_ + 1);
+    }
+
+    // emit(i, stat) for every full window ending at i in [first, last), in
+    // order; bar(j) is bar j's own stat.
+    template <typename Bar, typename Emit>
+    void run(size_t first, size_t last, Bar bar, Emit emit)
+    {
+        first = std::max(first, window_ - 1);
+        if (first >= last)
+        {
+            return;
+        }
+        const size_t m = last - first;
+        const size_t lo = first + 1 - window_;
+        size_t len = m + window_ - 1;
+        for (auto &level : levels_)
+        {
+            level.resize(len);
+        }
+        for (size_t p = 0; p < len; p++)
+        {
+            levels_[0][p] = bar(lo + p);
+        }
+        for (size_t k = 1; k <= top_; k++)
+        {
+            const size_t half = size_t{1} << (k - 1);
+            const Stat *prev = levels_[k - 1].data();
+            Stat *cur = levels_[k].data();
+            const auto &w = level_merge_[k - 1];
+            len -= half;
+            for (size_t p = 0; p < len; p++)
+            {
+                cur[p] = Stat::merge(prev[p], prev[p + half], w);
+            }
+        }
+        for (size_t t = 0; t < m; t++)
+        {
+            Stat out = levels_[top_][t];
+            size_t offset = size_t{1} << top_;
+            for (const auto &[k, w] : window_merge_)
+            {
+                out = Stat::merge(out, levels_[k][t + offset], w);
+                offset += size_t{1} << k;
+            }
+            emit(first + t, out);
+        }
+    }
+
+    // run() over [0, n) in chunks of WINDOW_CHUNK outputs (bounded scratch).
+    template <typename Bar, typename Emit>
+    void run_all(size_t n, Bar bar, Emit emit)
+    {
+        for (size_t first = 0; first < n; first += WINDOW_CHUNK)
+        {
+            run(first, std::min(n, first + WINDOW_CHUNK), bar, emit);
+        }
+    }
+
+    static constexpr size_t WINDOW_CHUNK = size_t{1} << 14;
+
+private:
+    size_t window_;
+    size_t top_ = 0;
+    std::vector<std::vector<Stat>> levels_;
+    std::vector<typename Stat::Weights> level_merge_;
+    std::vector<std::pair<size_t, typename Stat::Weights>> window_merge_;
+};
+
+struct WindowSum
+{
+    struct Weights
+    {
+    };
+
+    double sum;
+
+    static Weights weights(double, double)
+    {
+        return {};
+    }
+
+    static WindowSum merge(const WindowSum &a, const WindowSum &b, const Weights &)
+    {
+        return {a.sum + b.sum};
+    }
+};
+
+// (mean, M2) with Chan et al.'s pairwise merge (no raw sum of squares); the
+// count-dependent factors are fixed per merge, so they are computed once.
+struct WindowMoments
+{
+    struct Weights
+    {
+        double mean;  // nb / (na + nb)
+        double m2;    // na * nb / (na + nb)
+    };
+
+    double mean;
+    double m2;
+
+    static Weights weights(double na, double nb)
+    {
+        return {nb / (na + nb), na * nb / (na + nb)};
+    }
+
+    static WindowMoments merge(const WindowMoments &a, const WindowMoments &b, const Weights &w)
+    {
+        const double d = b.mean - a.mean;
+        return {a.mean + d * w.mean, a.m2 + b.m2 + d * d * w.m2};
+    }
+};
+
+// NaN for the bars before the first full window.
+static void fill_warmup(double *o, size_t n, size_t window)
+{
+    std::fill(o, o + std::min(n, window - 1), std::numeric_limits<double>::quiet_NaN());
+}
+
+static double sample_std(const WindowMoments &m, size_t window)
+{
+    return std::sqrt(m.m2 / (window - 1));
+}
+
+// max(|h-l|, |h-prev|, |l-prev|) skipping NaN, as pandas' max(axis=1);
+// prev is NaN on the first bar.
+static double true_range_at(const double *hi, const double *lo, const double *cl, size_t i)
+{
+    const double prev = i == 0 ? std::numeric_limits<double>::quiet_NaN() : cl[i - 1];
+    double tr = std::numeric_limits<double>::quiet_NaN();
+    for (const double part : {std::abs(hi[i] - lo[i]), std::abs(hi[i] - prev), std::abs(lo[i] - prev)})
+    {
+        if (part == part && !(tr >= part))
+        {
+            tr = part;
+        }
+    }
+    return tr;
+}
+
+// Wilder RSI step: updates the gain/loss averages with close[i] - close[i-1].
+static double rsi_step(EwmAdjustFalse &avg_gain, EwmAdjustFalse &avg_loss, const double *cl, size_t i)
+{
+    const double delta = i == 0 ? std::numeric_limits<double>::quiet_NaN() : cl[i] - cl[i - 1];
+    const double gain = delta < 0.0 ? 0.0 : delta;
+    const double loss = -delta < 0.0 ? 0.0 : -delta;
+    const double ag = avg_gain.step(gain);
+    const double al = avg_loss.step(loss);
+    return 100.0 - (100.0 / (1.0 + ag / al));
+}
+
+static double typical_pv_at(const double *hi, const double *lo, const double *cl, const double *vo, size_t j)
+{
+    return (hi[j] + lo[j] + cl[j]) / 3.0 * vo[j];
+}
+
+static size_t check_window(long window)
+{
+    if (window <= 0)
+    {
+        throw std::invalid_argument("window must be > 0");
+    }
+    return static_cast<size_t>(window);
+}
+
+static const double *vector_ptr(const DoubleArray &x, size_t &n, const char *name)
+{
+    auto buf = x.request();
+    if (buf.ndim != 1)
+    {
+        throw std::invalid_argument(std::string(name) + " must be a 1D array");
+    }
+    n = static_cast<size_t>(buf.shape[0]);
+    return static_cast<const double *>(buf.ptr);
+}
+
+// Rolling mean over full windows (NaN warm-up), as features.core.sma.
+static py::array_t<double> sma_1d(DoubleArray x, long window)
+{
+    const size_t w = check_window(window);
+    size_t n = 0;
+    const double *in = vector_ptr(x, n, "x");
+    py::array_t<double> out(static_cast<py::ssize_t>(n));
+    double *o = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        fill_warmup(o, n, w);
+        WindowBlocks<WindowSum>(w).run_all(
+            n, [&](size_t j) { return WindowSum{in[j]}; },
+            [&](size_t i, const WindowSum &s) { o[i] = s.sum / w; });
+    }
+    return out;
+}
+
+// Rolling sample std over full windows, as features.core.rolling_vol.
+static py::array_t<double> rolling_std_1d(DoubleArray x, long window)
+{
+    const size_t w = check_window(window);
+    size_t n = 0;
+    const double *in = vector_ptr(x, n, "x");
+    py::array_t<double> out(static_cast<py::ssize_t>(n));
+    double *o = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        fill_warmup(o, n, w);
+        WindowBlocks<WindowMoments>(w).run_all(
+            n, [&](size_t j) { return WindowMoments{in[j], 0.0}; },
+            [&](size_t i, const WindowMoments &m) { o[i] = sample_std(m, w); });
+    }
+    return out;
+}
+
+// Wilder RSI (ewm alpha=1/window, min_periods=window), as features.core.rsi.
+static py::array_t<double> rsi_1d(DoubleArray close, long window)
+{
+    check_window(window);
+    size_t n = 0;
+    const double *cl = vector_ptr(close, n, "close");
+    py::array_t<double> out(static_cast<py::ssize_t>(n));
+    double *o = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        EwmAdjustFalse avg_gain(wilder_com(window), window);
+        EwmAdjustFalse avg_loss(wilder_com(window), window);
+        for (size_t i = 0; i < n; i++)
+        {
+            o[i] = rsi_step(avg_gain, avg_loss, cl, i);
+        }
+    }
+    return out;
+}
+
+// True range, as features.core.true_range.
+static py::array_t<double> true_range_1d(DoubleArray high, DoubleArray low, DoubleArray close)
+{
+    size_t n = 0;
+    const double *cl = vector_ptr(close, n, "close");
+    const double *hi = column_ptr(high, n, "high");
+    const double *lo = column_ptr(low, n, "low");
+    py::array_t<double> out(static_cast<py::ssize_t>(n));
+    double *o = out.mutable_data();
     {
-        out_ptr[i] = alpha * in_ptr[i] + (1.0 - alpha) * out_ptr[i - 1];
+        py::gil_scoped_release release;
+        for (size_t i = 0; i < n; i++)
+        {
+            o[i] = true_range_at(hi, lo, cl, i);
+        }
     }
+    return out;
+}
 
+// Wilder ATR over the true range, as features.core.atr.
+static py::array_t<double> atr_1d(DoubleArray high, DoubleArray low, DoubleArray close, long window)
+{
+    check_window(window);
+    size_t n = 0;
+    const double *cl = vector_ptr(close, n, "close");
+    const double *hi = column_ptr(high, n, "high");
+    const double *lo = column_ptr(low, n, "low");
+    py::array_t<double> out(static_cast<py::ssize_t>(n));
+    double *o = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        EwmAdjustFalse avg(wilder_com(window), window);
+        for (size_t i = 0; i < n; i++)
+        {
+            o[i] = avg.step(true_range_at(hi, lo, cl, i));
+        }
+    }
     return out;
 }
 
+// Typical price x volume over volume, full windows, as features.core.rolling_vwap.
+static py::array_t<double> rolling_vwap_1d(DoubleArray high, DoubleArray low, DoubleArray close,
+                                           DoubleArray volume, long window)
+{
+    const size_t w = check_window(window);
+    size_t n = 0;
+    const double *cl = vector_ptr(close, n, "close");
+    const double *hi = column_ptr(high, n, "high");
+    const double *lo = column_ptr(low, n, "low");
+    const double *vo = column_ptr(volume, n, "volume");
+    py::array_t<double> out(static_cast<py::ssize_t>(n));
+    double *o = out.mutable_data();
+    {
+        py::gil_scoped_release release;
+        fill_warmup(o, n, w);
+        WindowBlocks<WindowSum>(w).run_all(
+            n, [&](size_t j) { return WindowSum{typical_pv_at(hi, lo, cl, vo, j)}; },
+            [&](size_t i, const WindowSum &s) { o[i] = s.sum; });
+        WindowBlocks<WindowSum>(w).run_all(
+            n, [&](size_t j) { return WindowSum{vo[j]}; },
+            [&](size_t i, const WindowSum &s) { o[i] = o[i] / s.sum; });
+    }
+    return out;
+}
+
+// Fused build_features kernel: every feature__* column in one sweep over the
+// bars (chunk by chunk: the recursions bar by bar, then the rolling columns
+// of the chunk from shared window blocks), written into rows of `out`
+// (8 x n), in CORE_FEATURES order:
+//   ret_1, vol_20, sma_20, ema_20, rsi_14, atr_14, vwap_20, vwap_dist_20
+// log_close is np.log(close), taken on the Python side so ret_1 uses the same
+// logarithm as the pandas path. Values match build_features bit for bit,
+// NaN warm-up included.
+static void core_features(DoubleArray high,
+                          DoubleArray low,
+                          DoubleArray close,
+                          DoubleArray log_close,
+                          DoubleArray volume,
+                          py::array_t<double, py::array::c_style> out)
+{
+    constexpr size_t WINDOW = 20;
+    constexpr long WILDER = 14;
+
+    size_t n = 0;
+    const double *cl = vector_ptr(close, n, "close");
+    const double *hi = column_ptr(high, n, "high");
+    const double *lo = column_ptr(low, n, "low");
+    const double *lc = column_ptr(log_close, n, "log_close");
+    const double *vo = column_ptr(volume, n, "volume");
+
+    auto obuf = out.request(true);
+    if (obuf.ndim != 2 || obuf.shape[0] != 8 || static_cast<size_t>(obuf.shape[1]) != n)
+    {
+        throw std::invalid_argument("out must be a C-contiguous (8, n) float64 array");
+    }
+    double *o = static_cast<double *>(obuf.ptr);
+    double *ret = o, *vol = o + n, *sma = o + 2 * n, *ema = o + 3 * n;
+    double *rsi = o + 4 * n, *atr = o + 5 * n, *vwap = o + 6 * n, *dist = o + 7 * n;
+
+    py::gil_scoped_release release;
+
+    EwmAdjustFalse ema_20((20 - 1) / 2.0, 20);
+    EwmAdjustFalse avg_gain(wilder_com(WILDER), WILDER);
+    EwmAdjustFalse avg_loss(wilder_com(WILDER), WILDER);
+    EwmAdjustFalse atr_14(wilder_com(WILDER), WILDER);
+    WindowBlocks<WindowMoments> ret_moments(WINDOW);
+    WindowBlocks<WindowSum> close_sum(WINDOW);
+    WindowBlocks<WindowSum> pv_sum(WINDOW);
+    WindowBlocks<WindowSum> v_sum(WINDOW);
+    fill_warmup(vol, n, WINDOW);
+    fill_warmup(sma, n, WINDOW);
+    fill_warmup(vwap, n, WINDOW);
+
+    const size_t chunk = WindowBlocks<WindowSum>::WINDOW_CHUNK;
+    for (size_t c0 = 0; c0 < n; c0 += chunk)
+    {
+        const size_t c1 = std::min(n, c0 + chunk);
+        for (size_t i = c0; i < c1; i++)
+        {
+            ret[i] = i == 0 ? std::numeric_limits<double>::quiet_NaN() : lc[i] - lc[i - 1];
+            ema[i] = ema_20.step(cl[i]);
+            rsi[i] = rsi_step(avg_gain, avg_loss, cl, i);
+            atr[i] = atr_14.step(true_range_at(hi, lo, cl, i));
+        }
+        ret_moments.run(
+            c0, c1, [&](size_t j) { return WindowMoments{ret[j], 0.0}; },
+            [&](size_t i, const WindowMoments &m) { vol[i] = sample_std(m, WINDOW); });
+        close_sum.run(
+            c0, c1, [&](size_t j) { return WindowSum{cl[j]}; },
+            [&](size_t i, const WindowSum &s) { sma[i] = s.sum / WINDOW; });
+        pv_sum.run(
+            c0, c1, [&](size_t j) { return WindowSum{typical_pv_at(hi, lo, cl, vo, j)}; },
+            [&](size_t i, const WindowSum &s) { vwap[i] = s.sum; });
+        v_sum.run(
+            c0, c1, [&](size_t j) { return WindowSum{vo[j]}; },
+            [&](size_t i, const WindowSum &s) { vwap[i] = vwap[i] / s.sum; });
+        for (size_t i = c0; i < c1; i++)
+        {
+            dist[i] = (cl[i] - vwap[i]) / cl[i];
+        }
+    }
+}
+
 PYBIND11_MODULE(_fast_indicators, m)
 {
     m.doc() = "Fast indicators implemented in C++ (pybind11)";
@@ -55,4 +773,66 @@ PYBIND11_MODULE(_fast_indicators, m)
         py::arg("x"),
         py::arg("span"),
         "Compute EMA for a 1D array (adjust=False style).");
-}
\ No newline at end of file
+
+    m.def(
+        "ema_batch",
+        &ema_batch,
+        py::arg("x"),
+        py::arg("spans"),
+        py::arg("threads") = 0,
+        "EMA of every row of a 2D array for every span -> (rows, spans, bars); "
+        "multithreaded with the GIL released.");
+
+    m.def(
+        "backtest_v1",
+        &backtest_v1,
+        py::arg("high"),
+        py::arg("low"),
+        py::arg("close"),
+        py::arg("vwap"),
+        py::arg("atr"),
+        py::arg("ema50"),
+        py::arg("ema200"),
+        py::arg("vol_ratio"),
+        py::arg("limit_expiry_bars"),
+        py::arg("atr_stop_mult"),
+        py::arg("take_profit_r"),
+        py::arg("time_stop_bars"),
+        py::arg("min_vol_ratio"),
+        "Run the v1 long-only backtest state machine (GIL released); returns trade columns.");
+
+    m.def(
+        "core_features",
+        &core_features,
+        py::arg("high"),
+        py::arg("low"),
+        py::arg("close"),
+        py::arg("log_close"),
+        py::arg("volume"),
+        py::arg("out"),
+        "Fill out (8, n) with the build_features columns in one pass (GIL released).");
+
+    m.def("sma", &sma_1d, py::arg("x"), py::arg("window"), "Rolling mean (full windows only).");
+    m.def("rolling_std",
+          &rolling_std_1d,
+          py::arg("x"),
+          py::arg("window"),
+          "Rolling sample std from window-local Chan merges (full windows only).");
+    m.def("rsi", &rsi_1d, py::arg("close"), py::arg("window"), "Wilder RSI.");
+    m.def("true_range", &true_range_1d, py::arg("high"), py::arg("low"), py::arg("close"), "True range.");
+    m.def("atr",
+          &atr_1d,
+          py::arg("high"),
+          py::arg("low"),
+          py::arg("close"),
+          py::arg("window"),
+          "Wilder ATR.");
+    m.def("rolling_vwap",
+          &rolling_vwap_1d,
+          py::arg("high"),
+          py::arg("low"),
+          py::arg("close"),
+          py::arg("volume"),
+          py::arg("window"),
+          "Rolling VWAP from typical price x volume (full windows only).");
+}
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure repo root is on sys.path so "import src" works when running this file directly.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from src import fast_indicators as fi
+
+
+def _python_loop(x: np.ndarray, span: int) -> np.ndarray:
+    # The per-element fallback fast_indicators.ema used before the blocked filter.
+    alpha = 2.0 / (float(span) + 1.0)
+    out = np.empty_like(x)
+    out[0] = x[0]
+    for i in range(1, x.size):
+        out[i] = alpha * x[i] + (1.0 - alpha) * out[i - 1]
+    return out
+
+
+def _best_of(fn: Callable[[], np.ndarray], repeat: int) -> tuple[float, np.ndarray]:
+    best = float("inf")
+    out = np.empty(0)
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="EMA: NumPy fallback vs C++ vs pandas ewm.")
+    ap.add_argument("--n", type=int, default=1_000_000)
+    ap.add_argument("--span", type=int, default=20)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--python-loop", action="store_true", help="Also time the old Python loop.")
+    args = ap.parse_args()
+
+    x = np.random.default_rng(0).normal(size=args.n).cumsum()
+    alpha = 2.0 / (args.span + 1.0)
+    scale = np.abs(x).max()
+
+    cases: dict[str, Callable[[], np.ndarray]] = {
+        "numpy fallback": lambda: fi._ema_blocked(x, alpha),
+        "pandas ewm": lambda: pd.Series(x).ewm(span=args.span, adjust=False).mean().to_numpy(),
+    }
+    if fi._cpp is not None:
+        cases["c++"] = lambda: fi._cpp.ema(x, args.span)
+    if args.python_loop:
+        cases["python loop"] = lambda: _python_loop(x, args.span)
+
+    results = {
+        name: _best_of(fn, 1 if name == "python loop" else args.repeat)
+        for name, fn in cases.items()
+    }
+    reference = results["c++"][1] if "c++" in results else results["pandas ewm"][1]
+
+    print(f"n={args.n} span={args.span} (best of {args.repeat})")
+    if "c++" not in results:
+        print("c++: _fast_indicators not built; errors are vs pandas ewm")
+    for name, (seconds, out) in results.items():
+        err = np.abs(out - reference).max() / scale
+        print(f"{name:>15}: {seconds * 1e3:9.2f} ms   max|err|/max|x| = {err:.2e}")
+    print(f"documented fallback tolerance: {fi.EMA_FALLBACK_RTOL:.0e} x max|x|")
+
+
+if __name__ == "__main__":
+    main()
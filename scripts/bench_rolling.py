@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure repo root is on sys.path so "import src" works when running this file directly.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from src import fast_indicators as fi
+
+
+def _best_of(fn: Callable[[], np.ndarray], repeat: int) -> tuple[float, np.ndarray]:
+    best = float("inf")
+    out = np.empty(0)
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _two_pass_reference(x: np.ndarray, window: int) -> dict[str, np.ndarray]:
+    # Per-window sum and two-pass sample std, in chunks (accurate to ~1e-16).
+    windows = np.lib.stride_tricks.sliding_window_view(x, window)
+    sums = np.full(x.shape[0], np.nan)
+    std = np.full(x.shape[0], np.nan)
+    step = max(1, 2_000_000 // window)
+    for lo in range(0, windows.shape[0], step):
+        v = windows[lo : lo + step]
+        sums[window - 1 + lo : window - 1 + lo + v.shape[0]] = v.sum(axis=1)
+        dev = v - v.mean(axis=1, keepdims=True)
+        std[window - 1 + lo : window - 1 + lo + v.shape[0]] = np.sqrt(
+            (dev * dev).sum(axis=1) / (window - 1)
+        )
+    return {"sum": sums, "std": std}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Rolling mean/std: window-local NumPy fallback vs C++ vs pandas rolling."
+    )
+    ap.add_argument("--n", type=int, default=1_000_000)
+    ap.add_argument("--windows", type=int, nargs="+", default=[20, 50, 200])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    # A price-like random walk: large mean, small per-window spread.
+    x = np.random.default_rng(0).normal(size=args.n).cumsum() + 1_000.0
+    s = pd.Series(x)
+
+    print(f"n={args.n} (best of {args.repeat})")
+    if fi._cpp is None:
+        print("c++: _fast_indicators not built")
+    for window in args.windows:
+        cases: dict[str, Callable[[], np.ndarray]] = {
+            "sum: pandas rolling": lambda w=window: s.rolling(w).sum().to_numpy(),
+            "sum: numpy fallback": lambda w=window: fi.window_sums(x, w),
+            "std: pandas rolling": lambda w=window: s.rolling(w).std().to_numpy(),
+            "std: numpy fallback": lambda w=window: fi.window_std(x, w),
+        }
+        if fi._cpp is not None:
+            cases["sum: c++ (sma x window)"] = lambda w=window: fi._cpp.sma(x, w) * w
+            cases["std: c++"] = lambda w=window: fi._cpp.rolling_std(x, w)
+
+        print(f"window={window}")
+        reference = _two_pass_reference(x, window)
+        results = {name: _best_of(fn, args.repeat) for name, fn in cases.items()}
+        for name, (seconds, out) in sorted(results.items()):
+            ref = reference[name.split(":")[0]]
+            err = np.nanmax(np.abs(out - ref) / np.abs(ref))
+            print(f"{name:>25}: {seconds * 1e3:9.2f} ms   max rel err vs two-pass = {err:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,13 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from src.features.core import build_features  # noqa: E402
+from src.features.core import (  # noqa: E402
+    FeatureState,
+    build_features,
+    build_features_incremental,
+)
+
+DEFAULT_STATE_DIR = REPO_ROOT / "data" / "processed" / "feature_state"
 
 FEATURE_DEFS: list[tuple[str, str, dict]] = [
     ("ret_1", "Log return: log(close).diff()", {"kind": "return", "window": 1}),
@@ -145,6 +151,23 @@ def write_feature_values(
     return len(rows)
 
 
+def state_path(state_dir: Path, exchange: str, symbol: str, timeframe: str) -> Path:
+    return Path(state_dir) / f"{exchange}_{symbol}_{timeframe}.json"
+
+
+def load_feature_state(path: Path) -> FeatureState | None:
+    if not path.exists():
+        return None
+    return FeatureState.from_dict(json.loads(path.read_text()))
+
+
+def save_feature_state(path: Path, state: FeatureState) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state.to_dict()))
+    os.replace(tmp, path)
+
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument("--exchange", default="binance")
@@ -152,8 +175,20 @@ def main():
     p.add_argument("--timeframe", default="1h")
     p.add_argument("--start", default=None, help="ISO timestamp, e.g. 2026-01-01T00:00:00Z")
     p.add_argument("--end", default=None, help="ISO timestamp, e.g. 2026-01-10T00:00:00Z")
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only compute/upsert bars after the saved watermark (state in --state-dir).",
+    )
+    p.add_argument("--state-dir", default=str(DEFAULT_STATE_DIR))
     args = p.parse_args()
 
+    state_file = state_path(Path(args.state_dir), args.exchange, args.symbol, args.timeframe)
+    state = load_feature_state(state_file) if args.incremental else None
+    start = args.start
+    if state is not None and state.watermark is not None:
+        start = state.watermark.isoformat()
+
     conn = connect()
     conn.autocommit = False
 
@@ -161,19 +196,28 @@ def main():
         with conn.cursor() as cur:
             instrument_id = get_instrument_id(cur, args.exchange, args.symbol)
 
-            df = fetch_bars(cur, instrument_id, args.timeframe, args.start, args.end)
-            if df.empty:
+            df = fetch_bars(cur, instrument_id, args.timeframe, start, args.end)
+            if df.empty and state is None:
                 raise ValueError("No bars returned for that instrument/timeframe/date range.")
 
             name_to_id = upsert_feature_defs(cur)
             conn.commit()
 
-        df_feat = build_features(df)
+        if args.incremental:
+            df_feat, new_state = build_features_incremental(df, state)
+        else:
+            df_feat = build_features(df)
 
-        inserted = write_feature_values(conn, instrument_id, args.timeframe, df_feat, name_to_id)
+        inserted = 0
+        if not df_feat.empty:
+            inserted = write_feature_values(
+                conn, instrument_id, args.timeframe, df_feat, name_to_id
+            )
         conn.commit()
+        if args.incremental:
+            save_feature_state(state_file, new_state)
 
-        print(f"OK: bars={len(df)} feature_values_upserted={inserted}")
+        print(f"OK: bars={len(df_feat)} feature_values_upserted={inserted}")
 
     except Exception:
         conn.rollback()
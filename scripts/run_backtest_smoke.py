@@ -11,9 +11,10 @@ import pandas as pd
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
 
-from src.backtest.costs import apply_costs
 from src.backtest.engine import run_backtest_v1
-from src.backtest.metrics import compute_metrics, metrics_to_dict
+from src.backtest.metrics import metrics_to_dict
+from src.backtest.sweep import cost_sweep
+from src.backtest.types import TradeTable
 from src.config.loader import load_yaml
 from src.strategies.v1.entry import EntryRuleParams
 from src.strategies.v1.spec import StrategyParams
@@ -103,30 +104,22 @@ def main() -> None:
 
     index_rows: list[dict[str, object]] = []
 
-    for i, m in enumerate(multipliers):
-        m = float(m)
-        strat_params = StrategyParams(
-            limit_expiry_bars=base_params.limit_expiry_bars,
-            atr_stop_mult=base_params.atr_stop_mult,
-            take_profit_r=base_params.take_profit_r,
-            time_stop_bars=base_params.time_stop_bars,
-            maker_fee_bps=base_params.maker_fee_bps * m,
-            taker_fee_bps=base_params.taker_fee_bps * m,
-            slippage_bps=base_params.slippage_bps * m,
-        )
-
-        trades = run_backtest_v1(
-            df,
-            symbol="SMOKE",
-            params=strat_params,
-            entry_params=EntryRuleParams(min_vol_ratio=None),
-        )
-
-        pnl_rows = [apply_costs(t, strat_params) for t in trades]
-        net_pnls = [r.net_pnl for r in pnl_rows]
-        metrics = compute_metrics(net_pnls)
+    # Costs never change which trades happen: run the engine once and cost
+    # the same trades under every multiplier.
+    trades = run_backtest_v1(
+        df,
+        symbol="SMOKE",
+        params=base_params,
+        entry_params=EntryRuleParams(min_vol_ratio=None),
+    )
+    multipliers = [float(m) for m in multipliers]
+    sweep = cost_sweep(TradeTable.from_trades(trades), base_params, multipliers)
+    sweep_metrics = sweep.metrics()
 
-        out_df = pd.DataFrame([r.__dict__ for r in pnl_rows])
+    for i, m in enumerate(multipliers):
+        strat_params = sweep.params_for(i)
+        metrics = sweep_metrics[i]
+        out_df = sweep.pnl_frame(i)
 
         trades_path = out_dir / f"trades_{m:.1f}x.csv"
         summary_path = out_dir / f"summary_{m:.1f}x.json"
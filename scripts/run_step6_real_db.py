@@ -14,9 +14,17 @@ from sqlalchemy import text
 REPO_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(REPO_ROOT))
 
-from src.backtest.grid import run_walkforward_abc
-from src.backtest.splits import make_abc_split_by_ts
+from src.backtest.arrays import BarArrays
+from src.backtest.cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ResultCache
+from src.backtest.checkpoint import DEFAULT_CHECKPOINT_DIR, GridCheckpoint, config_hash
+from src.backtest.costs import pnl_frame
+from src.backtest.grid import run_walkforward_abc, run_walkforward_folds
+from src.backtest.metrics import metrics_to_dict
+from src.backtest.portfolio import run_portfolio_v1
+from src.backtest.splits import WALKFORWARD_MODES, folds_from_config, make_abc_split_by_ts
 from src.db.engine import get_engine
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
 
 
 def _utc_day_end_ts(date_str: str) -> int:
@@ -145,12 +153,111 @@ def _load_symbol_frame(symbol: str, timeframe: str) -> pd.DataFrame:
     return df
 
 
+def _open_cache(args: argparse.Namespace) -> ResultCache:
+    return ResultCache(args.cache_dir, max_bytes=int(args.cache_max_mb * 1024 * 1024))
+
+
+def _open_checkpoint(args: argparse.Namespace, cfg: dict) -> GridCheckpoint | None:
+    if args.no_checkpoint:
+        return None
+    checkpoint = GridCheckpoint(args.checkpoint_dir, job=config_hash(cfg))
+    if len(checkpoint):
+        print(f"Resuming from {checkpoint.path} ({len(checkpoint)} grid items done)")
+    return checkpoint
+
+
+def _run_folds(
+    cfg: dict,
+    df: pd.DataFrame,
+    symbol: str,
+    cache: ResultCache | None,
+    checkpoint: GridCheckpoint | None,
+) -> None:
+    wf_cfg = cfg["walkforward"]
+    bars = BarArrays.from_frame(df)
+    folds = folds_from_config(wf_cfg, len(bars))
+    print(f"Walk-forward ({wf_cfg['mode']}): {len(folds)} folds over {len(bars)} bars")
+
+    result = run_walkforward_folds(
+        bars,
+        symbol=symbol,
+        grid=_build_grid(cfg),
+        folds=folds,
+        selection_metric=wf_cfg.get("selection_metric", "total_net_pnl"),
+        workers=wf_cfg.get("folds", {}).get("workers"),
+        cache=cache,
+        checkpoint=checkpoint,
+    )
+
+    out_dir = Path("data/outputs")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result.fold_metrics.to_csv(out_dir / "step6_folds.csv", index=False)
+    result.oos_trades.to_csv(out_dir / "step6_oos_trades.csv", index=False)
+
+    payload = {
+        "symbol": symbol,
+        "mode": wf_cfg["mode"],
+        "n_folds": len(folds),
+        "oos_metrics": metrics_to_dict(result.oos_metrics),
+    }
+    (out_dir / "step6_oos_summary.json").write_text(json.dumps(payload, indent=2) + "\n")
+
+    print(f"Wrote {out_dir / 'step6_folds.csv'}")
+    print(f"Wrote {out_dir / 'step6_oos_trades.csv'}")
+    print(f"Wrote {out_dir / 'step6_oos_summary.json'}")
+
+
+def _run_portfolio(cfg: dict) -> None:
+    tf = cfg["timeframe"]["trade"]
+    bars = {}
+    for symbol in cfg["symbols"]:
+        bars[symbol] = BarArrays.from_frame(_load_symbol_frame(symbol=symbol, timeframe=tf))
+        print(f"Loaded {len(bars[symbol])} rows for {symbol} timeframe={tf}")
+
+    item = _build_grid(cfg)[0]
+    result = run_portfolio_v1(
+        bars,
+        params=StrategyParams(**item["strategy"]),
+        entry_params=EntryRuleParams(**item["entry"]),
+    )
+
+    out_dir = Path("data/outputs")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    pnl_frame(result.trades, result.pnl).to_csv(out_dir / "portfolio_trades.csv", index=False)
+    result.equity_frame().to_csv(out_dir / "portfolio_equity.csv", index=False)
+
+    print(f"Wrote {out_dir / 'portfolio_trades.csv'}")
+    print(f"Wrote {out_dir / 'portfolio_equity.csv'}")
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", required=True)
+    ap.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help="On-disk result cache; unchanged grid combinations are not recomputed.",
+    )
+    ap.add_argument("--cache-max-mb", type=float, default=DEFAULT_MAX_BYTES / (1024 * 1024))
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument(
+        "--checkpoint-dir",
+        default=str(DEFAULT_CHECKPOINT_DIR),
+        help="Grid items are logged here as they finish; rerunning the same config resumes.",
+    )
+    ap.add_argument("--no-checkpoint", action="store_true")
+    ap.add_argument(
+        "--portfolio",
+        action="store_true",
+        help="Run every configured symbol together (first grid point) instead of walk-forward.",
+    )
     args = ap.parse_args()
 
     cfg = yaml.safe_load(open(args.config))
+    if args.portfolio:
+        _run_portfolio(cfg)
+        return
+
     symbol = cfg["symbols"][0]
     tf = cfg["timeframe"]["trade"]
 
@@ -168,6 +275,13 @@ def main() -> None:
         trend_ok = df["ema50_1h"] > df["ema200_1h"]
         print(f"Trend OK (ema50>ema200) bars: {int(trend_ok.sum())} / {len(df)}")
 
+    cache = None if args.no_cache else _open_cache(args)
+    checkpoint = _open_checkpoint(args, cfg)
+
+    if cfg["walkforward"].get("mode", "single_split") in WALKFORWARD_MODES:
+        _run_folds(cfg, df, symbol, cache=cache, checkpoint=checkpoint)
+        return
+
     wf = cfg["walkforward"]["single_split"]
     a_end_ts = _utc_day_end_ts(wf["train_end"])
     b_end_ts = _utc_day_end_ts(wf["val_end"])
@@ -182,8 +296,22 @@ def main() -> None:
         test=split.test,
         symbol=symbol,
         grid=grid,
+        cache=cache,
+        selection_metric=cfg["walkforward"].get("selection_metric", "total_net_pnl"),
+        search=cfg["walkforward"].get("search", "grid"),
+        top_k=int(cfg["walkforward"].get("top_k_from_train", 10)),
+        checkpoint=checkpoint,
     )
 
+    report = out.get("halving_report")
+    if report is not None:
+        rungs = ", ".join(f"{r.n_candidates}x{r.n_bars}" for r in report.rungs)
+        print(
+            f"Successive halving rungs (candidates x bars): {rungs}; "
+            f"bar-evaluations {report.bar_evaluations} / {report.full_bar_evaluations} "
+            f"(saved {report.saved_bar_evaluations})"
+        )
+
     out_dir = Path("data/outputs")
     out_dir.mkdir(parents=True, exist_ok=True)
 
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+REQUIRED_COLS = ("ts", "high", "low", "close", "vwap", "atr", "ema50_1h", "ema200_1h")
+
+
+@dataclass(frozen=True)
+class BarArrays:
+    """
+    Column arrays for the v1 engine, pulled out of a frame once.
+
+    ts is int64, every other column is float64; all arrays are contiguous
+    and share one length. vol_ratio is None when the frame has no such column.
+    """
+
+    ts: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    vwap: np.ndarray
+    atr: np.ndarray
+    ema50_1h: np.ndarray
+    ema200_1h: np.ndarray
+    vol_ratio: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return int(self.ts.shape[0])
+
+    def slice(self, start: int, stop: int) -> BarArrays:
+        """Bars [start, stop) as views into these arrays (no copy)."""
+        return BarArrays(
+            ts=self.ts[start:stop],
+            high=self.high[start:stop],
+            low=self.low[start:stop],
+            close=self.close[start:stop],
+            vwap=self.vwap[start:stop],
+            atr=self.atr[start:stop],
+            ema50_1h=self.ema50_1h[start:stop],
+            ema200_1h=self.ema200_1h[start:stop],
+            vol_ratio=None if self.vol_ratio is None else self.vol_ratio[start:stop],
+        )
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> BarArrays:
+        missing = set(REQUIRED_COLS) - set(frame.columns)
+        if missing:
+            raise ValueError(f"frame missing columns: {sorted(missing)}")
+
+        def _f64(col: str) -> np.ndarray:
+            return np.ascontiguousarray(frame[col].to_numpy(dtype=np.float64))
+
+        vol_ratio = _f64("vol_ratio") if "vol_ratio" in frame.columns else None
+
+        return cls(
+            ts=np.ascontiguousarray(frame["ts"].to_numpy(dtype=np.int64)),
+            high=_f64("high"),
+            low=_f64("low"),
+            close=_f64("close"),
+            vwap=_f64("vwap"),
+            atr=_f64("atr"),
+            ema50_1h=_f64("ema50_1h"),
+            ema200_1h=_f64("ema200_1h"),
+            vol_ratio=vol_ratio,
+        )
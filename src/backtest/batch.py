@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.backtest.arrays import BarArrays
+from src.backtest.types import SIDES, Trade, TradeTable
+from src.strategies.v1.entry import EntryRuleParams, entry_candidates
+from src.strategies.v1.spec import REASON_BITS, ReasonCode, Side, StrategyParams, reasons_to_mask
+
+_FLAT = 0
+_ORDER_PENDING = 1
+_IN_POSITION = 2
+
+EXIT_REASONS = (ReasonCode.STOP, ReasonCode.TAKE_PROFIT, ReasonCode.TIME_STOP)
+
+
+@dataclass(frozen=True)
+class ParamMatrix:
+    """
+    The engine-relevant StrategyParams fields as column arrays (one row per set).
+
+    has_time_stop is False where time_stop_bars is None (time_stop_bars is 0
+    there); any int, including 0 or negative, is a time stop. Cost fields are
+    not part of the matrix: they never change which trades happen.
+    """
+
+    limit_expiry_bars: np.ndarray
+    atr_stop_mult: np.ndarray
+    take_profit_r: np.ndarray
+    time_stop_bars: np.ndarray
+    has_time_stop: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.limit_expiry_bars.shape[0])
+
+    @classmethod
+    def from_params(cls, params: Sequence[StrategyParams]) -> ParamMatrix:
+        return cls(
+            limit_expiry_bars=np.array([int(p.limit_expiry_bars) for p in params], dtype=np.int64),
+            atr_stop_mult=np.array([float(p.atr_stop_mult) for p in params], dtype=np.float64),
+            take_profit_r=np.array([float(p.take_profit_r) for p in params], dtype=np.float64),
+            time_stop_bars=np.array(
+                [0 if p.time_stop_bars is None else int(p.time_stop_bars) for p in params],
+                dtype=np.int64,
+            ),
+            has_time_stop=np.array([p.time_stop_bars is not None for p in params], dtype=bool),
+        )
+
+
+@dataclass(frozen=True)
+class BatchTrades:
+    """
+    Columnar trades from run_backtest_v1_batch.
+
+    Rows are grouped by parameter set (set_idx ascending) and in exit order
+    within a set. exit_reason indexes EXIT_REASONS. to_table / table_for give
+    TradeTables; Trade objects are only built on request (trades_for /
+    to_trade_lists).
+    """
+
+    symbol: str
+    n_sets: int
+    set_idx: np.ndarray
+    entry_ts: np.ndarray
+    exit_ts: np.ndarray
+    entry_px: np.ndarray
+    exit_px: np.ndarray
+    exit_reason: np.ndarray
+    entry_reasons: tuple[ReasonCode, ...]
+
+    def __len__(self) -> int:
+        return int(self.set_idx.shape[0])
+
+    def set_bounds(self, k: int) -> tuple[int, int]:
+        lo, hi = np.searchsorted(self.set_idx, [k, k + 1])
+        return int(lo), int(hi)
+
+    def to_table(self) -> TradeTable:
+        """All sets' trades as one TradeTable (row order as here; see set_idx)."""
+        entry_mask = reasons_to_mask(
+            list(self.entry_reasons) + [ReasonCode.ORDER_PLACED, ReasonCode.LIMIT_FILLED]
+        )
+        exit_bits = np.array([REASON_BITS[r] for r in EXIT_REASONS], dtype=np.uint32)
+        return TradeTable(
+            symbols=(self.symbol,),
+            symbol_id=np.zeros(len(self), dtype=np.int32),
+            side=np.full(len(self), SIDES.index(Side.LONG), dtype=np.int8),
+            entry_ts=self.entry_ts,
+            entry_px=self.entry_px,
+            exit_ts=self.exit_ts,
+            exit_px=self.exit_px,
+            reasons=np.uint32(entry_mask) | exit_bits[self.exit_reason],
+        )
+
+    def table_for(self, k: int) -> TradeTable:
+        lo, hi = self.set_bounds(k)
+        return self.to_table()[lo:hi]
+
+    def trades_for(self, k: int) -> list[Trade]:
+        return self.table_for(k).to_trades()
+
+    def to_trade_lists(self) -> list[list[Trade]]:
+        table = self.to_table()
+        return [table[slice(*self.set_bounds(k))].to_trades() for k in range(self.n_sets)]
+
+
+def run_backtest_v1_batch(
+    bars: BarArrays,
+    symbol: str,
+    params: Sequence[StrategyParams] | ParamMatrix,
+    entry_params: EntryRuleParams | None = None,
+) -> BatchTrades:
+    """
+    Parameter-batched v1 kernel: one state machine per parameter set, all
+    stepped together over a single pass of the bar arrays.
+
+    Every set shares the same entry rule (entry_params), so candidate bars are
+    computed once; bars on which every machine is FLAT and no entry fires are
+    skipped. Returns columnar BatchTrades; set k's trades (set k = k-th input
+    parameter set) are identical to run_backtest_v1 for that set.
+
+    A fill on a bar with ATR <= 0 raises ValueError (as compute_long_brackets does).
+    """
+    if entry_params is None:
+        entry_params = EntryRuleParams(min_vol_ratio=None)
+
+    pm = params if isinstance(params, ParamMatrix) else ParamMatrix.from_params(params)
+    n_sets = len(pm)
+    n = len(bars)
+
+    candidates = entry_candidates(
+        close=bars.close,
+        vwap=bars.vwap,
+        ema50_1h=bars.ema50_1h,
+        ema200_1h=bars.ema200_1h,
+        vol_ratio=bars.vol_ratio,
+        params=entry_params,
+    )
+    is_candidate = np.zeros(n, dtype=bool)
+    is_candidate[candidates] = True
+
+    high = bars.high
+    low = bars.low
+    close = bars.close
+    vwap = bars.vwap
+    atr = bars.atr
+
+    has_time_stop = pm.has_time_stop
+
+    state = np.full(n_sets, _FLAT, dtype=np.int8)
+    limit_px = np.zeros(n_sets)
+    age = np.zeros(n_sets, dtype=np.int64)
+    entry_idx = np.zeros(n_sets, dtype=np.int64)
+    stop_px = np.zeros(n_sets)
+    tp_px = np.zeros(n_sets)
+    hold = np.zeros(n_sets, dtype=np.int64)
+
+    out_set: list[np.ndarray] = []
+    out_entry: list[np.ndarray] = []
+    out_exit: list[int] = []
+    out_entry_px: list[np.ndarray] = []
+    out_exit_px: list[np.ndarray] = []
+    out_reason: list[np.ndarray] = []
+
+    k = 0  # next candidate position
+    i = int(candidates[0]) if candidates.size else n
+    while i < n:
+        in_pos = state == _IN_POSITION
+        pending = state == _ORDER_PENDING
+        flat = state == _FLAT
+
+        # IN_POSITION: stop first, then take profit, then time stop
+        if in_pos.any():
+            hold[in_pos] += 1
+            stop_hit = in_pos & (low[i] <= stop_px)
+            tp_hit = in_pos & ~stop_hit & (high[i] >= tp_px)
+            time_hit = in_pos & ~stop_hit & ~tp_hit & has_time_stop & (hold >= pm.time_stop_bars)
+            exited = stop_hit | tp_hit | time_hit
+            if exited.any():
+                sets = np.flatnonzero(exited)
+                reason = np.where(stop_hit[sets], 0, np.where(tp_hit[sets], 1, 2))
+                px = np.where(
+                    reason == 0, stop_px[sets], np.where(reason == 1, tp_px[sets], close[i])
+                )
+                out_set.append(sets)
+                out_entry.append(entry_idx[sets])
+                out_exit.append(i)
+                out_entry_px.append(limit_px[sets])
+                out_exit_px.append(px)
+                out_reason.append(reason)
+                state[exited] = _FLAT
+
+        # ORDER_PENDING: fill, else age and expire
+        if pending.any():
+            filled = pending & (low[i] <= limit_px) & (limit_px <= high[i])
+            if filled.any():
+                a = float(atr[i])
+                if a <= 0:
+                    raise ValueError("ATR must be > 0 to compute brackets.")
+                entry = limit_px[filled]
+                stop = entry - pm.atr_stop_mult[filled] * a
+                tp_px[filled] = entry + pm.take_profit_r[filled] * (entry - stop)
+                stop_px[filled] = stop
+                entry_idx[filled] = i
+                hold[filled] = 0
+                state[filled] = _IN_POSITION
+
+            waiting = pending & ~filled
+            age[waiting] += 1
+            state[waiting & (age >= pm.limit_expiry_bars)] = _FLAT
+
+        # FLAT: place a limit at vwap on a candidate bar
+        if is_candidate[i]:
+            k += 1
+            placing = flat
+            limit_px[placing] = vwap[i]
+            age[placing] = 0
+            state[placing] = _ORDER_PENDING
+
+        if (state == _FLAT).all():
+            i = int(candidates[k]) if k < candidates.size else n
+        else:
+            i += 1
+            while k < candidates.size and candidates[k] < i:
+                k += 1
+
+    if out_set:
+        set_idx = np.concatenate(out_set)
+        exit_idx = np.repeat(np.array(out_exit, dtype=np.int64), [a.shape[0] for a in out_set])
+        order = np.argsort(set_idx, kind="stable")
+        cols = (
+            set_idx,
+            np.concatenate(out_entry),
+            exit_idx,
+            np.concatenate(out_entry_px),
+            np.concatenate(out_exit_px),
+            np.concatenate(out_reason),
+        )
+        set_idx, entry_i, exit_i, entry_px, exit_px, reason = (c[order] for c in cols)
+    else:
+        set_idx = entry_i = exit_i = np.empty(0, dtype=np.int64)
+        entry_px = exit_px = np.empty(0, dtype=np.float64)
+        reason = np.empty(0, dtype=np.int64)
+
+    entry_reasons = [ReasonCode.ENTRY_CROSS]
+    if entry_params.min_vol_ratio is not None:
+        entry_reasons.append(ReasonCode.VOL_CONFIRM)
+
+    return BatchTrades(
+        symbol=symbol,
+        n_sets=n_sets,
+        set_idx=set_idx,
+        entry_ts=bars.ts[entry_i],
+        exit_ts=bars.ts[exit_i],
+        entry_px=entry_px,
+        exit_px=exit_px,
+        exit_reason=reason.astype(np.int8),
+        entry_reasons=tuple(entry_reasons),
+    )
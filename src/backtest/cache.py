@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.backtest.arrays import BarArrays
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+DEFAULT_CACHE_DIR = Path("data/processed/result_cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_BAR_COLUMNS = ("ts", "high", "low", "close", "vwap", "atr", "ema50_1h", "ema200_1h", "vol_ratio")
+
+
+def bars_digest(bars: BarArrays) -> str:
+    """sha256 over every engine column's name, dtype and bytes."""
+    h = hashlib.sha256()
+    for name in _BAR_COLUMNS:
+        arr = getattr(bars, name)
+        h.update(name.encode())
+        if arr is None:
+            h.update(b"<none>")
+            continue
+        arr = np.ascontiguousarray(arr)
+        h.update(arr.dtype.str.encode())
+        h.update(arr.shape[0].to_bytes(8, "little"))
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def result_key(
+    bars_hash: str,
+    symbol: str,
+    strat_params: StrategyParams,
+    entry_params: EntryRuleParams,
+    version: str,
+) -> str:
+    payload = {
+        "bars": bars_hash,
+        "symbol": symbol,
+        "strategy": asdict(strat_params),
+        "entry": asdict(entry_params),
+        "version": version,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of JSON results (one file per key).
+
+    Reads refresh a file's mtime, and once the directory grows past max_bytes
+    the least recently used files are deleted until it fits again. Writes go
+    through a temp file + rename, so a crashed run never leaves a partial entry.
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._size = sum(p.stat().st_size for p in self._entries())
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("*.json"))
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Any | None:
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        data = json.dumps(value)
+
+        old = path.stat().st_size if path.exists() else 0
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(data)
+        os.replace(tmp, path)
+        self._size += path.stat().st_size - old
+
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+        entries.sort()
+
+        size = sum(s for _, s, _ in entries)
+        for _, s, p in entries:
+            if size <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            size -= s
+        self._size = size
+
+    def clear(self) -> None:
+        for p in self._entries():
+            p.unlink(missing_ok=True)
+        self._size = 0
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+DEFAULT_CHECKPOINT_DIR = Path("data/processed/checkpoints")
+
+
+def config_hash(cfg: dict[str, Any]) -> str:
+    """sha256 of a job config (key order does not matter)."""
+    return hashlib.sha256(json.dumps(cfg, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class GridCheckpoint:
+    """
+    Append-only JSONL log of finished grid items for one job.
+
+    The log lives at <root>/<job>.jsonl, job being the config hash, and holds
+    one {"key": ..., "value": ...} line per item (keys as in ResultCache).
+    Opening an existing log loads it, so a restarted job skips every item its
+    previous run finished. A line cut short by a crash is ignored.
+
+    put() is a single unbuffered O_APPEND write (no fsync), so it is cheap and
+    pool workers of the same job can share the log. Pickling (for workers)
+    carries the loaded entries but not the open file.
+    """
+
+    def __init__(self, root: str | Path, job: str):
+        self.path = Path(root) / f"{job}.jsonl"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._entries: dict[str, Any] = {}
+        self._fd: int | None = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            lines = self.path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            self._entries[rec["key"]] = rec["value"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Any | None:
+        return self._entries.get(key)
+
+    def put(self, key: str, value: Any) -> None:
+        if key in self._entries:
+            return
+        self._entries[key] = value
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        # Leading newline: a torn line left by a crashed writer stays on its own.
+        os.write(self._fd, ("\n" + json.dumps({"key": key, "value": value})).encode())
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> GridCheckpoint:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {**self.__dict__, "_fd": None}
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
 
-from src.backtest.types import Trade
+import numpy as np
+import pandas as pd
+
+from src.backtest.types import SIDES, Trade, TradeTable
 from src.strategies.v1.spec import ReasonCode, Side, StrategyParams
 
 
@@ -85,3 +89,158 @@ def apply_costs(trade: Trade, params: StrategyParams) -> TradePnL:
         fee_cost=fee_cost,
         net_pnl=net,
     )
+
+
+@dataclass(frozen=True)
+class PnLArrays:
+    """Columnar apply_costs output (one element per trade)."""
+
+    entry_px_eff: np.ndarray
+    exit_px_eff: np.ndarray
+    gross_pnl: np.ndarray
+    slippage_cost: np.ndarray
+    fee_cost: np.ndarray
+    net_pnl: np.ndarray
+
+    def row(self, k: int) -> PnLArrays:
+        """Row k of a 2-D (apply_costs_sweep) result."""
+        return PnLArrays(**{f.name: getattr(self, f.name)[k] for f in fields(self)})
+
+
+def apply_costs_arrays(
+    entry_px: np.ndarray,
+    exit_px: np.ndarray,
+    sides: np.ndarray,
+    exit_is_taker: np.ndarray,
+    params: StrategyParams,
+) -> PnLArrays:
+    """
+    Array form of apply_costs: same cost model, same numbers.
+
+    sides holds side codes (index into types.SIDES, as in TradeTable.side);
+    exit_is_taker marks exits charged taker_fee_bps instead of maker_fee_bps.
+    Every array op mirrors the scalar arithmetic step for step, so results
+    are bit-identical to calling apply_costs per trade.
+    """
+    return _costs_arrays(
+        entry_px,
+        exit_px,
+        sides,
+        exit_is_taker,
+        slip=_bps_to_rate(params.slippage_bps),
+        maker_fee=_bps_to_rate(params.maker_fee_bps),
+        taker_fee=_bps_to_rate(params.taker_fee_bps),
+    )
+
+
+def _costs_arrays(
+    entry_px: np.ndarray,
+    exit_px: np.ndarray,
+    sides: np.ndarray,
+    exit_is_taker: np.ndarray,
+    slip: float | np.ndarray,
+    maker_fee: float | np.ndarray,
+    taker_fee: float | np.ndarray,
+) -> PnLArrays:
+    # Rates may be (M, 1) columns: outputs then broadcast to (M, n_trades).
+    entry_raw = np.asarray(entry_px, dtype=np.float64)
+    exit_raw = np.asarray(exit_px, dtype=np.float64)
+    is_long = np.asarray(sides) == SIDES.index(Side.LONG)
+
+    entry_eff = np.where(is_long, entry_raw * (1.0 + slip), entry_raw * (1.0 - slip))
+    exit_eff = np.where(is_long, exit_raw * (1.0 - slip), exit_raw * (1.0 + slip))
+    gross = np.broadcast_to(
+        np.where(is_long, exit_raw - entry_raw, entry_raw - exit_raw), entry_eff.shape
+    )
+    net_move = np.where(is_long, exit_eff - entry_eff, entry_eff - exit_eff)
+
+    fee_entry = np.abs(entry_eff) * maker_fee
+    fee_exit = np.abs(exit_eff) * np.where(exit_is_taker, taker_fee, maker_fee)
+    fee_cost = fee_entry + fee_exit
+
+    slippage_cost = gross - net_move
+
+    return PnLArrays(
+        entry_px_eff=entry_eff,
+        exit_px_eff=exit_eff,
+        gross_pnl=gross,
+        slippage_cost=slippage_cost,
+        fee_cost=fee_cost,
+        net_pnl=net_move - fee_cost,
+    )
+
+
+def cost_multiplier_matrix(multipliers: Sequence[float | Sequence[float]]) -> np.ndarray:
+    """
+    (M, 3) float64 matrix of (maker, taker, slippage) cost multipliers.
+
+    Each entry is either one multiplier applied to all three costs (as in
+    sensitivity.multipliers) or an explicit (maker, taker, slippage) triple.
+    """
+    rows = []
+    for m in multipliers:
+        if isinstance(m, list | tuple | np.ndarray):
+            if len(m) != 3:
+                raise ValueError(
+                    f"Cost multiplier must be a number or (maker, taker, slippage): {m!r}"
+                )
+            rows.append([float(x) for x in m])
+        else:
+            rows.append([float(m)] * 3)
+    return np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+
+def apply_costs_sweep(
+    entry_px: np.ndarray,
+    exit_px: np.ndarray,
+    sides: np.ndarray,
+    exit_is_taker: np.ndarray,
+    params: StrategyParams,
+    multipliers: np.ndarray,
+) -> PnLArrays:
+    """
+    apply_costs_arrays for every row of a cost_multiplier_matrix at once.
+
+    Returns (M, n_trades) arrays; row k equals apply_costs_arrays with
+    params' maker/taker/slippage bps scaled by multipliers[k].
+    """
+    mults = np.asarray(multipliers, dtype=np.float64).reshape(-1, 3)
+
+    def _rates(bps: float, col: int) -> np.ndarray:
+        # Same arithmetic as scaling the bps field, then _bps_to_rate.
+        return ((float(bps) * mults[:, col]) / 10000.0)[:, None]
+
+    return _costs_arrays(
+        entry_px,
+        exit_px,
+        sides,
+        exit_is_taker,
+        slip=_rates(params.slippage_bps, 2),
+        maker_fee=_rates(params.maker_fee_bps, 0),
+        taker_fee=_rates(params.taker_fee_bps, 1),
+    )
+
+
+def apply_costs_table(table: TradeTable, params: StrategyParams) -> PnLArrays:
+    return apply_costs_arrays(
+        table.entry_px,
+        table.exit_px,
+        table.side,
+        table.exit_is_taker,
+        params,
+    )
+
+
+def pnl_frame(table: TradeTable, pnl: PnLArrays) -> pd.DataFrame:
+    """TradePnL rows as a DataFrame (same columns as the per-trade records)."""
+    trades = table.to_frame()
+    cols = {
+        "symbol": trades["symbol"],
+        "side": trades["side"],
+        "entry_ts": table.entry_ts,
+        "exit_ts": table.exit_ts,
+        "entry_px_raw": table.entry_px,
+        "exit_px_raw": table.exit_px,
+    }
+    cols.update({f.name: getattr(pnl, f.name) for f in fields(PnLArrays)})
+    return pd.DataFrame(cols, columns=[f.name for f in fields(TradePnL)])
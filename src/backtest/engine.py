@@ -1,12 +1,29 @@
 from __future__ import annotations
 
+from importlib import import_module
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
-from src.backtest.fill_model import check_fill, place_limit_order, step_age_and_expire
-from src.backtest.types import Trade
-from src.strategies.v1.entry import EntryRuleParams, build_entry_signal
-from src.strategies.v1.exits import check_long_exit, compute_long_brackets
-from src.strategies.v1.spec import ReasonCode, Side, StrategyParams
+from src.backtest.arrays import BarArrays
+from src.backtest.fill_model import (
+    NO_FILL,
+    check_fill,
+    first_fill_indices,
+    place_limit_order,
+    step_age_and_expire,
+)
+from src.backtest.types import SIDES, Trade, TradeTable
+from src.strategies.v1.entry import EntryRuleParams, build_entry_signal, entry_candidates
+from src.strategies.v1.exits import LongExitIndex, check_long_exit, compute_long_brackets
+from src.strategies.v1.spec import (
+    REASON_BITS,
+    ReasonCode,
+    Side,
+    StrategyParams,
+    reasons_to_mask,
+)
 from src.strategies.v1.trend_filter import trend_ok
 
 
@@ -178,3 +195,373 @@ def run_backtest_v1(
             state = "ORDER_PENDING"
 
     return trades
+
+
+def _try_import_cpp() -> Any | None:
+    try:
+        return import_module("_fast_indicators")
+    except Exception:
+        return None
+
+
+_cpp = _try_import_cpp()
+
+ENGINE_MODES = ("bar", "event", "native")
+
+# Part of every cached result key (see backtest.cache): bump whenever trades,
+# costs or metrics for the same inputs would change.
+ENGINE_VERSION = "v1.0"
+
+_FLAT = 0
+_ORDER_PENDING = 1
+_IN_POSITION = 2
+
+
+def run_backtest_v1_arrays(
+    frame: pd.DataFrame,
+    symbol: str,
+    params: StrategyParams,
+    entry_params: EntryRuleParams | None = None,
+    *,
+    mode: str = "bar",
+) -> list[Trade]:
+    """
+    Array-backed variant of run_backtest_v1 (same signature, identical trades).
+
+    Pulls the engine columns out of the frame once (see BarArrays) and runs the
+    FLAT / ORDER_PENDING / IN_POSITION state machine over plain arrays instead of
+    doing frame.loc[i] / frame.loc[i - 1] per bar. See run_backtest_v1_bars for
+    the available modes.
+    """
+    return run_backtest_v1_bars(
+        BarArrays.from_frame(frame),
+        symbol=symbol,
+        params=params,
+        entry_params=entry_params,
+        mode=mode,
+    )
+
+
+def run_backtest_v1_bars(
+    bars: BarArrays,
+    symbol: str,
+    params: StrategyParams,
+    entry_params: EntryRuleParams | None = None,
+    *,
+    mode: str = "bar",
+    exit_index: LongExitIndex | None = None,
+    candidates: np.ndarray | None = None,
+) -> list[Trade]:
+    """run_backtest_v1_table, converted to Trade objects."""
+    return run_backtest_v1_table(
+        bars,
+        symbol=symbol,
+        params=params,
+        entry_params=entry_params,
+        mode=mode,
+        exit_index=exit_index,
+        candidates=candidates,
+    ).to_trades()
+
+
+def run_backtest_v1_table(
+    bars: BarArrays,
+    symbol: str,
+    params: StrategyParams,
+    entry_params: EntryRuleParams | None = None,
+    *,
+    mode: str = "bar",
+    exit_index: LongExitIndex | None = None,
+    candidates: np.ndarray | None = None,
+) -> TradeTable:
+    """
+    v1 state machine over BarArrays, emitting a columnar TradeTable.
+
+    Modes (identical trades):
+      - "bar":    visit every bar, like run_backtest_v1
+      - "event":  precompute entry candidates (entry_candidates) and jump from
+                  one candidate to the next, resolving fill/expiry with array
+                  searches and exits with a LongExitIndex range query
+      - "native": the C++ kernel in the _fast_indicators extension (GIL
+                  released); falls back to "event" when the extension is missing
+
+    exit_index and candidates (event mode) let callers that run many parameter
+    sets over the same bars build the LongExitIndex once (from bars.low/high)
+    and compute entry_candidates once per distinct entry_params; candidates
+    must be entry_candidates(...) of these bars under entry_params.
+    """
+    if entry_params is None:
+        entry_params = EntryRuleParams(min_vol_ratio=None)
+
+    if mode == "bar":
+        return _simulate_bar_loop(bars, symbol, params, entry_params)
+    if mode == "native" and native_engine_available():
+        return _simulate_native(bars, symbol, params, entry_params)
+    if mode in ("event", "native"):
+        if exit_index is None:
+            exit_index = LongExitIndex(bars.low, bars.high)
+        elif len(exit_index) != len(bars):
+            raise ValueError("exit_index length does not match bars")
+        if candidates is None:
+            candidates = bar_entry_candidates(bars, entry_params)
+        return _simulate_events(bars, symbol, params, entry_params, exit_index, candidates)
+    raise ValueError(f"Unknown engine mode: {mode!r} (expected one of {ENGINE_MODES})")
+
+
+def bar_entry_candidates(bars: BarArrays, entry_params: EntryRuleParams) -> np.ndarray:
+    """entry_candidates over BarArrays (the `candidates` argument of the event engine)."""
+    return entry_candidates(
+        close=bars.close,
+        vwap=bars.vwap,
+        ema50_1h=bars.ema50_1h,
+        ema200_1h=bars.ema200_1h,
+        vol_ratio=bars.vol_ratio,
+        params=entry_params,
+    )
+
+
+def _filled_reasons(entry_params: EntryRuleParams) -> list[ReasonCode]:
+    reasons = [ReasonCode.ENTRY_CROSS]
+    if entry_params.min_vol_ratio is not None:
+        reasons.append(ReasonCode.VOL_CONFIRM)
+    return reasons + [ReasonCode.ORDER_PLACED, ReasonCode.LIMIT_FILLED]
+
+
+def _long_table(
+    bars: BarArrays,
+    symbol: str,
+    entry_idx: np.ndarray | list[int],
+    exit_idx: np.ndarray | list[int],
+    entry_px: np.ndarray | list[float],
+    exit_px: np.ndarray | list[float],
+    reasons: np.ndarray | list[int],
+) -> TradeTable:
+    """Single-symbol LONG TradeTable from entry/exit bar indices into bars."""
+    entry_i = np.asarray(entry_idx, dtype=np.int64)
+    exit_i = np.asarray(exit_idx, dtype=np.int64)
+    return TradeTable(
+        symbols=(symbol,),
+        symbol_id=np.zeros(entry_i.shape[0], dtype=np.int32),
+        side=np.full(entry_i.shape[0], SIDES.index(Side.LONG), dtype=np.int8),
+        entry_ts=bars.ts[entry_i],
+        entry_px=np.asarray(entry_px, dtype=np.float64),
+        exit_ts=bars.ts[exit_i],
+        exit_px=np.asarray(exit_px, dtype=np.float64),
+        reasons=np.asarray(reasons, dtype=np.uint32),
+    )
+
+
+def _simulate_bar_loop(
+    bars: BarArrays,
+    symbol: str,
+    params: StrategyParams,
+    entry_params: EntryRuleParams,
+) -> TradeTable:
+    """
+    Mirrors run_backtest_v1 rule for rule:
+      - FLAT: trend ok on bar i, close crosses above vwap between i-1 and i,
+        optional vol_ratio confirm => limit at vwap[i], first fill check on i+1
+      - ORDER_PENDING: fill if low <= limit <= high, else age and expire
+      - IN_POSITION: stop/TP on bar range (stop first), then optional time stop
+    """
+    high = bars.high
+    low = bars.low
+    close = bars.close
+    vwap = bars.vwap
+    atr = bars.atr
+    ema50 = bars.ema50_1h
+    ema200 = bars.ema200_1h
+    vol_ratio = bars.vol_ratio
+
+    min_vol = entry_params.min_vol_ratio
+    expiry_bars = int(params.limit_expiry_bars)
+    time_stop = None if params.time_stop_bars is None else int(params.time_stop_bars)
+    filled_mask = reasons_to_mask(_filled_reasons(entry_params))
+
+    out_entry: list[int] = []
+    out_exit: list[int] = []
+    out_entry_px: list[float] = []
+    out_exit_px: list[float] = []
+    out_reasons: list[int] = []
+
+    state = _FLAT
+    limit_px = 0.0
+    age = 0
+    entry_i = 0
+    entry_px = 0.0
+    stop_px = 0.0
+    tp_px = 0.0
+    hold = 0
+
+    for i in range(1, len(bars)):
+        if state == _IN_POSITION:
+            hold += 1
+
+            exit_px = None
+            exit_reason = None
+            if low[i] <= stop_px:
+                exit_px, exit_reason = stop_px, ReasonCode.STOP
+            elif high[i] >= tp_px:
+                exit_px, exit_reason = tp_px, ReasonCode.TAKE_PROFIT
+            elif time_stop is not None and hold >= time_stop:
+                exit_px, exit_reason = float(close[i]), ReasonCode.TIME_STOP
+
+            if exit_reason is not None:
+                out_entry.append(entry_i)
+                out_exit.append(i)
+                out_entry_px.append(entry_px)
+                out_exit_px.append(float(exit_px))
+                out_reasons.append(filled_mask | REASON_BITS[exit_reason])
+                state = _FLAT
+            continue
+
+        if state == _ORDER_PENDING:
+            if low[i] <= limit_px <= high[i]:
+                brackets = compute_long_brackets(
+                    entry_px=limit_px,
+                    atr=float(atr[i]),
+                    atr_mult=float(params.atr_stop_mult),
+                    take_profit_r=float(params.take_profit_r),
+                )
+                entry_i = i
+                entry_px = limit_px
+                stop_px = brackets.stop_px
+                tp_px = brackets.tp_px
+                hold = 0
+                state = _IN_POSITION
+                continue
+
+            age += 1
+            if age >= expiry_bars:
+                state = _FLAT
+            continue
+
+        # FLAT
+        if not ema50[i] > ema200[i]:
+            continue
+        if not (close[i - 1] <= vwap[i - 1] and close[i] > vwap[i]):
+            continue
+        if min_vol is not None:
+            if vol_ratio is None or vol_ratio[i] < float(min_vol):
+                continue
+
+        limit_px = float(vwap[i])
+        age = 0
+        state = _ORDER_PENDING
+
+    return _long_table(bars, symbol, out_entry, out_exit, out_entry_px, out_exit_px, out_reasons)
+
+
+def _simulate_events(
+    bars: BarArrays,
+    symbol: str,
+    params: StrategyParams,
+    entry_params: EntryRuleParams,
+    exit_index: LongExitIndex,
+    candidates: np.ndarray,
+) -> TradeTable:
+    """
+    Event-skipping form of the same state machine.
+
+    Bar bookkeeping matches the bar loop exactly:
+      - an order placed on candidate bar c is checked on bars c+1 .. c+E
+        (E = max(limit_expiry_bars, 1)) and, unfilled, expires on bar c+E
+      - a position filled on bar f is checked for stop/TP from f+1 and, with
+        a time stop T, exits at the close of bar f + max(T, 1)
+      - the engine is FLAT again on the bar after an expiry or exit
+    """
+    n = len(bars)
+    high = bars.high
+    low = bars.low
+    close = bars.close
+
+    expiry_window = max(int(params.limit_expiry_bars), 1)
+    hold_window = None if params.time_stop_bars is None else max(int(params.time_stop_bars), 1)
+    filled_mask = reasons_to_mask(_filled_reasons(entry_params))
+
+    # A pending order only depends on its candidate bar, so every candidate's
+    # fill/expiry is resolved up front in one batched call.
+    limit_pxs = bars.vwap[candidates]
+    fills = first_fill_indices(low, high, candidates, limit_pxs, expiry_window)
+
+    out_entry: list[int] = []
+    out_exit: list[int] = []
+    out_entry_px: list[float] = []
+    out_exit_px: list[float] = []
+    out_reasons: list[int] = []
+
+    free_from = 1  # first bar on which the engine is FLAT again
+    while True:
+        k = int(np.searchsorted(candidates, free_from, side="left"))
+        if k >= candidates.size:
+            break
+        c = int(candidates[k])
+        limit_px = float(limit_pxs[k])
+
+        f = int(fills[k])
+        if f == NO_FILL:
+            free_from = c + expiry_window + 1
+            continue
+
+        brackets = compute_long_brackets(
+            entry_px=limit_px,
+            atr=float(bars.atr[f]),
+            atr_mult=float(params.atr_stop_mult),
+            take_profit_r=float(params.take_profit_r),
+        )
+
+        # IN_POSITION: first stop/TP touch (stop first), else time stop
+        exit_end = n if hold_window is None else min(n, f + 1 + hold_window)
+        x, exit_px, exit_reason = exit_index.first_exit(f + 1, exit_end, brackets)
+        if exit_reason is None:
+            if hold_window is None or f + hold_window >= n:
+                break  # still open at the end of the data
+            x = f + hold_window
+            exit_px, exit_reason = float(close[x]), ReasonCode.TIME_STOP
+
+        out_entry.append(f)
+        out_exit.append(x)
+        out_entry_px.append(limit_px)
+        out_exit_px.append(float(exit_px))
+        out_reasons.append(filled_mask | REASON_BITS[exit_reason])
+        free_from = x + 1
+
+    return _long_table(bars, symbol, out_entry, out_exit, out_entry_px, out_exit_px, out_reasons)
+
+
+def native_engine_available() -> bool:
+    return _cpp is not None and hasattr(_cpp, "backtest_v1")
+
+
+def _simulate_native(
+    bars: BarArrays,
+    symbol: str,
+    params: StrategyParams,
+    entry_params: EntryRuleParams,
+) -> TradeTable:
+    min_vol = entry_params.min_vol_ratio
+    cols = _cpp.backtest_v1(
+        bars.high,
+        bars.low,
+        bars.close,
+        bars.vwap,
+        bars.atr,
+        bars.ema50_1h,
+        bars.ema200_1h,
+        bars.vol_ratio,
+        int(params.limit_expiry_bars),
+        float(params.atr_stop_mult),
+        float(params.take_profit_r),
+        None if params.time_stop_bars is None else int(params.time_stop_bars),
+        None if min_vol is None else float(min_vol),
+    )
+
+    return _long_table(
+        bars,
+        symbol,
+        cols["entry_idx"],
+        cols["exit_idx"],
+        cols["entry_px"],
+        cols["exit_px"],
+        cols["reasons"],
+    )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import numpy as np
+
 from src.strategies.v1.spec import LimitOrder, ReasonCode, Side
 
 Bar = dict[str, float]  # keys: "low", "high"
@@ -50,3 +52,74 @@ def step_age_and_expire(order: LimitOrder) -> tuple[LimitOrder, bool]:
         return order, True
 
     return order, False
+
+
+NO_FILL = -1
+
+# Cap on (orders x window) cells materialized per chunk in first_fill_indices.
+_FILL_CHUNK_CELLS = 1 << 22
+
+
+def first_fill_index(
+    low: np.ndarray,
+    high: np.ndarray,
+    placed_idx: int,
+    limit_px: float,
+    expiry_bars: int,
+) -> int:
+    """
+    Array form of the check_fill / step_age_and_expire loop for one order.
+
+    An order placed on bar `placed_idx` is checked on bars placed_idx+1 ..
+    placed_idx+max(expiry_bars, 1) with low <= limit_px <= high.
+    Returns the fill bar index, or NO_FILL if it expires (or the data ends) first.
+    """
+    start = int(placed_idx) + 1
+    end = min(int(low.shape[0]), start + max(int(expiry_bars), 1))
+    px = float(limit_px)
+    hit = np.flatnonzero((low[start:end] <= px) & (px <= high[start:end]))
+    return start + int(hit[0]) if hit.size else NO_FILL
+
+
+def first_fill_indices(
+    low: np.ndarray,
+    high: np.ndarray,
+    placed_idx: np.ndarray,
+    limit_px: np.ndarray,
+    expiry_bars: int | np.ndarray,
+) -> np.ndarray:
+    """
+    Batched first_fill_index: resolves many independent orders at once.
+
+    placed_idx / limit_px are 1D arrays (one entry per order); expiry_bars is a
+    scalar or a per-order array. Returns an int64 array of fill bar indices,
+    NO_FILL where the order never fills.
+    """
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    placed = np.asarray(placed_idx, dtype=np.int64)
+    px = np.asarray(limit_px, dtype=np.float64)
+    windows = np.maximum(np.broadcast_to(np.asarray(expiry_bars, dtype=np.int64), placed.shape), 1)
+
+    out = np.full(placed.shape[0], NO_FILL, dtype=np.int64)
+    if placed.size == 0:
+        return out
+
+    n = int(low.shape[0])
+    width = int(windows.max())
+    offsets = np.arange(1, width + 1, dtype=np.int64)
+    rows = max(1, _FILL_CHUNK_CELLS // width)
+
+    for lo in range(0, placed.shape[0], rows):
+        hi = min(placed.shape[0], lo + rows)
+        idx = placed[lo:hi, None] + offsets
+        valid = (offsets <= windows[lo:hi, None]) & (idx < n)
+        safe = np.where(valid, idx, 0)
+        p = px[lo:hi, None]
+        touched = valid & (low[safe] <= p) & (p <= high[safe])
+
+        first = touched.argmax(axis=1)
+        filled = touched[np.arange(hi - lo), first]
+        out[lo:hi] = np.where(filled, placed[lo:hi] + 1 + first, NO_FILL)
+
+    return out
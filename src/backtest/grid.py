@@ -1,14 +1,30 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from src.backtest.costs import apply_costs
-from src.backtest.engine import run_backtest_v1
-from src.backtest.metrics import compute_metrics, metrics_to_dict
+from src.backtest.arrays import BarArrays
+from src.backtest.cache import ResultCache, bars_digest, result_key
+from src.backtest.checkpoint import GridCheckpoint
+from src.backtest.costs import PnLArrays, apply_costs_table, pnl_frame
+from src.backtest.engine import ENGINE_VERSION, bar_entry_candidates, run_backtest_v1_table
+from src.backtest.metrics import (
+    Metrics,
+    MetricsAccumulator,
+    compute_metrics_batch,
+    metrics_frame_to_dicts,
+    metrics_to_dict,
+)
+from src.backtest.parallel import shared_bars_pool, worker_bars
+from src.backtest.splits import Fold
+from src.backtest.types import TradeTable
 from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.exits import LongExitIndex
 from src.strategies.v1.spec import StrategyParams
 
 
@@ -18,28 +34,241 @@ class GridResult:
     metrics: dict[str, Any]
 
 
-def _run_one(
-    frame: pd.DataFrame,
+def _net_pnl_one(
+    bars: BarArrays,
     symbol: str,
     strat_params: StrategyParams,
     entry_params: EntryRuleParams,
-) -> dict[str, Any]:
-    trades = run_backtest_v1(
-        frame,
+    exit_index: LongExitIndex | None = None,
+    candidates: np.ndarray | None = None,
+) -> np.ndarray:
+    table = run_backtest_v1_table(
+        bars,
         symbol=symbol,
         params=strat_params,
         entry_params=entry_params,
+        mode="event",
+        exit_index=exit_index,
+        candidates=candidates,
     )
-    pnl_rows = [apply_costs(t, strat_params) for t in trades]
-    net_pnls = [r.net_pnl for r in pnl_rows]
-    m = compute_metrics(net_pnls)
-    return metrics_to_dict(m)
+    return apply_costs_table(table, strat_params).net_pnl
+
+
+def _metrics_dicts(net_pnls: list[np.ndarray]) -> list[dict[str, Any]]:
+    return metrics_frame_to_dicts(compute_metrics_batch(net_pnls))
+
+
+# Per-worker exit indexes and entry candidates, built lazily from the shared
+# bars (see _run_grid_task).
+_WORKER_EXIT_INDEX: dict[str, LongExitIndex] = {}
+_WORKER_CANDIDATES: dict[tuple[str, EntryRuleParams], np.ndarray] = {}
+
+# Finished grid items between checkpoint writes (see _grid_metrics).
+_CHECKPOINT_BLOCK = 16
+
+
+def _run_grid_task(task: tuple[str, str, dict[str, Any]]) -> np.ndarray:
+    """Process-pool task: run one grid item on shared bars registered under `key`."""
+    key, symbol, item = task
+    bars = worker_bars(key)
+    exit_index = _WORKER_EXIT_INDEX.get(key)
+    if exit_index is None:
+        exit_index = _WORKER_EXIT_INDEX[key] = LongExitIndex(bars.low, bars.high)
+    entry_params = EntryRuleParams(**item.get("entry", {}))
+    candidates = _WORKER_CANDIDATES.get((key, entry_params))
+    if candidates is None:
+        candidates = _WORKER_CANDIDATES[(key, entry_params)] = bar_entry_candidates(
+            bars, entry_params
+        )
+    return _net_pnl_one(
+        bars,
+        symbol=symbol,
+        strat_params=StrategyParams(**item.get("strategy", {})),
+        entry_params=entry_params,
+        exit_index=exit_index,
+        candidates=candidates,
+    )
+
+
+def _item_key(bars_hash: str, symbol: str, item: dict[str, Any]) -> str:
+    return result_key(
+        bars_hash,
+        symbol,
+        StrategyParams(**item.get("strategy", {})),
+        EntryRuleParams(**item.get("entry", {})),
+        ENGINE_VERSION,
+    )
+
+
+def _grid_metrics(
+    bars: BarArrays,
+    symbol: str,
+    grid: list[dict[str, Any]],
+    pool: ProcessPoolExecutor | None = None,
+    workers: int = 1,
+    key: str = "train",
+    cache: ResultCache | None = None,
+    checkpoint: GridCheckpoint | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Metrics for every grid item, in grid order (serial, or on `pool` workers).
+
+    With a cache and/or checkpoint, items whose (bars, symbol, params,
+    ENGINE_VERSION) key is already stored in either are not recomputed. New
+    results are written to both; checkpoint writes happen every
+    _CHECKPOINT_BLOCK finished items rather than once the grid is done.
+    """
+    stores = [s for s in (checkpoint, cache) if s is not None]
+    if not stores:
+        return _compute_grid_metrics(bars, symbol, grid, pool=pool, workers=workers, key=key)
+
+    bars_hash = bars_digest(bars)
+    keys = [_item_key(bars_hash, symbol, item) for item in grid]
+    metrics: list[dict[str, Any] | None] = []
+    for k in keys:
+        m = None
+        for store in stores:
+            m = store.get(k)
+            if m is not None:
+                break
+        metrics.append(m)
+
+    missing = [k for k, m in enumerate(metrics) if m is None]
+    if missing:
+
+        def _store(j: int, m: dict[str, Any]) -> None:
+            k = missing[j]
+            metrics[k] = m
+            for store in stores:
+                store.put(keys[k], m)
+
+        _compute_grid_metrics(
+            bars,
+            symbol,
+            [grid[k] for k in missing],
+            pool=pool,
+            workers=workers,
+            key=key,
+            on_result=_store,
+            block=_CHECKPOINT_BLOCK if checkpoint is not None else None,
+        )
+    return metrics  # type: ignore[return-value]
+
+
+def _compute_grid_metrics(
+    bars: BarArrays,
+    symbol: str,
+    grid: list[dict[str, Any]],
+    pool: ProcessPoolExecutor | None = None,
+    workers: int = 1,
+    key: str = "train",
+    on_result: Callable[[int, dict[str, Any]], None] | None = None,
+    block: int | None = None,
+) -> list[dict[str, Any]]:
+    # Net PnL is produced per item (in grid order); metrics come from one
+    # compute_metrics_batch call per `block` finished items (default: the whole
+    # grid), each reported through on_result(index, metrics) as it lands.
+    block = max(1, len(grid) if block is None else int(block))
+    metrics: list[dict[str, Any]] = []
+    pending: list[np.ndarray] = []
+
+    def _flush() -> None:
+        for m in _metrics_dicts(pending):
+            if on_result is not None:
+                on_result(len(metrics), m)
+            metrics.append(m)
+        pending.clear()
+
+    for net_pnl in _iter_net_pnls(bars, symbol, grid, pool=pool, workers=workers, key=key):
+        pending.append(net_pnl)
+        if len(pending) >= block:
+            _flush()
+    if pending:
+        _flush()
+    return metrics
+
+
+def _iter_net_pnls(
+    bars: BarArrays,
+    symbol: str,
+    grid: list[dict[str, Any]],
+    pool: ProcessPoolExecutor | None = None,
+    workers: int = 1,
+    key: str = "train",
+) -> Iterator[np.ndarray]:
+    if pool is not None:
+        tasks = [(key, symbol, item) for item in grid]
+        chunksize = max(1, len(tasks) // (4 * workers))
+        yield from pool.map(_run_grid_task, tasks, chunksize=chunksize)
+        return
+
+    # Bars and the stop/TP range index are shared by every grid item; the
+    # entry signal only depends on entry params, so candidates are computed
+    # once per distinct EntryRuleParams.
+    exit_index = LongExitIndex(bars.low, bars.high)
+    candidates: dict[EntryRuleParams, np.ndarray] = {}
+    for item in grid:
+        entry_params = EntryRuleParams(**item.get("entry", {}))
+        if entry_params not in candidates:
+            candidates[entry_params] = bar_entry_candidates(bars, entry_params)
+        yield _net_pnl_one(
+            bars,
+            symbol=symbol,
+            strat_params=StrategyParams(**item.get("strategy", {})),
+            entry_params=entry_params,
+            exit_index=exit_index,
+            candidates=candidates[entry_params],
+        )
+
+
+SELECTION_METRICS: tuple[str, ...] = tuple(f.name for f in fields(Metrics))
+
+
+def _check_selection_metric(selection_metric: str) -> None:
+    if selection_metric not in SELECTION_METRICS:
+        raise ValueError(
+            f"Unknown selection_metric: {selection_metric!r} (expected one of {SELECTION_METRICS})"
+        )
+
+
+def _score(m: dict[str, Any], selection_metric: str) -> float:
+    """Higher is better. None with a *_note (profit_factor) means +inf."""
+    value = m[selection_metric]
+    if value is None:
+        return float("inf") if m.get(f"{selection_metric}_note") else float("-inf")
+    return float(value)
+
+
+def _select_best(
+    grid: list[dict[str, Any]],
+    metrics: list[dict[str, Any]],
+    selection_metric: str = "total_net_pnl",
+) -> tuple[list[GridResult], dict[str, Any]]:
+    results: list[GridResult] = []
+    best_item: dict[str, Any] | None = None
+    best_score = float("-inf")
+
+    for item, m in zip(grid, metrics, strict=True):
+        results.append(GridResult(params=item, metrics=m))
+
+        score = _score(m, selection_metric)
+        if best_item is None or score > best_score:
+            best_score = score
+            best_item = item
+
+    if best_item is None:
+        raise ValueError("Grid was empty.")
+
+    return results, best_item
 
 
 def run_grid_on_train(
     train: pd.DataFrame,
     symbol: str,
     grid: list[dict[str, Any]],
+    workers: int | None = None,
+    cache: ResultCache | None = None,
+    checkpoint: GridCheckpoint | None = None,
 ) -> tuple[list[GridResult], dict[str, Any]]:
     """
     Runs param grid on train split and selects best by total_net_pnl.
@@ -48,28 +277,120 @@ def run_grid_on_train(
         "strategy": { ... StrategyParams fields ... },
         "entry": { ... EntryRuleParams fields ... },
       }
+    workers > 1 fans grid items out to a process pool; the train bars are placed
+    once in shared memory. Results (order and best-item tie-breaking) are the
+    same as the serial path.
+    cache (ResultCache) skips grid items already computed on identical bars.
+    checkpoint (GridCheckpoint) logs items as they finish and skips those an
+    earlier, interrupted run of the same job already logged.
     Returns (all_results, best_grid_item).
     """
-    results: list[GridResult] = []
-    best_item: dict[str, Any] | None = None
-    best_score = float("-inf")
+    bars = BarArrays.from_frame(train)
 
-    for item in grid:
-        strat = StrategyParams(**item.get("strategy", {}))
-        entry = EntryRuleParams(**item.get("entry", {}))
+    if workers is not None and workers > 1 and grid:
+        with shared_bars_pool({"train": bars}, workers) as pool:
+            metrics = _grid_metrics(
+                bars,
+                symbol,
+                grid,
+                pool=pool,
+                workers=workers,
+                cache=cache,
+                checkpoint=checkpoint,
+            )
+    else:
+        metrics = _grid_metrics(bars, symbol, grid, cache=cache, checkpoint=checkpoint)
 
-        m = _run_one(train, symbol=symbol, strat_params=strat, entry_params=entry)
-        results.append(GridResult(params=item, metrics=m))
+    return _select_best(grid, metrics)
 
-        score = float(m.get("total_net_pnl", 0.0))
-        if score > best_score:
-            best_score = score
-            best_item = item
 
-    if best_item is None:
-        raise ValueError("Grid was empty.")
+@dataclass(frozen=True)
+class HalvingRung:
+    n_bars: int
+    n_candidates: int
+
+
+@dataclass(frozen=True)
+class HalvingReport:
+    """Bar-evaluations (candidates x bars) spent by run_grid_halving vs a full grid."""
+
+    rungs: list[HalvingRung]
+    bar_evaluations: int
+    full_bar_evaluations: int
+
+    @property
+    def saved_bar_evaluations(self) -> int:
+        return self.full_bar_evaluations - self.bar_evaluations
 
-    return results, best_item
+
+def _halving_schedule(n_bars: int, n_items: int, top_k: int, eta: int, min_bars: int) -> list[int]:
+    """Prefix lengths, shortest first; the last one is always the full window."""
+    lengths = [n_bars]
+    survivors = n_items
+    while survivors > top_k and lengths[0] // eta >= min_bars:
+        lengths.insert(0, lengths[0] // eta)
+        survivors = -(-survivors // eta)
+    return lengths
+
+
+def run_grid_halving(
+    train: pd.DataFrame,
+    symbol: str,
+    grid: list[dict[str, Any]],
+    selection_metric: str = "total_net_pnl",
+    top_k: int = 10,
+    eta: int = 2,
+    min_bars: int = 200,
+    cache: ResultCache | None = None,
+    checkpoint: GridCheckpoint | None = None,
+) -> tuple[list[GridResult], dict[str, Any], HalvingReport]:
+    """
+    Successive halving over the grid on growing prefixes of the train split.
+
+    Every item is scored on the shortest prefix; the best 1/eta (never fewer
+    than top_k) move on to a prefix eta times longer, and so on until the
+    survivors run on the full train window, where the best is picked as in
+    run_grid_on_train. Prefixes are never shorter than min_bars. Ties keep
+    grid order.
+
+    Returns (results for the full-window survivors, best_grid_item, report).
+    """
+    if eta < 2:
+        raise ValueError("eta must be >= 2.")
+    _check_selection_metric(selection_metric)
+
+    bars = BarArrays.from_frame(train)
+    n = len(bars)
+    schedule = _halving_schedule(n, len(grid), max(int(top_k), 1), eta, min_bars)
+
+    alive = list(range(len(grid)))
+    rungs: list[HalvingRung] = []
+    for n_bars in schedule[:-1]:
+        metrics = _grid_metrics(
+            bars.slice(0, n_bars),
+            symbol,
+            [grid[k] for k in alive],
+            cache=cache,
+            checkpoint=checkpoint,
+        )
+        rungs.append(HalvingRung(n_bars=n_bars, n_candidates=len(alive)))
+
+        keep = max(int(top_k), -(-len(alive) // eta))
+        scores = [_score(m, selection_metric) for m in metrics]
+        ranked = sorted(range(len(alive)), key=lambda j: -scores[j])
+        alive = sorted(alive[j] for j in ranked[:keep])
+
+    items = [grid[k] for k in alive]
+    metrics = _grid_metrics(bars, symbol, items, cache=cache, checkpoint=checkpoint)
+    rungs.append(HalvingRung(n_bars=n, n_candidates=len(items)))
+    results, best_item = _select_best(items, metrics, selection_metric)
+
+    report = HalvingReport(
+        rungs=rungs,
+        bar_evaluations=sum(r.n_bars * r.n_candidates for r in rungs),
+        full_bar_evaluations=n * len(grid),
+    )
+    return results, best_item, report
 
 
 def run_walkforward_abc(
@@ -78,18 +399,78 @@ def run_walkforward_abc(
     test: pd.DataFrame,
     symbol: str,
     grid: list[dict[str, Any]],
+    workers: int | None = None,
+    cache: ResultCache | None = None,
+    selection_metric: str = "total_net_pnl",
+    search: str = "grid",
+    top_k: int = 10,
+    checkpoint: GridCheckpoint | None = None,
 ) -> dict[str, Any]:
     """
-    1) Run grid on A, pick best by total_net_pnl
+    1) Run grid on A, pick best by selection_metric
     2) Evaluate best on B and C
+
+    search="halving" runs step 1 as run_grid_halving (keeping at least top_k
+    items per rung); train_grid_runs then holds the full-window survivors and
+    "halving_report" is added to the output.
+
+    workers > 1 places A/B/C in shared memory once and runs the grid and the
+    B/C evaluations on a process pool (same results as the serial path).
+    cache (ResultCache) and checkpoint (GridCheckpoint) are used for the grid
+    and the B/C evaluations alike.
     """
-    all_results, best_item = run_grid_on_train(train, symbol=symbol, grid=grid)
+    if search not in ("grid", "halving"):
+        raise ValueError(f"Unknown search: {search!r} (expected 'grid' or 'halving')")
+    _check_selection_metric(selection_metric)
+    split_bars = {
+        "train": BarArrays.from_frame(train),
+        "validate": BarArrays.from_frame(validate),
+        "test": BarArrays.from_frame(test),
+    }
 
-    best_strat = StrategyParams(**best_item.get("strategy", {}))
-    best_entry = EntryRuleParams(**best_item.get("entry", {}))
+    def _evaluate(pool: ProcessPoolExecutor | None, n_workers: int) -> tuple[Any, ...]:
+        if search == "halving":
+            all_results, best_item, report = run_grid_halving(
+                train,
+                symbol,
+                grid,
+                selection_metric=selection_metric,
+                top_k=top_k,
+                cache=cache,
+                checkpoint=checkpoint,
+            )
+        else:
+            metrics = _grid_metrics(
+                split_bars["train"],
+                symbol,
+                grid,
+                pool=pool,
+                workers=n_workers,
+                cache=cache,
+                checkpoint=checkpoint,
+            )
+            all_results, best_item = _select_best(grid, metrics, selection_metric)
+            report = None
+        b_metrics, c_metrics = (
+            _grid_metrics(
+                split_bars[key],
+                symbol,
+                [best_item],
+                pool=pool,
+                workers=n_workers,
+                key=key,
+                cache=cache,
+                checkpoint=checkpoint,
+            )[0]
+            for key in ("validate", "test")
+        )
+        return all_results, best_item, b_metrics, c_metrics, report
 
-    b_metrics = _run_one(validate, symbol=symbol, strat_params=best_strat, entry_params=best_entry)
-    c_metrics = _run_one(test, symbol=symbol, strat_params=best_strat, entry_params=best_entry)
+    if workers is not None and workers > 1 and grid:
+        with shared_bars_pool(split_bars, workers) as pool:
+            all_results, best_item, b_metrics, c_metrics, report = _evaluate(pool, workers)
+    else:
+        all_results, best_item, b_metrics, c_metrics, report = _evaluate(None, 1)
 
     runs_df = pd.DataFrame(
         [
@@ -102,9 +483,169 @@ def run_walkforward_abc(
         ]
     )
 
-    return {
+    out = {
         "best_params": best_item,
         "validate_metrics": b_metrics,
         "test_metrics": c_metrics,
         "train_grid_runs": runs_df,
     }
+    if report is not None:
+        out["halving_report"] = report
+    return out
+
+
+@dataclass(frozen=True)
+class FoldResult:
+    fold: Fold
+    best_params: dict[str, Any]
+    train_metrics: dict[str, Any]
+    validate_metrics: dict[str, Any]
+    test_metrics: dict[str, Any]
+    test_trades: TradeTable
+    test_pnl: PnLArrays
+    test_accumulator: MetricsAccumulator
+
+
+@dataclass(frozen=True)
+class WalkForwardResult:
+    folds: list[FoldResult]
+    fold_metrics: pd.DataFrame
+    oos_trades: pd.DataFrame
+    oos_metrics: Metrics
+
+
+def run_fold(
+    bars: BarArrays,
+    symbol: str,
+    grid: list[dict[str, Any]],
+    fold: Fold,
+    selection_metric: str = "total_net_pnl",
+    cache: ResultCache | None = None,
+    checkpoint: GridCheckpoint | None = None,
+) -> FoldResult:
+    """
+    Optimize-then-evaluate on one fold: grid on the train range, pick the best
+    by selection_metric, evaluate it on the validate and test ranges. Every
+    range is a BarArrays.slice view, run from a flat state like an A/B/C split.
+    """
+    _check_selection_metric(selection_metric)
+    metrics = _grid_metrics(
+        bars.slice(*fold.train), symbol, grid, cache=cache, checkpoint=checkpoint
+    )
+    results, best_item = _select_best(grid, metrics, selection_metric)
+    train_metrics = results[grid.index(best_item)].metrics
+
+    validate_metrics = _grid_metrics(
+        bars.slice(*fold.validate), symbol, [best_item], cache=cache, checkpoint=checkpoint
+    )[0]
+
+    strat_params = StrategyParams(**best_item.get("strategy", {}))
+    table = run_backtest_v1_table(
+        bars.slice(*fold.test),
+        symbol=symbol,
+        params=strat_params,
+        entry_params=EntryRuleParams(**best_item.get("entry", {})),
+        mode="event",
+    )
+    pnl = apply_costs_table(table, strat_params)
+    acc = MetricsAccumulator()
+    acc.update_many(pnl.net_pnl)
+
+    return FoldResult(
+        fold=fold,
+        best_params=best_item,
+        train_metrics=train_metrics,
+        validate_metrics=validate_metrics,
+        test_metrics=metrics_to_dict(acc.to_metrics()),
+        test_trades=table,
+        test_pnl=pnl,
+        test_accumulator=acc,
+    )
+
+
+def _run_fold_task(
+    task: tuple[
+        str, str, list[dict[str, Any]], Fold, str, ResultCache | None, GridCheckpoint | None
+    ],
+) -> FoldResult:
+    key, symbol, grid, fold, selection_metric, cache, checkpoint = task
+    return run_fold(worker_bars(key), symbol, grid, fold, selection_metric, cache, checkpoint)
+
+
+def run_walkforward_folds(
+    bars: BarArrays,
+    symbol: str,
+    grid: list[dict[str, Any]],
+    folds: Sequence[Fold],
+    selection_metric: str = "total_net_pnl",
+    workers: int | None = None,
+    cache: ResultCache | None = None,
+    checkpoint: GridCheckpoint | None = None,
+) -> WalkForwardResult:
+    """
+    run_fold over every fold (see splits.make_walkforward_folds).
+
+    workers > 1 runs folds concurrently on a process pool; the bars are placed
+    once in shared memory and each worker slices its fold ranges from them.
+    Results are the same as the serial path. A checkpoint is shared by every
+    fold (workers append to the same log).
+
+    Returns per-fold results, a per-fold metrics frame (one row per fold,
+    train/validate/test metrics prefixed) and the stitched out-of-sample
+    trade log: every fold's test-range trades, in fold order, with costs.
+    oos_metrics merges the folds' test accumulators in fold order (the metrics
+    of the stitched log, without re-reading it).
+    """
+    _check_selection_metric(selection_metric)
+    if workers is not None and workers > 1 and len(folds) > 1:
+        with shared_bars_pool({"bars": bars}, workers) as pool:
+            tasks = [("bars", symbol, grid, f, selection_metric, cache, checkpoint) for f in folds]
+            fold_results = list(pool.map(_run_fold_task, tasks))
+    else:
+        fold_results = [
+            run_fold(bars, symbol, grid, f, selection_metric, cache, checkpoint) for f in folds
+        ]
+
+    oos = MetricsAccumulator()
+    for r in fold_results:
+        oos = oos.merge(r.test_accumulator)
+
+    return WalkForwardResult(
+        folds=fold_results,
+        fold_metrics=_fold_metrics_frame(bars, fold_results),
+        oos_trades=_stitch_oos(fold_results),
+        oos_metrics=oos.to_metrics(),
+    )
+
+
+def _fold_metrics_frame(bars: BarArrays, fold_results: list[FoldResult]) -> pd.DataFrame:
+    rows = []
+    for r in fold_results:
+        f = r.fold
+        row: dict[str, Any] = {
+            "fold": f.index,
+            "train_start_ts": int(bars.ts[f.train_start]),
+            "test_start_ts": int(bars.ts[f.validate_stop]),
+            "test_end_ts": int(bars.ts[f.test_stop - 1]),
+            "strategy": r.best_params.get("strategy", {}),
+            "entry": r.best_params.get("entry", {}),
+        }
+        for prefix, m in (
+            ("train", r.train_metrics),
+            ("validate", r.validate_metrics),
+            ("test", r.test_metrics),
+        ):
+            row.update({f"{prefix}_{k}": v for k, v in m.items()})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _stitch_oos(fold_results: list[FoldResult]) -> pd.DataFrame:
+    frames = []
+    for r in fold_results:
+        df = pnl_frame(r.test_trades, r.test_pnl)
+        df.insert(0, "fold", r.fold.index)
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+from collections.abc import Iterable, Sequence
+from dataclasses import asdict, dataclass, replace
 
 import numpy as np
+import pandas as pd
 
 
 @dataclass(frozen=True)
@@ -56,10 +58,226 @@ def compute_metrics(net_pnls: list[float]) -> Metrics:
     )
 
 
+@dataclass
+class MetricsAccumulator:
+    """
+    Online compute_metrics: O(1) state and O(1) work per trade.
+
+    Equity is the running sum of net PnL; like compute_metrics, the drawdown
+    peak starts at the first trade's equity (not at 0). Two accumulators over
+    consecutive trade streams merge into the accumulator of the concatenated
+    stream, so folds or chunks can be reduced in any grouping. Sums are
+    sequential, so results match compute_metrics up to float rounding.
+    """
+
+    trades: int = 0
+    wins: int = 0
+    win_sum: float = 0.0
+    loss_sum: float = 0.0
+    total: float = 0.0
+    peak: float = float("-inf")  # max equity so far
+    min_equity: float = float("inf")  # min equity so far
+    mdd: float = 0.0
+
+    def update(self, net_pnl: float) -> None:
+        x = float(net_pnl)
+        self.trades += 1
+        if x > 0:
+            self.wins += 1
+            self.win_sum += x
+        elif x < 0:
+            self.loss_sum += x
+        self.total += x
+        self.peak = max(self.peak, self.total)
+        self.min_equity = min(self.min_equity, self.total)
+        self.mdd = min(self.mdd, self.total - self.peak)
+
+    def update_many(self, net_pnls: Iterable[float] | np.ndarray) -> None:
+        """update() for every trade in order, as array ops (same bits as the loop)."""
+        if isinstance(net_pnls, np.ndarray):
+            x = net_pnls.astype(np.float64, copy=False).ravel()
+        else:
+            x = np.fromiter(net_pnls, dtype=np.float64)
+        if x.size == 0:
+            return
+        equity = _running_sum(self.total, x)
+        peak = np.maximum.accumulate(np.concatenate(([self.peak], equity)))[1:]
+        wins = x[x > 0]
+        losses = x[x < 0]
+
+        self.trades += int(x.size)
+        self.wins += int(wins.size)
+        if wins.size:
+            self.win_sum = float(_running_sum(self.win_sum, wins)[-1])
+        if losses.size:
+            self.loss_sum = float(_running_sum(self.loss_sum, losses)[-1])
+        self.total = float(equity[-1])
+        self.peak = float(peak[-1])
+        self.min_equity = min(self.min_equity, float(equity.min()))
+        self.mdd = min(self.mdd, float((equity - peak).min()))
+
+    def merge(self, later: MetricsAccumulator) -> MetricsAccumulator:
+        """Accumulator of this stream followed by `later` (order matters for mdd)."""
+        if later.trades == 0:
+            return replace(self)
+        if self.trades == 0:
+            return replace(later)
+        return MetricsAccumulator(
+            trades=self.trades + later.trades,
+            wins=self.wins + later.wins,
+            win_sum=self.win_sum + later.win_sum,
+            loss_sum=self.loss_sum + later.loss_sum,
+            total=self.total + later.total,
+            peak=max(self.peak, self.total + later.peak),
+            min_equity=min(self.min_equity, self.total + later.min_equity),
+            # later's own drawdowns, or a fall from this stream's peak
+            mdd=min(self.mdd, later.mdd, self.total + later.min_equity - self.peak),
+        )
+
+    def to_metrics(self) -> Metrics:
+        n = self.trades
+        if n == 0:
+            return compute_metrics([])
+        return Metrics(
+            trades=n,
+            win_rate=float(self.wins) / float(n),
+            expectancy=self.total / n,
+            profit_factor=(
+                self.win_sum / abs(self.loss_sum) if self.loss_sum != 0.0 else float("inf")
+            ),
+            mdd=self.mdd,
+            total_net_pnl=self.total,
+        )
+
+
+def _running_sum(start: float, x: np.ndarray) -> np.ndarray:
+    """start + x[0], then + x[1], ... added left to right (np.cumsum is sequential)."""
+    return np.cumsum(np.concatenate(([start], x)))[1:]
+
+
 def metrics_to_dict(m: Metrics) -> dict:
     d = asdict(m)
     # Normalize inf for JSON
     if d["profit_factor"] == float("inf"):
         d["profit_factor"] = None
-        d["profit_factor_note"] = "infinite (no losing trades)"
+        d["profit_factor_note"] = _PF_NOTE
     return d
+
+
+_PF_NOTE = "infinite (no losing trades)"
+
+
+def compute_metrics_batch(
+    net_pnls: np.ndarray | Sequence[Sequence[float]],
+    lengths: np.ndarray | Sequence[int] | None = None,
+) -> pd.DataFrame:
+    """
+    compute_metrics for many PnL series at once (one row per series).
+
+    net_pnls is either a ragged sequence of series or a 2-D array padded on
+    the right; for a padded array, lengths gives each row's trade count
+    (default: every column counts). Returns one row per series with the
+    metrics_to_dict columns: profit_factor is None where infinite, and
+    profit_factor_note is present when any row has no losing trades.
+
+    Fields come from whole-matrix NumPy reductions arranged to add in the
+    same order as compute_metrics, so every value is bit-identical to it.
+    """
+    if isinstance(net_pnls, np.ndarray) and net_pnls.ndim == 2:
+        x = net_pnls.astype(np.float64)
+        n = (
+            np.full(x.shape[0], x.shape[1], dtype=np.int64)
+            if lengths is None
+            else np.asarray(lengths, dtype=np.int64)
+        )
+    else:
+        rows = [np.asarray(r, dtype=np.float64) for r in net_pnls]
+        n = np.array([r.shape[0] for r in rows], dtype=np.int64)
+        x = np.zeros((len(rows), int(n.max()) if rows else 0))
+        for k, r in enumerate(rows):
+            x[k, : r.shape[0]] = r
+
+    arrays = metric_arrays(x, n)
+    infinite = np.isinf(arrays["profit_factor"])
+    frame = pd.DataFrame(arrays)
+    frame["profit_factor"] = frame["profit_factor"].astype(object).where(~infinite, None)
+    if infinite.any():
+        frame["profit_factor_note"] = np.where(infinite, _PF_NOTE, None)
+    return frame
+
+
+def metric_arrays(x: np.ndarray, lengths: np.ndarray | None = None) -> dict[str, np.ndarray]:
+    """
+    Metrics fields as arrays (one element per row of the 2-D PnL matrix x).
+
+    Row k's series is x[k, :lengths[k]] (default: the whole row). As in
+    compute_metrics, profit_factor is inf for rows with trades but no losses
+    and every field is 0 for rows without trades.
+    """
+    n = (
+        np.full(x.shape[0], x.shape[1], dtype=np.int64)
+        if lengths is None
+        else np.asarray(lengths, dtype=np.int64)
+    )
+    if lengths is not None:
+        # Padding is zeroed: it adds nothing to the sums and keeps equity
+        # flat, so it cannot deepen the drawdown either.
+        x = np.where(np.arange(x.shape[1]) < n[:, None], x, 0.0)
+
+    has_trades = n > 0
+    safe_n = np.maximum(n, 1)
+    wins = x > 0
+    total = _row_sums(x, n)
+    win_sum = _row_sums(*_pack_left(x, wins))
+    loss_sum = _row_sums(*_pack_left(x, x < 0))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profit_factor = np.where(loss_sum != 0.0, win_sum / np.abs(loss_sum), np.inf)
+
+    if x.shape[1]:
+        equity = np.cumsum(x, axis=1)
+        mdd = (equity - np.maximum.accumulate(equity, axis=1)).min(axis=1)
+    else:
+        mdd = np.zeros(x.shape[0])
+
+    return {
+        "trades": n,
+        "win_rate": np.where(has_trades, wins.sum(axis=1) / safe_n, 0.0),
+        "expectancy": np.where(has_trades, total / safe_n, 0.0),
+        "profit_factor": np.where(has_trades, profit_factor, 0.0),
+        "mdd": mdd,
+        "total_net_pnl": total,
+    }
+
+
+def _row_sums(x: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    x[k, :lengths[k]].sum() for every row k, bit-identical to the 1-D sum.
+
+    np.sum adds pairwise, so its result depends on the series length; rows
+    are reduced in groups of equal length instead of over zero padding.
+    """
+    out = np.zeros(x.shape[0])
+    for length in np.unique(lengths[lengths > 0]).tolist():
+        rows = lengths == length
+        out[rows] = x[rows, :length].sum(axis=1)
+    return out
+
+
+def _pack_left(x: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Each row's x[mask] moved to the front in order (like arr[arr > 0]), and its count."""
+    counts = mask.sum(axis=1)
+    packed = np.zeros_like(x)
+    rows, cols = np.nonzero(mask)
+    packed[rows, np.cumsum(mask, axis=1)[rows, cols] - 1] = x[rows, cols]
+    return packed, counts
+
+
+def metrics_frame_to_dicts(frame: pd.DataFrame) -> list[dict]:
+    """compute_metrics_batch rows as metrics_to_dict-style dicts."""
+    out = []
+    for row in frame.to_dict("records"):
+        if not isinstance(row.get("profit_factor_note"), str):
+            row.pop("profit_factor_note", None)
+        out.append(row)
+    return out
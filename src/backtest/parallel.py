@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.backtest.arrays import BarArrays
+
+_FLOAT_COLS = ("high", "low", "close", "vwap", "atr", "ema50_1h", "ema200_1h")
+
+
+@dataclass(frozen=True)
+class SharedBarsHandle:
+    """Picklable reference to a BarArrays block in shared memory."""
+
+    name: str
+    n: int
+    has_vol_ratio: bool
+
+
+def _columns(has_vol_ratio: bool) -> tuple[str, ...]:
+    return ("ts", *_FLOAT_COLS, *(("vol_ratio",) if has_vol_ratio else ()))
+
+
+def _view(buf: memoryview, handle: SharedBarsHandle) -> BarArrays:
+    # Every column is 8 bytes wide, laid out back to back.
+    cols = {}
+    for k, name in enumerate(_columns(handle.has_vol_ratio)):
+        dtype = np.int64 if name == "ts" else np.float64
+        arr = np.ndarray((handle.n,), dtype=dtype, buffer=buf, offset=k * handle.n * 8)
+        cols[name] = arr
+    return BarArrays(**cols)
+
+
+class SharedBars:
+    """
+    Owner side of a BarArrays copy placed once in multiprocessing.shared_memory.
+
+    Workers attach by handle (attach_bars) instead of receiving pickled frames.
+    The owner must outlive the workers; close() releases and unlinks the block.
+    """
+
+    def __init__(self, bars: BarArrays) -> None:
+        n = len(bars)
+        has_vol_ratio = bars.vol_ratio is not None
+        nbytes = len(_columns(has_vol_ratio)) * n * 8
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        self.handle = SharedBarsHandle(name=self._shm.name, n=n, has_vol_ratio=has_vol_ratio)
+
+        view = _view(self._shm.buf, self.handle)
+        for name in _columns(has_vol_ratio):
+            getattr(view, name)[:] = getattr(bars, name)
+        del view
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> SharedBars:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def attach_bars(handle: SharedBarsHandle) -> tuple[shared_memory.SharedMemory, BarArrays]:
+    """
+    Attach to a SharedBars block. Returns the SharedMemory (keep it referenced
+    while the arrays are in use) and read-only BarArrays views into it.
+    """
+    if sys.version_info >= (3, 13):
+        # The owner unlinks; attached processes must not register the block.
+        shm = shared_memory.SharedMemory(name=handle.name, track=False)
+    else:
+        shm = shared_memory.SharedMemory(name=handle.name)
+    bars = _view(shm.buf, handle)
+    for name in _columns(handle.has_vol_ratio):
+        getattr(bars, name).flags.writeable = False
+    return shm, bars
+
+
+# Worker-process registry, filled once per worker by the pool initializer.
+_WORKER_BARS: dict[str, tuple[shared_memory.SharedMemory, BarArrays]] = {}
+
+
+def _init_worker(handles: dict[str, SharedBarsHandle]) -> None:
+    for key, handle in handles.items():
+        _WORKER_BARS[key] = attach_bars(handle)
+
+
+def worker_bars(key: str) -> BarArrays:
+    """BarArrays registered under `key` in the current pool worker."""
+    return _WORKER_BARS[key][1]
+
+
+@contextmanager
+def shared_bars_pool(
+    bars: dict[str, BarArrays],
+    workers: int,
+) -> Iterator[ProcessPoolExecutor]:
+    """
+    Place each named BarArrays in shared memory once and start a process pool
+    whose workers attach to all of them at startup (see worker_bars).
+    """
+    owned: list[SharedBars] = []
+    try:
+        for frame_bars in bars.values():
+            owned.append(SharedBars(frame_bars))
+        handles = {key: sb.handle for key, sb in zip(bars, owned, strict=True)}
+        with ProcessPoolExecutor(
+            max_workers=int(workers),
+            initializer=_init_worker,
+            initargs=(handles,),
+        ) as pool:
+            yield pool
+    finally:
+        for sb in owned:
+            sb.close()
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.arrays import BarArrays
+from src.backtest.costs import PnLArrays, apply_costs_table
+from src.backtest.engine import bar_entry_candidates
+from src.backtest.types import SIDES, TradeTable
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import (
+    REASON_BITS,
+    ReasonCode,
+    Side,
+    StrategyParams,
+    reasons_to_mask,
+)
+
+_FLAT = 0
+_ORDER_PENDING = 1
+_IN_POSITION = 2
+
+_EXIT_REASONS = (ReasonCode.STOP, ReasonCode.TAKE_PROFIT, ReasonCode.TIME_STOP)
+
+
+@dataclass(frozen=True)
+class AlignedBars:
+    """
+    N symbols' engine columns on one common timestamp index.
+
+    Every 2-D array is (n_symbols, n_ts); present[s, t] is False where symbol
+    s has no bar at ts[t] (its columns hold NaN there). is_candidate marks
+    each symbol's entry candidates, computed on that symbol's own bars.
+    """
+
+    symbols: tuple[str, ...]
+    ts: np.ndarray
+    present: np.ndarray
+    is_candidate: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    vwap: np.ndarray
+    atr: np.ndarray
+
+    @classmethod
+    def from_bars(
+        cls,
+        bars: Mapping[str, BarArrays],
+        entry_params: EntryRuleParams | None = None,
+    ) -> AlignedBars:
+        if entry_params is None:
+            entry_params = EntryRuleParams(min_vol_ratio=None)
+
+        symbols = tuple(bars)
+        ts = (
+            np.unique(np.concatenate([b.ts for b in bars.values()]))
+            if bars
+            else np.empty(0, np.int64)
+        )
+        shape = (len(symbols), ts.shape[0])
+
+        present = np.zeros(shape, dtype=bool)
+        is_candidate = np.zeros(shape, dtype=bool)
+        cols = {name: np.full(shape, np.nan) for name in ("high", "low", "close", "vwap", "atr")}
+        for s, b in enumerate(bars.values()):
+            if b.ts.size > 1 and not (np.diff(b.ts) > 0).all():
+                raise ValueError(f"{symbols[s]}: ts must be strictly increasing")
+            pos = np.searchsorted(ts, b.ts)
+            present[s, pos] = True
+            is_candidate[s, pos[bar_entry_candidates(b, entry_params)]] = True
+            for name, dest in cols.items():
+                dest[s, pos] = getattr(b, name)
+
+        return cls(symbols=symbols, ts=ts, present=present, is_candidate=is_candidate, **cols)
+
+
+@dataclass(frozen=True)
+class PortfolioResult:
+    """
+    Combined trades (exit-time order, ties by symbol order), their costs, and
+    the portfolio's realized equity: cumulative net PnL of trades closed at
+    or before each common timestamp.
+    """
+
+    trades: TradeTable
+    pnl: PnLArrays
+    ts: np.ndarray
+    equity: np.ndarray
+
+    def equity_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({"ts": self.ts, "equity": self.equity})
+
+
+def run_portfolio_v1(
+    bars: Mapping[str, BarArrays],
+    params: StrategyParams,
+    entry_params: EntryRuleParams | None = None,
+) -> PortfolioResult:
+    """
+    The v1 state machine for N symbols in one pass over a common timestamp index.
+
+    Each symbol keeps its own FLAT / ORDER_PENDING / IN_POSITION state and
+    only advances on timestamps where it has a bar, so its trades are exactly
+    those of run_backtest_v1 on its bars alone; all symbols are stepped
+    together, vectorized across symbols. Memory is O(n_symbols * n_ts).
+
+    A fill on a bar with ATR <= 0 raises ValueError (as compute_long_brackets does).
+    """
+    if entry_params is None:
+        entry_params = EntryRuleParams(min_vol_ratio=None)
+
+    al = AlignedBars.from_bars(bars, entry_params)
+    n_sym, n_ts = al.present.shape
+
+    expiry_bars = int(params.limit_expiry_bars)
+    time_stop = None if params.time_stop_bars is None else int(params.time_stop_bars)
+    atr_mult = float(params.atr_stop_mult)
+    tp_r = float(params.take_profit_r)
+
+    state = np.full(n_sym, _FLAT, dtype=np.int8)
+    limit_px = np.zeros(n_sym)
+    age = np.zeros(n_sym, dtype=np.int64)
+    entry_t = np.zeros(n_sym, dtype=np.int64)
+    stop_px = np.zeros(n_sym)
+    tp_px = np.zeros(n_sym)
+    hold = np.zeros(n_sym, dtype=np.int64)
+
+    out_sym: list[np.ndarray] = []
+    out_entry: list[np.ndarray] = []
+    out_exit: list[int] = []
+    out_entry_px: list[np.ndarray] = []
+    out_exit_px: list[np.ndarray] = []
+    out_reason: list[np.ndarray] = []
+
+    # While every symbol is FLAT only candidate timestamps matter.
+    candidate_ts = np.flatnonzero(al.is_candidate.any(axis=0))
+    k = 0
+    t = int(candidate_ts[0]) if candidate_ts.size else n_ts
+    while t < n_ts:
+        active = al.present[:, t]
+        low = al.low[:, t]
+        high = al.high[:, t]
+        in_pos = active & (state == _IN_POSITION)
+        pending = active & (state == _ORDER_PENDING)
+        # Symbols that exit or expire on this bar look for entries from the next one.
+        flat = state == _FLAT
+
+        # IN_POSITION: stop first, then take profit, then time stop
+        if in_pos.any():
+            hold[in_pos] += 1
+            stop_hit = in_pos & (low <= stop_px)
+            tp_hit = in_pos & ~stop_hit & (high >= tp_px)
+            time_hit = in_pos & ~stop_hit & ~tp_hit
+            if time_stop is None:
+                time_hit[:] = False
+            else:
+                time_hit &= hold >= time_stop
+            exited = stop_hit | tp_hit | time_hit
+            if exited.any():
+                syms = np.flatnonzero(exited)
+                reason = np.where(stop_hit[syms], 0, np.where(tp_hit[syms], 1, 2))
+                px = np.where(
+                    reason == 0,
+                    stop_px[syms],
+                    np.where(reason == 1, tp_px[syms], al.close[syms, t]),
+                )
+                out_sym.append(syms)
+                out_entry.append(entry_t[syms])
+                out_exit.append(t)
+                out_entry_px.append(limit_px[syms])
+                out_exit_px.append(px)
+                out_reason.append(reason)
+                state[exited] = _FLAT
+
+        # ORDER_PENDING: fill, else age and expire
+        if pending.any():
+            filled = pending & (low <= limit_px) & (limit_px <= high)
+            if filled.any():
+                if (al.atr[filled, t] <= 0).any():
+                    raise ValueError("ATR must be > 0 to compute brackets.")
+                entry = limit_px[filled]
+                stop = entry - atr_mult * al.atr[filled, t]
+                tp_px[filled] = entry + tp_r * (entry - stop)
+                stop_px[filled] = stop
+                entry_t[filled] = t
+                hold[filled] = 0
+                state[filled] = _IN_POSITION
+
+            waiting = pending & ~filled
+            age[waiting] += 1
+            state[waiting & (age >= expiry_bars)] = _FLAT
+
+        # FLAT: place a limit at vwap on a candidate bar
+        placing = al.is_candidate[:, t] & flat
+        if placing.any():
+            limit_px[placing] = al.vwap[placing, t]
+            age[placing] = 0
+            state[placing] = _ORDER_PENDING
+
+        if (state == _FLAT).all():
+            while k < candidate_ts.size and candidate_ts[k] <= t:
+                k += 1
+            t = int(candidate_ts[k]) if k < candidate_ts.size else n_ts
+        else:
+            t += 1
+
+    trades = _combined_table(
+        al, entry_params, out_sym, out_entry, out_exit, out_entry_px, out_exit_px, out_reason
+    )
+    pnl = apply_costs_table(trades, params)
+
+    exit_pos = np.searchsorted(al.ts, trades.exit_ts)
+    equity = np.cumsum(np.bincount(exit_pos, weights=pnl.net_pnl, minlength=n_ts))
+    return PortfolioResult(trades=trades, pnl=pnl, ts=al.ts, equity=equity)
+
+
+def _combined_table(
+    al: AlignedBars,
+    entry_params: EntryRuleParams,
+    out_sym: list[np.ndarray],
+    out_entry: list[np.ndarray],
+    out_exit: list[int],
+    out_entry_px: list[np.ndarray],
+    out_exit_px: list[np.ndarray],
+    out_reason: list[np.ndarray],
+) -> TradeTable:
+    if not out_sym:
+        return TradeTable.empty(al.symbols)
+
+    counts = [a.shape[0] for a in out_sym]
+    reasons = [ReasonCode.ENTRY_CROSS]
+    if entry_params.min_vol_ratio is not None:
+        reasons.append(ReasonCode.VOL_CONFIRM)
+    entry_mask = reasons_to_mask(reasons + [ReasonCode.ORDER_PLACED, ReasonCode.LIMIT_FILLED])
+    exit_bits = np.array([REASON_BITS[r] for r in _EXIT_REASONS], dtype=np.uint32)
+
+    sym = np.concatenate(out_sym)
+    return TradeTable(
+        symbols=al.symbols,
+        symbol_id=sym.astype(np.int32),
+        side=np.full(sym.shape[0], SIDES.index(Side.LONG), dtype=np.int8),
+        entry_ts=al.ts[np.concatenate(out_entry)],
+        entry_px=np.concatenate(out_entry_px),
+        exit_ts=np.repeat(al.ts[np.array(out_exit, dtype=np.int64)], counts),
+        exit_px=np.concatenate(out_exit_px),
+        reasons=np.uint32(entry_mask) | exit_bits[np.concatenate(out_reason)],
+    )
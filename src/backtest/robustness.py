@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.metrics import metric_arrays
+
+BOOTSTRAP_METHODS = ("iid", "block")
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024
+
+# Rough bytes per resampled trade: int64 index, gathered PnL, cumsum, running max,
+# plus the win/loss packing in metric_arrays (packed PnL, positions, nonzero indices).
+_BYTES_PER_CELL = 72
+
+
+@dataclass(frozen=True)
+class BootstrapResult:
+    """
+    One value per resample for each metric. profit_factor is inf for resamples
+    without a losing trade (as compute_metrics returns before metrics_to_dict).
+    """
+
+    method: str
+    block_size: int
+    seed: int
+    total_net_pnl: np.ndarray
+    mdd: np.ndarray
+    profit_factor: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.total_net_pnl.shape[0])
+
+    def summary(self, quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95)) -> pd.DataFrame:
+        """Quantiles of each metric (rows) plus the mean and the share of resamples > 0."""
+        rows = {}
+        for name in ("total_net_pnl", "mdd", "profit_factor"):
+            values = getattr(self, name)
+            finite = values[np.isfinite(values)]
+            # Empirical (non-interpolated) quantiles stay defined when values hold inf.
+            row = {
+                f"q{q:g}": float(np.quantile(values, q, method="inverted_cdf")) for q in quantiles
+            }
+            row["mean"] = float(finite.mean()) if finite.size else float("nan")
+            row["share_positive"] = float((values > 0).mean())
+            rows[name] = row
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def _default_block_size(n: int) -> int:
+    return max(1, int(round(n ** (1.0 / 3.0))))
+
+
+def _resample_indices(
+    rng: np.random.Generator, n: int, rows: int, method: str, block_size: int
+) -> np.ndarray:
+    if method == "iid":
+        return rng.integers(0, n, size=(rows, n))
+    # Circular moving-block bootstrap: random block starts, wrapped at the end.
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(rows, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)) % n
+    return idx.reshape(rows, n_blocks * block_size)[:, :n]
+
+
+def bootstrap_metrics(
+    net_pnl: np.ndarray | Sequence[float],
+    n_resamples: int = 10_000,
+    method: str = "iid",
+    block_size: int | None = None,
+    seed: int = 0,
+    memory_bytes: int = DEFAULT_MEMORY_BYTES,
+) -> BootstrapResult:
+    """
+    Bootstrap distributions of total_net_pnl, mdd and profit_factor.
+
+    Each resample draws len(net_pnl) trades with replacement: independently
+    ("iid") or as circular blocks of block_size consecutive trades ("block",
+    default block size n ** (1/3)), which keeps short-range dependence such
+    as loss streaks. Resamples are evaluated as (rows, n) matrices with
+    metrics.metric_arrays, rows per chunk chosen to fit memory_bytes. Draws
+    come from one Generator seeded with `seed` in resample order, so results
+    do not depend on the memory budget.
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(
+            f"Unknown bootstrap method: {method!r} (expected one of {BOOTSTRAP_METHODS})"
+        )
+
+    x = np.asarray(net_pnl, dtype=np.float64)
+    n = int(x.shape[0])
+    if n == 0:
+        raise ValueError("Need at least one trade to bootstrap.")
+    if block_size is None:
+        block_size = _default_block_size(n)
+    if block_size < 1:
+        raise ValueError("block_size must be >= 1.")
+    if method == "iid":
+        block_size = 1
+
+    rng = np.random.default_rng(seed)
+    chunk = max(1, int(memory_bytes) // (n * _BYTES_PER_CELL))
+
+    out = {name: np.empty(n_resamples) for name in ("total_net_pnl", "mdd", "profit_factor")}
+    for lo in range(0, n_resamples, chunk):
+        hi = min(lo + chunk, n_resamples)
+        idx = _resample_indices(rng, n, hi - lo, method, block_size)
+        arrays = metric_arrays(x[idx])
+        for name, dest in out.items():
+            dest[lo:hi] = arrays[name]
+
+    return BootstrapResult(method=method, block_size=block_size, seed=seed, **out)
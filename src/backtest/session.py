@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+
+from src.backtest.types import Trade
+from src.strategies.v1.entry import EntryRuleParams, build_entry_signal
+from src.strategies.v1.exits import Brackets, check_long_exit, compute_long_brackets
+from src.strategies.v1.spec import (
+    ReasonCode,
+    Side,
+    StrategyParams,
+    mask_to_reasons,
+    reasons_to_mask,
+)
+from src.strategies.v1.trend_filter import trend_ok
+
+_FLAT = 0
+_ORDER_PENDING = 1
+_IN_POSITION = 2
+
+
+@dataclass
+class SessionState:
+    """
+    Everything BacktestSession carries between bars (plain JSON types).
+
+    prev_* is the previous bar (for the VWAP cross); reasons is the ReasonCode
+    bitmask of the pending order / open position.
+    """
+
+    state: int = _FLAT
+    has_prev: bool = False
+    prev_close: float = 0.0
+    prev_vwap: float = 0.0
+    limit_px: float = 0.0
+    age: int = 0
+    entry_ts: int = 0
+    entry_px: float = 0.0
+    stop_px: float = 0.0
+    tp_px: float = 0.0
+    hold: int = 0
+    reasons: int = 0
+
+
+@dataclass
+class BacktestSession:
+    """
+    run_backtest_v1 as a bar-at-a-time state machine (paper trading, replays
+    that do not fit in memory).
+
+    Feeding the frame's rows in order through on_bar yields exactly the trades
+    run_backtest_v1 returns for that frame. The first bar only seeds the
+    previous-bar values, as the batch loop starts at bar 1. Positions or orders
+    still open when feeding stops are simply kept in the state.
+
+    to_dict / from_dict round-trip the full session (params included) through
+    JSON-safe values for checkpointing.
+    """
+
+    symbol: str
+    params: StrategyParams
+    entry_params: EntryRuleParams = field(
+        default_factory=lambda: EntryRuleParams(min_vol_ratio=None)
+    )
+    state: SessionState = field(default_factory=SessionState)
+
+    def on_bar(
+        self,
+        ts: int,
+        high: float,
+        low: float,
+        close: float,
+        vwap: float,
+        atr: float,
+        ema50: float,
+        ema200: float,
+        vol_ratio: float | None = None,
+    ) -> list[Trade]:
+        """Advance one bar; returns the trades closed on it (at most one)."""
+        st = self.state
+        try:
+            if st.has_prev:
+                return self._step(
+                    int(ts),
+                    float(high),
+                    float(low),
+                    float(close),
+                    float(vwap),
+                    float(atr),
+                    float(ema50),
+                    float(ema200),
+                    vol_ratio,
+                )
+            return []
+        finally:
+            st.has_prev = True
+            st.prev_close = float(close)
+            st.prev_vwap = float(vwap)
+
+    def _step(
+        self,
+        ts: int,
+        high: float,
+        low: float,
+        close: float,
+        vwap: float,
+        atr: float,
+        ema50: float,
+        ema200: float,
+        vol_ratio: float | None,
+    ) -> list[Trade]:
+        st = self.state
+        params = self.params
+
+        if st.state == _IN_POSITION:
+            st.hold += 1
+
+            exit_px, exit_reason = check_long_exit(
+                low=low,
+                high=high,
+                brackets=Brackets(stop_px=st.stop_px, tp_px=st.tp_px),
+            )
+            if exit_px is None and params.time_stop_bars is not None:
+                if st.hold >= int(params.time_stop_bars):
+                    exit_px, exit_reason = close, ReasonCode.TIME_STOP
+
+            if exit_reason is None:
+                return []
+            st.state = _FLAT
+            return [
+                Trade(
+                    symbol=self.symbol,
+                    side=Side.LONG,
+                    entry_ts=st.entry_ts,
+                    entry_px=st.entry_px,
+                    exit_ts=ts,
+                    exit_px=float(exit_px),
+                    reasons=mask_to_reasons(st.reasons) + [exit_reason],
+                )
+            ]
+
+        if st.state == _ORDER_PENDING:
+            if low <= st.limit_px <= high:
+                brackets = compute_long_brackets(
+                    entry_px=st.limit_px,
+                    atr=atr,
+                    atr_mult=float(params.atr_stop_mult),
+                    take_profit_r=float(params.take_profit_r),
+                )
+                st.state = _IN_POSITION
+                st.entry_ts = ts
+                st.entry_px = st.limit_px
+                st.stop_px = brackets.stop_px
+                st.tp_px = brackets.tp_px
+                st.hold = 0
+                st.reasons = st.reasons | reasons_to_mask([ReasonCode.LIMIT_FILLED])
+                return []
+
+            st.age += 1
+            if st.age >= int(params.limit_expiry_bars):
+                st.state = _FLAT
+            return []
+
+        # FLAT
+        if not trend_ok(ema50, ema200).ok:
+            return []
+        sig = build_entry_signal(
+            ts=ts,
+            prev_close=st.prev_close,
+            prev_vwap=st.prev_vwap,
+            close=close,
+            vwap=vwap,
+            side=Side.LONG,
+            vol_ratio=None if vol_ratio is None else float(vol_ratio),
+            params=self.entry_params,
+        )
+        if sig is None:
+            return []
+
+        st.state = _ORDER_PENDING
+        st.limit_px = sig.limit_px
+        st.age = 0
+        st.reasons = reasons_to_mask(sig.reasons + [ReasonCode.ORDER_PLACED])
+        return []
+
+    def on_frame(self, frame: pd.DataFrame) -> list[Trade]:
+        """on_bar over every row of a run_backtest_v1-style frame, in order."""
+        has_vol = "vol_ratio" in frame.columns
+        trades: list[Trade] = []
+        for row in frame.itertuples(index=False):
+            trades.extend(
+                self.on_bar(
+                    ts=row.ts,
+                    high=row.high,
+                    low=row.low,
+                    close=row.close,
+                    vwap=row.vwap,
+                    atr=row.atr,
+                    ema50=row.ema50_1h,
+                    ema200=row.ema200_1h,
+                    vol_ratio=row.vol_ratio if has_vol else None,
+                )
+            )
+        return trades
+
+    def to_dict(self) -> dict:
+        return {
+            "symbol": self.symbol,
+            "params": asdict(self.params),
+            "entry_params": asdict(self.entry_params),
+            "state": asdict(self.state),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BacktestSession:
+        return cls(
+            symbol=data["symbol"],
+            params=StrategyParams(**data["params"]),
+            entry_params=EntryRuleParams(**data["entry_params"]),
+            state=SessionState(**data["state"]),
+        )
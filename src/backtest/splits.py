@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
 
@@ -29,11 +30,16 @@ def make_abc_split_by_ts(
     if ts_col not in df.columns:
         raise ValueError(f"df missing column: {ts_col}")
 
-    d = df.sort_values(ts_col).reset_index(drop=True)
+    d = df if df[ts_col].is_monotonic_increasing else df.sort_values(ts_col)
+    d = d.reset_index(drop=True)
+
+    # Sorted ts: each part is one contiguous row range.
+    ts = d[ts_col].to_numpy()
+    a_stop, b_stop = np.searchsorted(ts, [int(a_end_ts), int(b_end_ts)], side="right")
 
-    train = d[d[ts_col] <= int(a_end_ts)].copy()
-    validate = d[(d[ts_col] > int(a_end_ts)) & (d[ts_col] <= int(b_end_ts))].copy()
-    test = d[d[ts_col] > int(b_end_ts)].copy()
+    train = d.iloc[:a_stop].copy()
+    validate = d.iloc[a_stop:b_stop].copy()
+    test = d.iloc[b_stop:].copy()
 
     return ABCSplit(train=train, validate=validate, test=test)
 
@@ -66,3 +72,110 @@ def pick_cutoffs_by_ratio(
     a_end_ts = int(d.loc[a_idx, ts_col])
     b_end_ts = int(d.loc[b_idx, ts_col])
     return a_end_ts, b_end_ts
+
+
+WALKFORWARD_MODES = ("rolling", "anchored")
+
+
+@dataclass(frozen=True)
+class Fold:
+    """
+    One walk-forward fold as half-open bar index ranges over a sorted store:
+    train [train_start, train_stop), validate [train_stop, validate_stop),
+    test [validate_stop, test_stop).
+    """
+
+    index: int
+    train_start: int
+    train_stop: int
+    validate_stop: int
+    test_stop: int
+
+    @property
+    def train(self) -> tuple[int, int]:
+        return self.train_start, self.train_stop
+
+    @property
+    def validate(self) -> tuple[int, int]:
+        return self.train_stop, self.validate_stop
+
+    @property
+    def test(self) -> tuple[int, int]:
+        return self.validate_stop, self.test_stop
+
+
+def make_walkforward_folds(
+    n_bars: int,
+    train_bars: int,
+    validate_bars: int,
+    test_bars: int,
+    mode: str = "rolling",
+    n_folds: int | None = None,
+    step_bars: int | None = None,
+) -> list[Fold]:
+    """
+    Walk-forward folds over n_bars sorted bars.
+
+    Fold k's train window starts at k * step_bars ("rolling") or at 0
+    ("anchored", growing train); its validate and test windows follow it.
+    step_bars defaults to test_bars, so test windows tile without overlap.
+    n_folds=None makes as many folds as fit; asking for more raises.
+    """
+    if mode not in WALKFORWARD_MODES:
+        raise ValueError(
+            f"Unknown walk-forward mode: {mode!r} (expected one of {WALKFORWARD_MODES})"
+        )
+    if min(train_bars, validate_bars, test_bars) <= 0:
+        raise ValueError("train_bars, validate_bars and test_bars must be > 0.")
+    step = int(test_bars if step_bars is None else step_bars)
+    if step <= 0:
+        raise ValueError("step_bars must be > 0.")
+
+    span = train_bars + validate_bars + test_bars
+    fit = 0 if n_bars < span else (n_bars - span) // step + 1
+    if n_folds is None:
+        n_folds = fit
+    elif n_folds > fit:
+        raise ValueError(f"Only {fit} folds fit in {n_bars} bars; asked for {n_folds}.")
+
+    folds: list[Fold] = []
+    for k in range(int(n_folds)):
+        offset = k * step
+        train_stop = offset + train_bars
+        folds.append(
+            Fold(
+                index=k,
+                train_start=offset if mode == "rolling" else 0,
+                train_stop=train_stop,
+                validate_stop=train_stop + validate_bars,
+                test_stop=train_stop + validate_bars + test_bars,
+            )
+        )
+    return folds
+
+
+def folds_from_config(walkforward_cfg: dict, n_bars: int) -> list[Fold]:
+    """
+    Folds from the `walkforward` config section (mode: rolling | anchored):
+
+      walkforward:
+        mode: "rolling"
+        folds:
+          n_folds: 4          # optional, default: as many as fit
+          train_bars: 500
+          validate_bars: 100
+          test_bars: 100
+          step_bars: null     # optional, default: test_bars
+    """
+    folds_cfg = walkforward_cfg.get("folds", {})
+    n_folds = folds_cfg.get("n_folds")
+    step_bars = folds_cfg.get("step_bars")
+    return make_walkforward_folds(
+        n_bars,
+        train_bars=int(folds_cfg["train_bars"]),
+        validate_bars=int(folds_cfg["validate_bars"]),
+        test_bars=int(folds_cfg["test_bars"]),
+        mode=walkforward_cfg.get("mode", "rolling"),
+        n_folds=None if n_folds is None else int(n_folds),
+        step_bars=None if step_bars is None else int(step_bars),
+    )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from src.backtest.arrays import BarArrays
+from src.backtest.costs import PnLArrays, apply_costs_sweep, cost_multiplier_matrix, pnl_frame
+from src.backtest.engine import run_backtest_v1_table
+from src.backtest.metrics import Metrics, metric_arrays
+from src.backtest.types import TradeTable
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+
+@dataclass(frozen=True)
+class CostSweep:
+    """
+    One engine run costed under M (maker, taker, slippage) multiplier rows.
+
+    pnl holds (M, n_trades) arrays; row k is what apply_costs gives for
+    params_for(k). Fees and slippage never change which trades happen, so
+    the same table serves every row.
+    """
+
+    table: TradeTable
+    params: StrategyParams
+    multipliers: np.ndarray
+    pnl: PnLArrays
+
+    def __len__(self) -> int:
+        return int(self.multipliers.shape[0])
+
+    def params_for(self, k: int) -> StrategyParams:
+        maker, taker, slip = self.multipliers[k].tolist()
+        return replace(
+            self.params,
+            maker_fee_bps=self.params.maker_fee_bps * maker,
+            taker_fee_bps=self.params.taker_fee_bps * taker,
+            slippage_bps=self.params.slippage_bps * slip,
+        )
+
+    def metrics(self) -> list[Metrics]:
+        arrays = metric_arrays(self.pnl.net_pnl)
+        return [
+            Metrics(
+                trades=int(arrays["trades"][k]),
+                win_rate=float(arrays["win_rate"][k]),
+                expectancy=float(arrays["expectancy"][k]),
+                profit_factor=float(arrays["profit_factor"][k]),
+                mdd=float(arrays["mdd"][k]),
+                total_net_pnl=float(arrays["total_net_pnl"][k]),
+            )
+            for k in range(len(self))
+        ]
+
+    def pnl_frame(self, k: int) -> pd.DataFrame:
+        return pnl_frame(self.table, self.pnl.row(k))
+
+
+def cost_sweep(
+    table: TradeTable,
+    params: StrategyParams,
+    multipliers: Sequence[float | Sequence[float]],
+) -> CostSweep:
+    mults = cost_multiplier_matrix(multipliers)
+    pnl = apply_costs_sweep(
+        table.entry_px,
+        table.exit_px,
+        table.side,
+        table.exit_is_taker,
+        params,
+        mults,
+    )
+    return CostSweep(table=table, params=params, multipliers=mults, pnl=pnl)
+
+
+def run_cost_sweep(
+    bars: BarArrays,
+    symbol: str,
+    params: StrategyParams,
+    multipliers: Sequence[float | Sequence[float]],
+    entry_params: EntryRuleParams | None = None,
+    *,
+    mode: str = "event",
+) -> CostSweep:
+    """Run the v1 engine once for params and cost it under every multiplier row."""
+    table = run_backtest_v1_table(
+        bars,
+        symbol=symbol,
+        params=params,
+        entry_params=entry_params,
+        mode=mode,
+    )
+    return cost_sweep(table, params, multipliers)
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
+from pathlib import Path
 
-from src.strategies.v1.spec import ReasonCode, Side
+import numpy as np
+import pandas as pd
+
+from src.strategies.v1.spec import ReasonCode, Side, mask_to_reasons, reasons_to_mask
+
+SIDES: tuple[Side, ...] = tuple(Side)
 
 
 @dataclass(frozen=True)
@@ -17,3 +24,159 @@ class Trade:
     exit_px: float
 
     reasons: list[ReasonCode]
+
+
+@dataclass(frozen=True)
+class TradeTable:
+    """
+    Trades as a structure of arrays (one row per trade).
+
+    symbol_id indexes `symbols`, side indexes SIDES, reasons is a ReasonCode
+    bitmask (see spec.REASON_BITS). Trade objects are only built on access
+    (iteration, indexing, to_trades); to_frame / to_csv / to_parquet work on
+    the columns directly.
+    """
+
+    symbols: tuple[str, ...]
+    symbol_id: np.ndarray
+    side: np.ndarray
+    entry_ts: np.ndarray
+    entry_px: np.ndarray
+    exit_ts: np.ndarray
+    exit_px: np.ndarray
+    reasons: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.symbol_id.shape[0])
+
+    def __iter__(self) -> Iterator[Trade]:
+        decoded: dict[int, list[ReasonCode]] = {}
+        for sid, side, entry_ts, entry_px, exit_ts, exit_px, mask in zip(
+            self.symbol_id.tolist(),
+            self.side.tolist(),
+            self.entry_ts.tolist(),
+            self.entry_px.tolist(),
+            self.exit_ts.tolist(),
+            self.exit_px.tolist(),
+            self.reasons.tolist(),
+            strict=True,
+        ):
+            reasons = decoded.get(mask)
+            if reasons is None:
+                reasons = decoded[mask] = mask_to_reasons(mask)
+            yield Trade(
+                symbol=self.symbols[sid],
+                side=SIDES[side],
+                entry_ts=entry_ts,
+                entry_px=entry_px,
+                exit_ts=exit_ts,
+                exit_px=exit_px,
+                reasons=list(reasons),
+            )
+
+    def __getitem__(self, key: int | slice | np.ndarray) -> Trade | TradeTable:
+        if isinstance(key, int | np.integer):
+            n = len(self)
+            k = int(key) + n if key < 0 else int(key)
+            if not 0 <= k < n:
+                raise IndexError(f"TradeTable index {int(key)} out of range for {n} trades")
+            return Trade(
+                symbol=self.symbols[int(self.symbol_id[k])],
+                side=SIDES[int(self.side[k])],
+                entry_ts=int(self.entry_ts[k]),
+                entry_px=float(self.entry_px[k]),
+                exit_ts=int(self.exit_ts[k]),
+                exit_px=float(self.exit_px[k]),
+                reasons=mask_to_reasons(int(self.reasons[k])),
+            )
+        return TradeTable(
+            symbols=self.symbols,
+            symbol_id=self.symbol_id[key],
+            side=self.side[key],
+            entry_ts=self.entry_ts[key],
+            entry_px=self.entry_px[key],
+            exit_ts=self.exit_ts[key],
+            exit_px=self.exit_px[key],
+            reasons=self.reasons[key],
+        )
+
+    def to_trades(self) -> list[Trade]:
+        return list(self)
+
+    @property
+    def exit_is_taker(self) -> np.ndarray:
+        """Exits filled as taker (STOP / TAKE_PROFIT / TIME_STOP), per apply_costs."""
+        taker = reasons_to_mask([ReasonCode.STOP, ReasonCode.TAKE_PROFIT, ReasonCode.TIME_STOP])
+        return (self.reasons & taker) != 0
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "symbol": pd.Categorical.from_codes(self.symbol_id, categories=list(self.symbols)),
+                "side": pd.Categorical.from_codes(self.side, categories=[s.value for s in SIDES]),
+                "entry_ts": self.entry_ts,
+                "entry_px": self.entry_px,
+                "exit_ts": self.exit_ts,
+                "exit_px": self.exit_px,
+                "reason_mask": self.reasons,
+            }
+        )
+
+    def to_csv(self, path: str | Path) -> None:
+        self.to_frame().to_csv(path, index=False)
+
+    def to_parquet(self, path: str | Path) -> None:
+        # Needs a parquet engine (pyarrow or fastparquet) installed.
+        self.to_frame().to_parquet(path, index=False)
+
+    @classmethod
+    def empty(cls, symbols: Sequence[str] = ()) -> TradeTable:
+        return cls(
+            symbols=tuple(symbols),
+            symbol_id=np.empty(0, dtype=np.int32),
+            side=np.empty(0, dtype=np.int8),
+            entry_ts=np.empty(0, dtype=np.int64),
+            entry_px=np.empty(0, dtype=np.float64),
+            exit_ts=np.empty(0, dtype=np.int64),
+            exit_px=np.empty(0, dtype=np.float64),
+            reasons=np.empty(0, dtype=np.uint32),
+        )
+
+    @classmethod
+    def from_trades(cls, trades: Sequence[Trade]) -> TradeTable:
+        symbols = tuple(dict.fromkeys(t.symbol for t in trades))
+        sid = {s: k for k, s in enumerate(symbols)}
+        return cls(
+            symbols=symbols,
+            symbol_id=np.array([sid[t.symbol] for t in trades], dtype=np.int32),
+            side=np.array([SIDES.index(t.side) for t in trades], dtype=np.int8),
+            entry_ts=np.array([t.entry_ts for t in trades], dtype=np.int64),
+            entry_px=np.array([t.entry_px for t in trades], dtype=np.float64),
+            exit_ts=np.array([t.exit_ts for t in trades], dtype=np.int64),
+            exit_px=np.array([t.exit_px for t in trades], dtype=np.float64),
+            reasons=np.array([reasons_to_mask(t.reasons) for t in trades], dtype=np.uint32),
+        )
+
+    @classmethod
+    def concat(cls, tables: Sequence[TradeTable]) -> TradeTable:
+        """Stack tables, remapping symbol ids onto one combined symbol list."""
+        symbols = tuple(dict.fromkeys(s for t in tables for s in t.symbols))
+        if not tables:
+            return cls.empty()
+        pos = {s: k for k, s in enumerate(symbols)}
+        remapped = [
+            np.array([pos[s] for s in t.symbols], dtype=np.int32)[t.symbol_id]
+            if len(t)
+            else t.symbol_id.astype(np.int32)
+            for t in tables
+        ]
+        return cls(
+            symbols=symbols,
+            symbol_id=np.concatenate(remapped),
+            side=np.concatenate([t.side for t in tables]),
+            entry_ts=np.concatenate([t.entry_ts for t in tables]),
+            entry_px=np.concatenate([t.entry_px for t in tables]),
+            exit_ts=np.concatenate([t.exit_ts for t in tables]),
+            exit_px=np.concatenate([t.exit_px for t in tables]),
+            reasons=np.concatenate([t.reasons for t in tables]),
+        )
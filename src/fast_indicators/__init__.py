@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from importlib import import_module
 from typing import Any
 
 import numpy as np
+import pandas as pd
 
 
 def _try_import_cpp() -> Any | None:
@@ -15,13 +17,36 @@ def _try_import_cpp() -> Any | None:
 
 _cpp = _try_import_cpp()
 
+# Rows of core_features' output, as build_features names them (feature__<name>).
+CORE_FEATURES = (
+    "ret_1",
+    "vol_20",
+    "sma_20",
+    "ema_20",
+    "rsi_14",
+    "atr_14",
+    "vwap_20",
+    "vwap_dist_20",
+)
+
+
+# Block length cap for the NumPy EMA, and the smallest decay factor
+# (1 - alpha)**block allowed within one block; see _ema_blocked.
+_EMA_MAX_BLOCK = 4096
+_EMA_MIN_BLOCK_DECAY = 1e-100
+
+# Documented agreement of the NumPy fallback with the C++ recursion:
+# |fallback - cpp| <= EMA_FALLBACK_RTOL * max|x| (checked on 1M-element walks).
+EMA_FALLBACK_RTOL = 1e-12
+
 
 def ema(x: np.ndarray, span: int) -> np.ndarray:
     """
     EMA wrapper.
 
     Tries the C++ extension first (fast_indicators.ema).
-    Falls back to a small pure-Python/Numpy implementation if unavailable.
+    Falls back to a vectorized NumPy implementation (_ema_blocked) if
+    unavailable; it agrees with the C++ recursion to EMA_FALLBACK_RTOL.
     """
     x_arr = np.asarray(x, dtype=np.float64)
 
@@ -36,9 +61,354 @@ def ema(x: np.ndarray, span: int) -> np.ndarray:
     if x_arr.size == 0:
         return x_arr.copy()
 
-    alpha = 2.0 / (float(span) + 1.0)
-    out = np.empty_like(x_arr)
-    out[0] = x_arr[0]
-    for i in range(1, x_arr.size):
-        out[i] = alpha * x_arr[i] + (1.0 - alpha) * out[i - 1]
+    return _ema_blocked(x_arr, 2.0 / (float(span) + 1.0))
+
+
+def _ema_blocked(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    y[0] = x[0], y[i] = alpha*x[i] + (1-alpha)*y[i-1], as a blocked linear filter.
+
+    With d = 1 - alpha, inside a block starting after y_prev:
+        y[j] = d**(j+1) * y_prev + alpha * d**j * cumsum(x[m] / d**m)[j]
+    so every block is a cumsum over a (blocks, B) matrix. Only the block
+    boundaries are carried sequentially (n / B scalar steps). B keeps d**B above
+    _EMA_MIN_BLOCK_DECAY, so the rescaled terms never overflow, and restarting
+    the scale at every block keeps the rounding error of one output to a few
+    ulps of max|x| / alpha terms, not growing with n.
+    """
+    n = x.shape[0]
+    d = 1.0 - alpha
+    if d <= 0.0:
+        return x.copy()
+
+    block = int(min(_EMA_MAX_BLOCK, max(1, np.log(_EMA_MIN_BLOCK_DECAY) // np.log(d))))
+    n_blocks = -(-n // block)
+
+    xb = np.zeros(n_blocks * block)
+    xb[:n] = x
+    xb = xb.reshape(n_blocks, block)
+
+    j = np.arange(block, dtype=np.float64)
+    decay = d**j  # d**j
+    z = np.cumsum(xb / decay, axis=1)
+    z *= alpha * decay  # block response from a zero start
+
+    # carry[b] = y just before block b; y[-1] := x[0] gives y[0] = x[0]
+    carry = np.empty(n_blocks)
+    prev = x[0]
+    d_block = d**block
+    last = z[:, -1]
+    for b in range(n_blocks):
+        carry[b] = prev
+        prev = last[b] + d_block * prev
+
+    z += carry[:, None] * (decay * d)
+    out = z.reshape(-1)[:n]
+    out[0] = x[0]
+    return out
+
+
+def ema_batch(x: np.ndarray, spans: list[int], threads: int | None = None) -> np.ndarray:
+    """
+    EMA of every row of a 2D (symbols x bars) array for every span.
+
+    Returns a (symbols, len(spans), bars) array with out[r, k] == ema(x[r], spans[k]).
+    The C++ path computes all series in one call, spread over `threads` threads
+    (None: one per core) with the GIL released; the fallback runs the NumPy
+    ema fallback on each (row, span).
+    """
+    x_arr = np.ascontiguousarray(x, dtype=np.float64)
+    spans = [int(s) for s in spans]
+    if x_arr.ndim != 2:
+        raise ValueError("x must be a 2D array (rows x bars)")
+    if any(s <= 0 for s in spans):
+        raise ValueError("span must be > 0")
+    if threads is not None and threads < 1:
+        raise ValueError("threads must be >= 1")
+
+    fn = _native("ema_batch")
+    if fn is not None:
+        return fn(x_arr, spans, 0 if threads is None else int(threads))
+
+    rows, n = x_arr.shape
+    out = np.empty((rows, len(spans), n))
+    if n == 0:
+        return out
+    for k, span in enumerate(spans):
+        alpha = 2.0 / (float(span) + 1.0)
+        for r in range(rows):
+            out[r, k] = _ema_blocked(x_arr[r], alpha)
+    return out
+
+
+# Output positions per fallback block in window_sums / window_std (keeps the
+# per-level temporaries in cache).
+_WINDOW_BLOCK = 1 << 14
+
+
+def _window_blocks(window: int) -> list[tuple[int, int]]:
+    """
+    (offset, level) of the power-of-two blocks a window is split into,
+    largest first: window 20 is [(0, 4), (16, 2)], i.e. 16 bars then 4.
+    """
+    blocks = []
+    offset = 0
+    for level in range(window.bit_length() - 1, -1, -1):
+        if window >> level & 1:
+            blocks.append((offset, level))
+            offset += 1 << level
+    return blocks
+
+
+def window_sums(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of each full window, from power-of-two block sums.
+
+    A block of 2**k bars is the sum of its two halves; a window adds its
+    blocks (_window_blocks) left to right. Blocks are shared by overlapping
+    windows, so the cost is O(n log window), and every value depends on its
+    own window alone: recomputing from any earlier start gives the same bits,
+    which build_features_incremental relies on. pandas' O(n) running add/remove
+    sums do not have that property, so they are deliberately not used here.
+    A NaN anywhere in a window gives NaN, which matches min_periods=window.
+    """
+    return _windowed(x, window, _sum_levels, np.add, np.asarray)
+
+
+def window_std(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sample std (ddof=1) of each full window, window-local like window_sums.
+
+    Blocks carry (count, mean, M2) and are merged with Chan et al.'s pairwise
+    update, so no raw sum of squares is formed and nothing cancels, however
+    long the history or large the mean.
+    """
+
+    def finish(stat: tuple[float, np.ndarray, np.ndarray]) -> np.ndarray:
+        return np.sqrt(stat[2] / (window - 1))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _windowed(x, window, _moment_levels, _merge_moments, finish)
+
+
+def _windowed(
+    x: np.ndarray,
+    window: int,
+    levels: Callable[[np.ndarray, int], list[Any]],
+    merge: Callable[[Any, Any], Any],
+    finish: Callable[[Any], np.ndarray],
+) -> np.ndarray:
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    blocks = _window_blocks(window)
+    for lo in range(0, n - window + 1, _WINDOW_BLOCK):
+        m = min(_WINDOW_BLOCK, n - window + 1 - lo)
+        stats = levels(x[lo : lo + m + window - 1], blocks[0][1])
+        acc = _take(stats[blocks[0][1]], 0, m)
+        for offset, level in blocks[1:]:
+            acc = merge(acc, _take(stats[level], offset, m))
+        out[lo + window - 1 : lo + window - 1 + m] = finish(acc)
+    return out
+
+
+def _take(stat: Any, offset: int, m: int) -> Any:
+    if isinstance(stat, tuple):
+        return (stat[0], stat[1][offset : offset + m], stat[2][offset : offset + m])
+    return stat[offset : offset + m]
+
+
+def _sum_levels(x: np.ndarray, top: int) -> list[np.ndarray]:
+    # levels[k][p] = sum of x[p : p + 2**k]
+    levels = [x]
+    for k in range(top):
+        h = 1 << k
+        levels.append(levels[k][:-h] + levels[k][h:])
+    return levels
+
+
+def _moment_levels(x: np.ndarray, top: int) -> list[tuple[float, np.ndarray, np.ndarray]]:
+    # levels[k][p] = (count, mean, M2) of x[p : p + 2**k]
+    levels = [(1.0, x, np.zeros_like(x))]
+    for k in range(top):
+        h = 1 << k
+        count, mean, m2 = levels[k]
+        levels.append(_merge_moments((count, mean[:-h], m2[:-h]), (count, mean[h:], m2[h:])))
+    return levels
+
+
+def _merge_moments(
+    a: tuple[float, np.ndarray, np.ndarray], b: tuple[float, np.ndarray, np.ndarray]
+) -> tuple[float, np.ndarray, np.ndarray]:
+    # Same operation order as the kernel's WindowMoments::merge.
+    na, mean_a, m2a = a
+    nb, mean_b, m2b = b
+    n = na + nb
+    d = mean_b - mean_a
+    mean = d * (nb / n)
+    mean += mean_a
+    m2 = m2a + m2b
+    d *= d
+    d *= na * nb / n
+    m2 += d
+    return n, mean, m2
+
+
+def _native(name: str) -> Any | None:
+    return getattr(_cpp, name, None) if _cpp is not None else None
+
+
+def _f64(x: np.ndarray) -> np.ndarray:
+    arr = np.ascontiguousarray(x, dtype=np.float64)
+    if arr.ndim != 1:
+        raise ValueError("inputs must be 1D arrays")
+    return arr
+
+
+def _check_window(window: int) -> int:
+    if int(window) <= 0:
+        raise ValueError("window must be > 0")
+    return int(window)
+
+
+def _ewm_adjust_false(x: np.ndarray, min_periods: int, **kwargs: float) -> np.ndarray:
+    return pd.Series(x).ewm(adjust=False, min_periods=min_periods, **kwargs).mean().to_numpy()
+
+
+def sma(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean over full windows (NaN before the first one)."""
+    x, window = _f64(x), _check_window(window)
+    fn = _native("sma")
+    if fn is not None:
+        return fn(x, window)
+    return window_sums(x, window) / window
+
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling sample std (ddof=1) over full windows.
+
+    Window-local (see window_std) rather than pandas' running add/remove
+    update: O(n log window) instead of O(n), in exchange for values that do
+    not depend on where the history starts and are about as accurate as a
+    two-pass std (pandas' running sums drift by up to ~1e-7 relative on a
+    price-like random walk). scripts/bench_rolling.py times it against pandas.
+    """
+    x, window = _f64(x), _check_window(window)
+    fn = _native("rolling_std")
+    if fn is not None:
+        return fn(x, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return window_std(x, window)
+
+
+def rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Wilder RSI: ewm(alpha=1/window, adjust=False, min_periods=window) of gains/losses."""
+    close, window = _f64(close), _check_window(window)
+    fn = _native("rsi")
+    if fn is not None:
+        return fn(close, window)
+    delta = np.concatenate([[np.nan], close[1:] - close[:-1]])
+    gain = np.where(delta < 0.0, 0.0, delta)
+    loss = np.where(-delta < 0.0, 0.0, -delta)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = _ewm_adjust_false(gain, window, alpha=1.0 / window) / _ewm_adjust_false(
+            loss, window, alpha=1.0 / window
+        )
+        return 100.0 - (100.0 / (1.0 + rs))
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """max(|h-l|, |h-prev close|, |l-prev close|), NaN parts skipped."""
+    high, low, close = _f64(high), _f64(low), _f64(close)
+    fn = _native("true_range")
+    if fn is not None:
+        return fn(high, low, close)
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    parts = np.stack([np.abs(high - low), np.abs(high - prev_close), np.abs(low - prev_close)])
+    tr = np.fmax(np.fmax(parts[0], parts[1]), parts[2])
+    return np.where(np.isnan(parts).all(axis=0), np.nan, tr)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int = 14) -> np.ndarray:
+    """Wilder ATR: ewm(alpha=1/window, adjust=False, min_periods=window) of true_range."""
+    high, low, close, window = _f64(high), _f64(low), _f64(close), _check_window(window)
+    fn = _native("atr")
+    if fn is not None:
+        return fn(high, low, close, window)
+    return _ewm_adjust_false(true_range(high, low, close), window, alpha=1.0 / window)
+
+
+def rolling_vwap(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    window: int = 20,
+) -> np.ndarray:
+    """Rolling sum of typical price x volume over rolling volume, full windows."""
+    high, low, close, volume = _f64(high), _f64(low), _f64(close), _f64(volume)
+    window = _check_window(window)
+    fn = _native("rolling_vwap")
+    if fn is not None:
+        return fn(high, low, close, volume, window)
+    pv = (high + low + close) / 3.0 * volume
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return window_sums(pv, window) / window_sums(volume, window)
+
+
+def _core_features_numpy(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    log_close: np.ndarray,
+    volume: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    # Same arithmetic as the kernel, one column at a time.
+    out[0, :1] = np.nan
+    np.subtract(log_close[1:], log_close[:-1], out=out[0, 1:])
+    out[1] = window_std(out[0], 20)
+    out[2] = window_sums(close, 20) / 20
+    out[3] = _ewm_adjust_false(close, 20, span=20)
+    out[4] = rsi(close, 14)
+    out[5] = atr(high, low, close, 14)
+    out[6] = rolling_vwap(high, low, close, volume, 20)
+    out[7] = (close - out[6]) / close
+
+
+def core_features(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Every build_features column (rows in CORE_FEATURES order) in one call.
+
+    With the C++ extension this is a single fused pass over the bars, writing
+    straight into `out` (a C-contiguous (8, n) float64 buffer, allocated when
+    None); otherwise a NumPy fallback fills the same buffer. Both give the
+    same bits as build_features' per-indicator pandas path, warm-up NaNs
+    included.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    n = close.shape[0]
+    cols = [np.ascontiguousarray(a, dtype=np.float64) for a in (high, low, volume)]
+    if any(a.shape != (n,) for a in cols) or close.ndim != 1:
+        raise ValueError("high, low, close and volume must be 1D arrays of equal length")
+    high, low, volume = cols
+
+    if out is None:
+        out = np.empty((len(CORE_FEATURES), n))
+    elif out.shape != (len(CORE_FEATURES), n) or out.dtype != np.float64:
+        raise ValueError(f"out must be a float64 array of shape ({len(CORE_FEATURES)}, {n})")
+    if n == 0:
+        return out
+
+    log_close = np.log(close)
+    if _cpp is not None and hasattr(_cpp, "core_features") and out.flags.c_contiguous:
+        _cpp.core_features(high, low, close, log_close, volume, out)
+    else:
+        _core_features_numpy(high, low, close, log_close, volume, out)
     return out
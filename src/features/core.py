@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
 import numpy as np
 import pandas as pd
 
+from src import fast_indicators as fi
+
 
 def _require_cols(df: pd.DataFrame, cols: list[str]) -> None:
     missing = [c for c in cols if c not in df.columns]
@@ -32,9 +37,13 @@ def log_return(close: pd.Series) -> pd.Series:
     return np.log(close).diff()
 
 
+def _f64(x: pd.Series) -> np.ndarray:
+    return x.to_numpy(dtype=np.float64)
+
+
 def sma(x: pd.Series, window: int) -> pd.Series:
     # rolling mean
-    return x.rolling(window=window, min_periods=window).mean()
+    return pd.Series(fi.sma(_f64(x), window), index=x.index, name=x.name)
 
 
 def ema(x: pd.Series, span: int) -> pd.Series:
@@ -43,44 +52,30 @@ def ema(x: pd.Series, span: int) -> pd.Series:
 
 
 def rolling_vol(x: pd.Series, window: int) -> pd.Series:
-    # rolling std
-    return x.rolling(window=window, min_periods=window).std()
+    # rolling std (ddof=1), window-local
+    return pd.Series(fi.rolling_std(_f64(x), window), index=x.index, name=x.name)
 
 
 def rsi(close: pd.Series, window: int = 14) -> pd.Series:
     """
     Wilder RSI (causal).
+    Gains/losses of close.diff(), smoothed with ewm(alpha=1/window, adjust=False,
+    min_periods=window); computed by src.fast_indicators (C++ when built).
     """
-    delta = close.diff()
-    gain = delta.clip(lower=0.0)
-    loss = (-delta).clip(lower=0.0)
-
-    # Wilder smoothing (EMA with alpha=1/window)
-    avg_gain = gain.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
-    avg_loss = loss.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
-
-    rs = avg_gain / avg_loss
-    out = 100.0 - (100.0 / (1.0 + rs))
-
-    return out
+    return pd.Series(fi.rsi(_f64(close), window), index=close.index, name=close.name)
 
 
 def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
-    # TR parts
-    prev_close = close.shift(1)
-    tr1 = (high - low).abs()
-    tr2 = (high - prev_close).abs()
-    tr3 = (low - prev_close).abs()
-
-    return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    # max of |h-l|, |h-prev close|, |l-prev close| (NaN parts skipped)
+    return pd.Series(fi.true_range(_f64(high), _f64(low), _f64(close)), index=close.index)
 
 
 def atr(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
     """
     Wilder ATR (causal).
+    ewm(alpha=1/window, adjust=False, min_periods=window) of the true range.
     """
-    tr = true_range(high, low, close)
-    return tr.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
+    return pd.Series(fi.atr(_f64(high), _f64(low), _f64(close), window), index=close.index)
 
 
 def rolling_vwap(df: pd.DataFrame, window: int = 20) -> pd.Series:
@@ -88,11 +83,10 @@ def rolling_vwap(df: pd.DataFrame, window: int = 20) -> pd.Series:
     Approx VWAP from OHLCV bars using typical price * volume rolling sums.
     """
     _require_cols(df, ["high", "low", "close", "volume"])
-    tp = (df["high"] + df["low"] + df["close"]) / 3.0
-    pv = tp * df["volume"]
-    pv_sum = pv.rolling(window=window, min_periods=window).sum()
-    v_sum = df["volume"].rolling(window=window, min_periods=window).sum()
-    return pv_sum / v_sum
+    vwap = fi.rolling_vwap(
+        _f64(df["high"]), _f64(df["low"]), _f64(df["close"]), _f64(df["volume"]), window
+    )
+    return pd.Series(vwap, index=df.index)
 
 
 def build_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -102,16 +96,171 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     x = prepare_ohlcv(df)
 
-    x["feature__ret_1"] = log_return(x["close"])
-    x["feature__vol_20"] = rolling_vol(x["feature__ret_1"], 20)
+    cols = fi.core_features(
+        x["high"].to_numpy(dtype=np.float64),
+        x["low"].to_numpy(dtype=np.float64),
+        x["close"].to_numpy(dtype=np.float64),
+        x["volume"].to_numpy(dtype=np.float64),
+    )
+    for name, col in zip(fi.CORE_FEATURES, cols, strict=True):
+        x[f"feature__{name}"] = col
+
+    return x
+
 
-    x["feature__sma_20"] = sma(x["close"], 20)
-    x["feature__ema_20"] = ema(x["close"], 20)
+# Bars before the first new one that build_features_incremental needs:
+# vol_20 is the std of 20 returns, i.e. of 21 closes.
+FEATURE_CONTEXT_BARS = 20
 
-    x["feature__rsi_14"] = rsi(x["close"], 14)
-    x["feature__atr_14"] = atr(x["high"], x["low"], x["close"], 14)
+_OHLCV_COLS = ["ts", "open", "high", "low", "close", "volume"]
+
+
+@dataclass
+class EwmState:
+    """
+    Where a pandas ewm(adjust=False) recursion stands after a prefix: the
+    smoothed value at the last non-NaN input, the NaN inputs seen since
+    (they decay its weight) and the count of non-NaN inputs.
+    """
 
-    x["feature__vwap_20"] = rolling_vwap(x, 20)
+    weighted: float = float("nan")
+    pending_nan: int = 0
+    nobs: int = 0
+
+
+def ewm_resume(
+    x: np.ndarray,
+    state: EwmState,
+    min_periods: int,
+    **ewm_kwargs: float,
+) -> tuple[np.ndarray, EwmState]:
+    """
+    Continue x.ewm(adjust=False, min_periods=min_periods, **ewm_kwargs).mean()
+    from `state`, returning the output for x and the state after it.
+
+    The recursion is replayed by pandas itself, seeded with the saved value and
+    pending NaNs, so the output has the same bits as one pass over the whole
+    series.
+    """
+    k = state.pending_nan
+    seed = np.concatenate([[state.weighted], np.full(k, np.nan), x])
+    out = pd.Series(seed).ewm(adjust=False, min_periods=0, **ewm_kwargs).mean().to_numpy()
+    out = out[1 + k :]
+
+    is_obs = ~np.isnan(x)
+    nobs = state.nobs + np.cumsum(is_obs)
+    obs = np.flatnonzero(is_obs)
+    if obs.size:
+        new_state = EwmState(
+            weighted=float(out[obs[-1]]),
+            pending_nan=int(x.shape[0] - 1 - obs[-1]),
+            nobs=int(nobs[-1]),
+        )
+    elif np.isnan(state.weighted):
+        new_state = state
+    else:
+        new_state = EwmState(state.weighted, k + int(x.shape[0]), state.nobs)
+
+    return np.where(nobs >= min_periods, out, np.nan), new_state
+
+
+@dataclass
+class FeatureState:
+    """
+    Everything build_features_incremental carries between calls: the last
+    FEATURE_CONTEXT_BARS prepared bars (the newest one is the watermark) and
+    the EMA / Wilder recursions.
+    """
+
+    tail: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=_OHLCV_COLS))
+    ema_20: EwmState = field(default_factory=EwmState)
+    rsi_gain_14: EwmState = field(default_factory=EwmState)
+    rsi_loss_14: EwmState = field(default_factory=EwmState)
+    atr_14: EwmState = field(default_factory=EwmState)
+
+    @property
+    def watermark(self) -> pd.Timestamp | None:
+        return None if self.tail.empty else self.tail["ts"].iloc[-1]
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-safe (floats round-trip exactly through json)."""
+        tail = {c: self.tail[c].tolist() for c in _OHLCV_COLS if c != "ts"}
+        tail["ts"] = [ts.isoformat() for ts in self.tail["ts"]]
+        return {
+            "tail": tail,
+            **{name: asdict(getattr(self, name)) for name in _EWM_STATES},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FeatureState:
+        tail = pd.DataFrame(data["tail"], columns=_OHLCV_COLS)
+        tail["ts"] = pd.to_datetime(tail["ts"], utc=True)
+        return cls(
+            tail=tail.astype({c: np.float64 for c in _OHLCV_COLS if c != "ts"}),
+            **{name: EwmState(**data[name]) for name in _EWM_STATES},
+        )
+
+
+_EWM_STATES = ("ema_20", "rsi_gain_14", "rsi_loss_14", "atr_14")
+
+
+def build_features_incremental(
+    df: pd.DataFrame,
+    state: FeatureState | None = None,
+) -> tuple[pd.DataFrame, FeatureState]:
+    """
+    build_features for only the bars of df after state.watermark.
+
+    Rows at or before the watermark are dropped; the stored tail supplies the
+    rolling windows and previous close, and the EMA/RSI/ATR recursions resume
+    from their saved state. Feeding a history in consecutive chunks gives
+    exactly the feature values of one build_features call over all of it.
+
+    Returns (new rows with feature__ columns, state to pass next time).
+    """
+    if state is None:
+        state = FeatureState()
+
+    x = prepare_ohlcv(df)
+    if state.watermark is not None:
+        x = x[x["ts"] > state.watermark].reset_index(drop=True)
+
+    n_ctx = len(state.tail)
+    ctx = pd.concat([state.tail, x[_OHLCV_COLS]], ignore_index=True) if n_ctx else x[_OHLCV_COLS]
+
+    def _new(s: pd.Series) -> np.ndarray:
+        return s.to_numpy(dtype=np.float64)[n_ctx:]
+
+    ret = log_return(ctx["close"])
+    x["feature__ret_1"] = _new(ret)
+    x["feature__vol_20"] = _new(rolling_vol(ret, 20))
+
+    x["feature__sma_20"] = _new(sma(ctx["close"], 20))
+    ema_20, ema_state = ewm_resume(_new(ctx["close"]), state.ema_20, 20, span=20)
+    x["feature__ema_20"] = ema_20
+
+    delta = ctx["close"].diff()
+    avg_gain, gain_state = ewm_resume(
+        _new(delta.clip(lower=0.0)), state.rsi_gain_14, 14, alpha=1.0 / 14
+    )
+    avg_loss, loss_state = ewm_resume(
+        _new((-delta).clip(lower=0.0)), state.rsi_loss_14, 14, alpha=1.0 / 14
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x["feature__rsi_14"] = 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+    tr = true_range(ctx["high"], ctx["low"], ctx["close"])
+    atr_14, atr_state = ewm_resume(_new(tr), state.atr_14, 14, alpha=1.0 / 14)
+    x["feature__atr_14"] = atr_14
+
+    x["feature__vwap_20"] = _new(rolling_vwap(ctx, 20))
     x["feature__vwap_dist_20"] = (x["close"] - x["feature__vwap_20"]) / x["close"]
 
-    return x
+    new_state = FeatureState(
+        tail=ctx.iloc[-FEATURE_CONTEXT_BARS:].reset_index(drop=True),
+        ema_20=ema_state,
+        rsi_gain_14=gain_state,
+        rsi_loss_14=loss_state,
+        atr_14=atr_state,
+    )
+    return x, new_state
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from src.strategies.v1.spec import EntrySignal, ReasonCode, Side
 
 
@@ -55,3 +57,36 @@ def build_entry_signal(
         limit_px=limit_px,
         reasons=reasons,
     )
+
+
+def entry_candidates(
+    close: np.ndarray,
+    vwap: np.ndarray,
+    ema50_1h: np.ndarray,
+    ema200_1h: np.ndarray,
+    vol_ratio: np.ndarray | None = None,
+    params: EntryRuleParams | None = None,
+) -> np.ndarray:
+    """
+    Vectorized entry check over whole columns.
+
+    Returns the (sorted, int64) bar indices i >= 1 where a FLAT engine would
+    place an order: trend ok on bar i, close crosses above vwap between i-1
+    and i, and vol_ratio[i] is not below min_vol_ratio (same NaN behaviour as
+    build_entry_signal: a NaN ratio does not block the entry).
+    """
+    params = params or EntryRuleParams()
+
+    close = np.asarray(close, dtype=np.float64)
+    vwap = np.asarray(vwap, dtype=np.float64)
+
+    ok = np.zeros(close.shape[0], dtype=bool)
+    ok[1:] = (close[:-1] <= vwap[:-1]) & (close[1:] > vwap[1:])
+    ok &= np.asarray(ema50_1h, dtype=np.float64) > np.asarray(ema200_1h, dtype=np.float64)
+
+    if params.min_vol_ratio is not None:
+        if vol_ratio is None:
+            return np.empty(0, dtype=np.int64)
+        ok &= ~(np.asarray(vol_ratio, dtype=np.float64) < float(params.min_vol_ratio))
+
+    return np.flatnonzero(ok).astype(np.int64, copy=False)
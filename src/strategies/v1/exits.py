@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 from src.strategies.v1.spec import ReasonCode
 
 
@@ -54,3 +56,103 @@ def check_long_exit(
         return float(brackets.tp_px), ReasonCode.TAKE_PROFIT
 
     return None, None
+
+
+class LongExitIndex:
+    """
+    Range-query index over a frame's low/high columns for first-passage exits.
+
+    Two segment trees (running min of low, running max of high) answer
+    "first bar j >= start where low[j] <= stop or high[j] >= tp" in O(log n).
+    Brackets do not enter the index, so one instance can be shared by every
+    atr_stop_mult / take_profit_r combination run over the same bars.
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray) -> None:
+        low = np.asarray(low, dtype=np.float64)
+        high = np.asarray(high, dtype=np.float64)
+        if low.shape != high.shape or low.ndim != 1:
+            raise ValueError("low and high must be 1D arrays of the same length")
+
+        n = int(low.shape[0])
+        size = 1
+        while size < n:
+            size <<= 1
+
+        # Padding leaves can never be touched. fmin/fmax skip NaN bars, which
+        # also never touch a bracket (NaN comparisons are False).
+        min_low = np.full(2 * size, np.inf)
+        max_high = np.full(2 * size, -np.inf)
+        min_low[size : size + n] = low
+        max_high[size : size + n] = high
+
+        width = size
+        while width > 1:
+            half = width // 2
+            min_low[half:width] = np.fmin(
+                min_low[width : 2 * width : 2], min_low[width + 1 : 2 * width : 2]
+            )
+            max_high[half:width] = np.fmax(
+                max_high[width : 2 * width : 2], max_high[width + 1 : 2 * width : 2]
+            )
+            width = half
+
+        self._n = n
+        self._size = size
+        self._min_low = min_low
+        self._max_high = max_high
+
+    def __len__(self) -> int:
+        return self._n
+
+    def first_touch(self, start: int, stop_px: float, tp_px: float) -> int:
+        """
+        First bar index j >= start with low[j] <= stop_px or high[j] >= tp_px.
+        Returns len(self) if no later bar touches either bracket.
+        """
+        n = self._n
+        if start >= n:
+            return n
+
+        size = self._size
+        min_low = self._min_low
+        max_high = self._max_high
+        stop = float(stop_px)
+        tp = float(tp_px)
+
+        node = int(start) + size
+        while True:
+            while node % 2 == 0:
+                node >>= 1
+            if min_low[node] <= stop or max_high[node] >= tp:
+                # Descend to the left-most touching leaf of this subtree.
+                while node < size:
+                    node <<= 1
+                    if not (min_low[node] <= stop or max_high[node] >= tp):
+                        node += 1
+                return node - size
+            node += 1
+            if node & -node == node:
+                return n
+
+    def first_exit(
+        self,
+        start: int,
+        end: int,
+        brackets: Brackets,
+    ) -> tuple[int, float | None, ReasonCode | None]:
+        """
+        Resolve a long bracket exit over bars [start, end).
+
+        Returns (bar_index, exit_px, reason) for the first touching bar, or
+        (end, None, None) if neither bracket is hit. Same conservative rule as
+        check_long_exit: if a bar touches both, the STOP wins.
+        """
+        j = self.first_touch(start, brackets.stop_px, brackets.tp_px)
+        if j >= end:
+            return end, None, None
+
+        leaf = self._min_low[self._size + j]
+        if leaf <= float(brackets.stop_px):
+            return j, float(brackets.stop_px), ReasonCode.STOP
+        return j, float(brackets.tp_px), ReasonCode.TAKE_PROFIT
@@ -24,6 +24,25 @@ class ReasonCode(StrEnum):
     TIME_STOP = "TIME_STOP"
 
 
+# One bit per ReasonCode, in declaration order (also used by the C++ kernel).
+REASON_BITS: dict[ReasonCode, int] = {r: 1 << k for k, r in enumerate(ReasonCode)}
+
+
+def reasons_to_mask(reasons: list[ReasonCode]) -> int:
+    mask = 0
+    for r in reasons:
+        mask |= REASON_BITS[r]
+    return mask
+
+
+def mask_to_reasons(mask: int) -> list[ReasonCode]:
+    """
+    Decode a reason bitmask. Codes come back in declaration order, which is
+    also the order the engine appends them to a trade.
+    """
+    return [r for r, bit in REASON_BITS.items() if mask & bit]
+
+
 @dataclass(frozen=True)
 class StrategyParams:
     limit_expiry_bars: int = 4
@@ -1,6 +1,44 @@
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+import pytest
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
+
+
+def _make_v1_frame(n: int, seed: int = 0, with_vol_ratio: bool = True) -> pd.DataFrame:
+    """
+    Synthetic bars with the v1 engine columns: a random-walk close oscillating
+    around a lagging vwap (many crosses), alternating trend regimes and a
+    strictly positive ATR.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 0.1, n))
+    vwap = pd.Series(close).ewm(span=8, adjust=False).mean().to_numpy()
+    spread = rng.uniform(0.01, 0.25, n)
+    regime = (np.arange(n) // 500) % 3 != 2
+
+    df = pd.DataFrame(
+        {
+            "ts": np.arange(n, dtype=np.int64) * 60,
+            "high": close + spread * rng.uniform(0.2, 1.0, n),
+            "low": close - spread * rng.uniform(0.2, 1.0, n),
+            "close": close,
+            "vwap": vwap,
+            "atr": rng.uniform(0.05, 0.4, n),
+            "ema50_1h": np.where(regime, 101.0, 99.0),
+            "ema200_1h": 100.0,
+        }
+    )
+    if with_vol_ratio:
+        df["vol_ratio"] = rng.lognormal(0.0, 0.4, n)
+    return df
+
+
+@pytest.fixture
+def make_v1_frame():
+    return _make_v1_frame
@@ -0,0 +1,65 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from src.backtest.arrays import BarArrays
+from src.backtest.batch import ParamMatrix, run_backtest_v1_batch
+from src.backtest.engine import run_backtest_v1_bars
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+
+def _v1_yaml_grid() -> list[StrategyParams]:
+    # Same 36 combinations as configs/v1.yaml, plus edge expiry/time-stop values.
+    grid = [
+        StrategyParams(
+            limit_expiry_bars=leb,
+            atr_stop_mult=atrm,
+            take_profit_r=tpr,
+            time_stop_bars=tsb,
+        )
+        for leb, atrm, tpr, tsb in itertools.product(
+            [3, 4, 5], [1.0, 1.5, 2.0], [1.0, 2.0], [None, 24]
+        )
+    ]
+    grid.append(StrategyParams(limit_expiry_bars=0, time_stop_bars=0))
+    grid.append(StrategyParams(limit_expiry_bars=1, time_stop_bars=1))
+    grid.append(StrategyParams(limit_expiry_bars=2, time_stop_bars=-1))
+    return grid
+
+
+@pytest.mark.parametrize("entry", [EntryRuleParams(), EntryRuleParams(min_vol_ratio=1.0)])
+def test_batch_kernel_matches_per_param_engine(make_v1_frame, entry):
+    df = make_v1_frame(6_000, seed=21)
+    df.loc[300:305, "vwap"] = np.nan
+    df.loc[900:910, "atr"] = np.nan
+    bars = BarArrays.from_frame(df)
+    grid = _v1_yaml_grid()
+
+    got = run_backtest_v1_batch(bars, symbol="SYN", params=grid, entry_params=entry)
+
+    assert got.n_sets == len(grid)
+    for params, trades in zip(grid, got.to_trade_lists(), strict=True):
+        expected = run_backtest_v1_bars(bars, symbol="SYN", params=params, entry_params=entry)
+        assert trades == expected
+
+
+def test_batch_kernel_accepts_param_matrix_and_empty_bars(make_v1_frame):
+    grid = _v1_yaml_grid()[:4]
+    pm = ParamMatrix.from_params(grid)
+    assert len(pm) == 4
+    assert pm.time_stop_bars.tolist() == [0, 24, 0, 24]
+    assert pm.has_time_stop.tolist() == [False, True, False, True]
+
+    empty = BarArrays.from_frame(make_v1_frame(0))
+    out = run_backtest_v1_batch(empty, symbol="SYN", params=pm)
+    assert len(out) == 0
+    assert out.to_trade_lists() == [[], [], [], []]
+
+
+def test_batch_kernel_rejects_non_positive_atr_on_fill(make_v1_frame):
+    df = make_v1_frame(2_000, seed=2)
+    df["atr"] = 0.0
+    with pytest.raises(ValueError, match="ATR"):
+        run_backtest_v1_batch(BarArrays.from_frame(df), symbol="SYN", params=_v1_yaml_grid())
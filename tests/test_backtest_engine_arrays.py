@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.engine import run_backtest_v1, run_backtest_v1_arrays
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+PARAM_SETS = [
+    (StrategyParams(), EntryRuleParams(min_vol_ratio=None)),
+    (
+        StrategyParams(limit_expiry_bars=1, atr_stop_mult=1.5, take_profit_r=1.0),
+        EntryRuleParams(min_vol_ratio=1.0),
+    ),
+    (
+        StrategyParams(limit_expiry_bars=0, atr_stop_mult=2.0, time_stop_bars=5),
+        EntryRuleParams(min_vol_ratio=None),
+    ),
+    (
+        StrategyParams(limit_expiry_bars=3, take_profit_r=3.0, time_stop_bars=0),
+        EntryRuleParams(min_vol_ratio=0.8),
+    ),
+]
+
+
+def _tp_frame(exit_high: float = 14.1) -> pd.DataFrame:
+    # Same bars as tests/test_backtest_engine.py (fill at 10.0 on bar 2).
+    base = {"vwap": 10.0, "atr": 2.0, "ema50_1h": 101, "ema200_1h": 100}
+    return pd.DataFrame(
+        [
+            {"ts": 0, "low": 9.8, "high": 10.2, "close": 9.9, **base},
+            {"ts": 60, "low": 9.9, "high": 10.3, "close": 10.2, **base},
+            {"ts": 120, "low": 9.95, "high": 10.05, "close": 10.01, **base},
+            {"ts": 180, "low": 10.0, "high": exit_high, "close": 14.0, **base},
+        ]
+    )
+
+
+@pytest.mark.parametrize("mode", ["bar", "event"])
+@pytest.mark.parametrize("exit_high", [14.1, 12.1])
+@pytest.mark.parametrize("params", [p for p, _ in PARAM_SETS])
+def test_arrays_engine_matches_on_engine_fixture(exit_high, params, mode):
+    df = _tp_frame(exit_high)
+    entry = EntryRuleParams(min_vol_ratio=None)
+
+    expected = run_backtest_v1(df, symbol="TEST", params=params, entry_params=entry)
+    got = run_backtest_v1_arrays(df, symbol="TEST", params=params, entry_params=entry, mode=mode)
+
+    assert got == expected
+
+
+@pytest.mark.parametrize("mode", ["bar", "event"])
+@pytest.mark.parametrize("params,entry", PARAM_SETS)
+def test_arrays_engine_matches_on_synthetic_bars(make_v1_frame, params, entry, mode):
+    df = make_v1_frame(3_000, seed=11)
+    # NaNs must not trip the array path differently from the row path.
+    df.loc[100:104, "vwap"] = np.nan
+    df.loc[200:210, "vol_ratio"] = np.nan
+
+    expected = run_backtest_v1(df, symbol="SYN", params=params, entry_params=entry)
+    got = run_backtest_v1_arrays(df, symbol="SYN", params=params, entry_params=entry, mode=mode)
+
+    assert len(expected) > 10
+    assert got == expected
+
+
+def test_event_mode_matches_on_sparse_signals_and_long_holds(make_v1_frame):
+    # Few candidates and far brackets: most bars are skipped, holds run long.
+    df = make_v1_frame(20_000, seed=5)
+    df["ema50_1h"] = np.where(np.arange(len(df)) % 2_000 < 100, 101.0, 99.0)
+    params = StrategyParams(limit_expiry_bars=6, atr_stop_mult=8.0, take_profit_r=4.0)
+
+    expected = run_backtest_v1_arrays(df, symbol="SYN", params=params, mode="bar")
+    got = run_backtest_v1_arrays(df, symbol="SYN", params=params, mode="event")
+
+    assert len(expected) > 0
+    assert got == expected
+
+
+def test_unknown_engine_mode_raises():
+    with pytest.raises(ValueError, match="mode"):
+        run_backtest_v1_arrays(_tp_frame(), symbol="TEST", params=StrategyParams(), mode="x")
+
+
+def test_arrays_engine_missing_columns_raises():
+    df = _tp_frame().drop(columns=["atr"])
+    with pytest.raises(ValueError, match="atr"):
+        run_backtest_v1_arrays(df, symbol="TEST", params=StrategyParams())
+
+
+@pytest.mark.slow
+def test_arrays_engine_matches_on_1m_bars(make_v1_frame):
+    df = make_v1_frame(1_000_000, seed=3)
+    params = StrategyParams(limit_expiry_bars=3, atr_stop_mult=1.5, time_stop_bars=24)
+    entry = EntryRuleParams(min_vol_ratio=None)
+
+    expected = run_backtest_v1(df, symbol="SYN", params=params, entry_params=entry)
+    assert run_backtest_v1_arrays(df, symbol="SYN", params=params, entry_params=entry) == expected
+    assert (
+        run_backtest_v1_arrays(df, symbol="SYN", params=params, entry_params=entry, mode="event")
+        == expected
+    )
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.backtest import engine
+from src.backtest.arrays import BarArrays
+from src.backtest.engine import run_backtest_v1, run_backtest_v1_bars
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import ReasonCode, StrategyParams, mask_to_reasons, reasons_to_mask
+
+PARAM_SETS = [
+    (StrategyParams(), EntryRuleParams(min_vol_ratio=None)),
+    (StrategyParams(limit_expiry_bars=1, take_profit_r=1.0), EntryRuleParams(min_vol_ratio=1.0)),
+    (StrategyParams(limit_expiry_bars=0, time_stop_bars=5), EntryRuleParams(min_vol_ratio=None)),
+    (StrategyParams(atr_stop_mult=2.5, time_stop_bars=0), EntryRuleParams(min_vol_ratio=0.8)),
+]
+
+
+def _require_native():
+    if not engine.native_engine_available():
+        pytest.skip("_fast_indicators extension with backtest_v1 not built")
+
+
+def test_reason_mask_roundtrip_keeps_engine_order():
+    reasons = [
+        ReasonCode.ENTRY_CROSS,
+        ReasonCode.VOL_CONFIRM,
+        ReasonCode.ORDER_PLACED,
+        ReasonCode.LIMIT_FILLED,
+        ReasonCode.TAKE_PROFIT,
+    ]
+    assert mask_to_reasons(reasons_to_mask(reasons)) == reasons
+
+
+@pytest.mark.parametrize("params,entry", PARAM_SETS)
+def test_native_mode_matches_run_backtest_v1(make_v1_frame, params, entry):
+    # Runs the C++ kernel when built, else checks the Python fallback.
+    df = make_v1_frame(3_000, seed=17)
+    df.loc[40:45, "vwap"] = np.nan
+    df.loc[70:75, "vol_ratio"] = np.nan
+
+    expected = run_backtest_v1(df, symbol="SYN", params=params, entry_params=entry)
+    got = run_backtest_v1_bars(
+        BarArrays.from_frame(df), symbol="SYN", params=params, entry_params=entry, mode="native"
+    )
+
+    assert len(expected) > 10
+    assert got == expected
+
+
+def test_native_kernel_returns_columnar_trades(make_v1_frame):
+    _require_native()
+    bars = BarArrays.from_frame(make_v1_frame(2_000, seed=6))
+
+    cols = engine._cpp.backtest_v1(
+        bars.high,
+        bars.low,
+        bars.close,
+        bars.vwap,
+        bars.atr,
+        bars.ema50_1h,
+        bars.ema200_1h,
+        None,
+        4,
+        1.0,
+        2.0,
+        None,
+        None,
+    )
+
+    assert set(cols) == {"entry_idx", "exit_idx", "entry_px", "exit_px", "reasons"}
+    assert (cols["exit_idx"] > cols["entry_idx"]).all()
+    assert {mask_to_reasons(int(m))[-1] for m in cols["reasons"]} <= {
+        ReasonCode.STOP,
+        ReasonCode.TAKE_PROFIT,
+    }
+
+
+def test_native_kernel_rejects_non_positive_atr(make_v1_frame):
+    _require_native()
+    df = make_v1_frame(500, seed=6)
+    df["atr"] = 0.0
+    with pytest.raises(ValueError, match="ATR"):
+        run_backtest_v1_bars(
+            BarArrays.from_frame(df), symbol="SYN", params=StrategyParams(), mode="native"
+        )
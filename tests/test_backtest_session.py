@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from src.backtest.engine import run_backtest_v1
+from src.backtest.session import BacktestSession
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+
+@pytest.mark.parametrize(
+    ("params", "entry"),
+    [
+        (
+            StrategyParams(limit_expiry_bars=4, time_stop_bars=24),
+            EntryRuleParams(min_vol_ratio=None),
+        ),
+        (
+            StrategyParams(limit_expiry_bars=2, time_stop_bars=None),
+            EntryRuleParams(min_vol_ratio=1.0),
+        ),
+    ],
+)
+def test_session_matches_batch_engine(make_v1_frame, params, entry):
+    frame = make_v1_frame(3_000, seed=5)
+    expected = run_backtest_v1(frame, "SYN", params, entry)
+
+    session = BacktestSession("SYN", params, entry)
+    assert session.on_frame(frame) == expected
+    assert len(expected) > 0
+
+
+def test_session_checkpoint_round_trip(make_v1_frame):
+    frame = make_v1_frame(3_000, seed=11)
+    params = StrategyParams(limit_expiry_bars=4, time_stop_bars=24)
+    entry = EntryRuleParams(min_vol_ratio=1.0)
+    expected = run_backtest_v1(frame, "SYN", params, entry)
+
+    trades = []
+    session = BacktestSession("SYN", params, entry)
+    for start in range(0, len(frame), 257):
+        trades += session.on_frame(frame.iloc[start : start + 257])
+        session = BacktestSession.from_dict(json.loads(json.dumps(session.to_dict())))
+
+    assert trades == expected
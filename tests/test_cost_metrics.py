@@ -1,7 +1,18 @@
-from src.backtest.costs import apply_costs
-from src.backtest.metrics import compute_metrics
-from src.backtest.types import Trade
-from src.strategies.v1.spec import Side, StrategyParams
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.costs import apply_costs, apply_costs_table, pnl_frame
+from src.backtest.metrics import (
+    MetricsAccumulator,
+    compute_metrics,
+    compute_metrics_batch,
+    metric_arrays,
+    metrics_frame_to_dicts,
+    metrics_to_dict,
+)
+from src.backtest.types import Trade, TradeTable
+from src.strategies.v1.spec import ReasonCode, Side, StrategyParams
 
 
 def test_costs_long_basic_direction():
@@ -24,3 +35,134 @@ def test_metrics_basic():
     m = compute_metrics([1.0, -0.5, 2.0, -1.0])
     assert m.trades == 4
     assert 0.0 <= m.win_rate <= 1.0
+
+
+def test_costs_arrays_match_scalar_bit_for_bit():
+    rng = np.random.default_rng(4)
+    exits = [ReasonCode.STOP, ReasonCode.TAKE_PROFIT, ReasonCode.TIME_STOP, ReasonCode.LIMIT_FILLED]
+    trades = [
+        Trade(
+            symbol="X",
+            side=Side.LONG if rng.random() < 0.7 else Side.SHORT,
+            entry_ts=k,
+            entry_px=float(rng.uniform(50, 150)),
+            exit_ts=k + 1,
+            exit_px=float(rng.uniform(50, 150)),
+            reasons=[ReasonCode.ENTRY_CROSS, exits[int(rng.integers(len(exits)))]],
+        )
+        for k in range(500)
+    ]
+    p = StrategyParams(maker_fee_bps=1.7, taker_fee_bps=5.3, slippage_bps=2.9)
+
+    table = TradeTable.from_trades(trades)
+    pnl = apply_costs_table(table, p)
+    expected = pd.DataFrame([apply_costs(t, p).__dict__ for t in trades])
+
+    got = pnl_frame(table, pnl)
+    assert list(got.columns) == list(expected.columns)
+    for col in ("entry_px_eff", "exit_px_eff", "gross_pnl", "slippage_cost", "fee_cost", "net_pnl"):
+        np.testing.assert_array_equal(got[col].to_numpy(), expected[col].to_numpy())
+    assert got["side"].astype(str).tolist() == [str(s) for s in expected["side"]]
+
+
+def _assert_metrics_close(got, expected):
+    assert got.trades == expected.trades
+    for field in ("win_rate", "expectancy", "mdd", "total_net_pnl", "profit_factor"):
+        assert getattr(got, field) == pytest.approx(getattr(expected, field), rel=1e-12, abs=1e-12)
+
+
+def test_metrics_accumulator_matches_compute_metrics():
+    rng = np.random.default_rng(7)
+    pnls = rng.normal(0.05, 1.0, size=2_000).tolist()
+
+    acc = MetricsAccumulator()
+    acc.update_many(pnls)
+    _assert_metrics_close(acc.to_metrics(), compute_metrics(pnls))
+
+    assert MetricsAccumulator().to_metrics() == compute_metrics([])
+    one = MetricsAccumulator()
+    one.update(-2.0)
+    assert one.to_metrics() == compute_metrics([-2.0])
+    wins_only = MetricsAccumulator()
+    wins_only.update_many([1.0, 0.0, 2.0])
+    assert wins_only.to_metrics() == compute_metrics([1.0, 0.0, 2.0])
+
+
+def test_metrics_accumulator_update_many_matches_update_loop():
+    rng = np.random.default_rng(5)
+    pnls = rng.normal(0.0, 1.0, size=1_000)
+    pnls[::7] = 0.0
+
+    looped = MetricsAccumulator()
+    batched = MetricsAccumulator()
+    for lo, hi in ((0, 1), (1, 400), (400, 400), (400, 1_000)):
+        for x in pnls[lo:hi].tolist():
+            looped.update(x)
+        batched.update_many(pnls[lo:hi])
+        assert batched == looped
+
+
+def test_metrics_accumulator_merge_any_split():
+    rng = np.random.default_rng(11)
+    pnls = rng.normal(0.0, 1.0, size=600).tolist()
+    expected = compute_metrics(pnls)
+
+    for cuts in ([0, 600], [0, 1, 600], [0, 300, 301, 600], [0, 50, 200, 450, 600]):
+        parts = []
+        for lo, hi in zip(cuts[:-1], cuts[1:], strict=True):
+            acc = MetricsAccumulator()
+            acc.update_many(pnls[lo:hi])
+            parts.append(acc)
+
+        left = MetricsAccumulator()
+        for p in parts:
+            left = left.merge(p)
+        right = MetricsAccumulator()
+        for p in reversed(parts):
+            right = p.merge(right)
+
+        _assert_metrics_close(left.to_metrics(), expected)
+        _assert_metrics_close(right.to_metrics(), expected)
+
+
+def test_metrics_batch_matches_per_row():
+    rng = np.random.default_rng(3)
+    rows = [rng.normal(0.1, 1.0, size=int(k)).tolist() for k in rng.integers(0, 300, size=40)]
+    rows += [[], [1.0, 2.0], [-1.0], [0.0, 0.0]]
+
+    frame = compute_metrics_batch(rows)
+    expected = [metrics_to_dict(compute_metrics(r)) for r in rows]
+    assert list(frame.columns) == list(pd.DataFrame(expected).columns)
+
+    for got, exp in zip(metrics_frame_to_dicts(frame), expected, strict=True):
+        assert got.keys() == exp.keys()
+        for k, v in exp.items():
+            assert got[k] == v, k
+
+
+def test_metrics_batch_bit_identical_on_ragged_rows():
+    # Pairwise np.sum depends on length: padding must not change the low bits.
+    rng = np.random.default_rng(11)
+    lengths = rng.integers(0, 400, size=300)
+    padded = rng.normal(0.05, 1.0, size=(300, 400))
+    arrays = metric_arrays(padded, lengths)
+
+    for k, n in enumerate(lengths.tolist()):
+        expected = compute_metrics(padded[k, :n].tolist())
+        for field in ("expectancy", "profit_factor", "mdd", "total_net_pnl", "win_rate"):
+            assert arrays[field][k] == getattr(expected, field), (k, field)
+
+
+def test_metrics_batch_padded_with_lengths():
+    padded = np.array([[1.0, -2.0, 3.0, 99.0], [0.5, 99.0, 99.0, 99.0], [99.0] * 4])
+    frame = compute_metrics_batch(padded, lengths=[3, 1, 0])
+
+    assert frame["trades"].tolist() == [3, 1, 0]
+    assert frame["total_net_pnl"].tolist() == [2.0, 0.5, 0.0]
+    assert frame["mdd"].tolist() == [-2.0, 0.0, 0.0]
+    assert frame["profit_factor"].tolist() == [2.0, None, 0.0]
+    assert "profit_factor_note" in frame.columns
+
+    full = compute_metrics_batch(padded[:1, :3])
+    assert full["expectancy"].tolist() == [2.0 / 3.0]
+    assert "profit_factor_note" not in full.columns
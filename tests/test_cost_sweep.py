@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from src.backtest.arrays import BarArrays
+from src.backtest.costs import apply_costs, cost_multiplier_matrix
+from src.backtest.engine import run_backtest_v1_bars
+from src.backtest.metrics import compute_metrics
+from src.backtest.sweep import cost_sweep, run_cost_sweep
+from src.backtest.types import TradeTable
+from src.strategies.v1.spec import StrategyParams
+
+
+def test_multiplier_matrix_accepts_scalars_and_triples():
+    got = cost_multiplier_matrix([1.0, 2, (1.0, 3.0, 0.5)])
+    np.testing.assert_array_equal(got, [[1, 1, 1], [2, 2, 2], [1, 3, 0.5]])
+    assert cost_multiplier_matrix([]).shape == (0, 3)
+    with pytest.raises(ValueError):
+        cost_multiplier_matrix([(1.0, 2.0)])
+
+
+def test_sweep_rows_match_rerun_per_multiplier(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(6_000, seed=13))
+    base = StrategyParams(
+        time_stop_bars=24,
+        maker_fee_bps=1.1,
+        taker_fee_bps=4.7,
+        slippage_bps=2.3,
+    )
+    multipliers = [1.0, 2.0, 0.3, (0.0, 1.5, 3.0)]
+
+    sweep = run_cost_sweep(bars, "SYN", base, multipliers)
+    assert len(sweep) == 4
+    assert sweep.pnl.net_pnl.shape == (4, len(sweep.table))
+    metrics = sweep.metrics()
+
+    for k in range(len(sweep)):
+        p = sweep.params_for(k)
+        trades = run_backtest_v1_bars(bars, "SYN", p, mode="bar")
+        rows = [apply_costs(t, p) for t in trades]
+
+        np.testing.assert_array_equal(sweep.pnl.net_pnl[k], [r.net_pnl for r in rows])
+        np.testing.assert_array_equal(sweep.pnl.fee_cost[k], [r.fee_cost for r in rows])
+        np.testing.assert_array_equal(sweep.pnl.slippage_cost[k], [r.slippage_cost for r in rows])
+        np.testing.assert_array_equal(sweep.pnl.gross_pnl[k], [r.gross_pnl for r in rows])
+        assert metrics[k] == compute_metrics([r.net_pnl for r in rows])
+        assert sweep.pnl_frame(k)["net_pnl"].tolist() == [r.net_pnl for r in rows]
+
+    assert sweep.params_for(3).maker_fee_bps == 0.0
+    assert sweep.params_for(3).slippage_bps == base.slippage_bps * 3.0
+
+
+def test_sweep_metrics_without_trades():
+    sweep = cost_sweep(TradeTable.empty(["SYN"]), StrategyParams(), [1.0, 2.0])
+    assert sweep.metrics() == [compute_metrics([]), compute_metrics([])]
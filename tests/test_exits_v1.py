@@ -1,6 +1,12 @@
+import numpy as np
 import pytest
 
-from src.strategies.v1.exits import check_long_exit, compute_long_brackets
+from src.strategies.v1.exits import (
+    Brackets,
+    LongExitIndex,
+    check_long_exit,
+    compute_long_brackets,
+)
 from src.strategies.v1.spec import ReasonCode
 
 
@@ -36,3 +42,47 @@ def test_exit_both_hit_same_bar_is_stop_first():
 def test_atr_must_be_positive():
     with pytest.raises(ValueError):
         compute_long_brackets(entry_px=100.0, atr=0.0, atr_mult=1.0, take_profit_r=2.0)
+
+
+def _scan_exit(low, high, start, end, brackets):
+    for j in range(start, end):
+        exit_px, reason = check_long_exit(low=low[j], high=high[j], brackets=brackets)
+        if reason is not None:
+            return j, exit_px, reason
+    return end, None, None
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 64, 1000])
+def test_exit_index_matches_bar_scan(n):
+    rng = np.random.default_rng(n)
+    mid = 100.0 + np.cumsum(rng.normal(0.0, 0.3, n))
+    low = mid - rng.uniform(0.0, 0.5, n)
+    high = mid + rng.uniform(0.0, 0.5, n)
+    low[:: max(1, n // 5)] = np.nan
+
+    index = LongExitIndex(low, high)
+
+    for _ in range(200):
+        start = int(rng.integers(0, n + 1))
+        end = int(rng.integers(start, n + 1))
+        ref = mid[min(start, n - 1)]
+        b = Brackets(stop_px=ref - rng.uniform(0.0, 5.0), tp_px=ref + rng.uniform(0.0, 5.0))
+        assert index.first_exit(start, end, b) == _scan_exit(low, high, start, end, b)
+
+
+def test_exit_index_stop_wins_when_both_hit_same_bar():
+    low = np.array([99.5, 99.0, 97.0])
+    high = np.array([100.5, 101.0, 105.0])
+    b = compute_long_brackets(entry_px=100.0, atr=2.0, atr_mult=1.0, take_profit_r=2.0)
+
+    assert LongExitIndex(low, high).first_exit(0, 3, b) == (2, 98.0, ReasonCode.STOP)
+
+
+def test_exit_index_no_touch_returns_window_end():
+    low = np.full(10, 99.5)
+    high = np.full(10, 100.5)
+    b = Brackets(stop_px=98.0, tp_px=104.0)
+
+    index = LongExitIndex(low, high)
+    assert index.first_touch(0, b.stop_px, b.tp_px) == 10
+    assert index.first_exit(2, 6, b) == (6, None, None)
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import numpy as np
+import pandas as pd
+import pytest
 
+import src.fast_indicators as fi
 from src.fast_indicators import ema
+from src.features import core
 
 
 def ema_py(x: np.ndarray, span: int) -> np.ndarray:
@@ -39,3 +43,238 @@ def test_ema_empty() -> None:
     x = np.array([], dtype=np.float64)
     out = ema(x, 10)
     assert out.size == 0
+
+
+@pytest.mark.parametrize("span", [1, 2, 3, 20, 200, 5_000])
+def test_ema_fallback_within_tolerance(monkeypatch, span) -> None:
+    monkeypatch.setattr(fi, "_cpp", None)
+    x = np.random.default_rng(span).normal(size=20_000).cumsum() + 1e3
+
+    out = ema(x, span)
+
+    np.testing.assert_allclose(
+        out, ema_py(x, span), rtol=0.0, atol=fi.EMA_FALLBACK_RTOL * np.abs(x).max()
+    )
+    assert out[0] == x[0]
+
+
+def test_ema_fallback_propagates_nan(monkeypatch) -> None:
+    monkeypatch.setattr(fi, "_cpp", None)
+    x = np.arange(10_000, dtype=np.float64)
+    x[5_000] = np.nan
+    out = ema(x, 20)
+    assert np.isfinite(out[:5_000]).all()
+    assert np.isnan(out[5_000:]).all()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("span", [2, 20, 200, 100_000])
+def test_ema_fallback_matches_cpp_on_1m(monkeypatch, span) -> None:
+    if fi._cpp is None:
+        pytest.skip("_fast_indicators extension not built")
+    x = np.random.default_rng(0).normal(size=1_000_000).cumsum()
+    expected = ema(x, span)
+
+    monkeypatch.setattr(fi, "_cpp", None)
+    np.testing.assert_allclose(
+        ema(x, span), expected, rtol=0.0, atol=fi.EMA_FALLBACK_RTOL * np.abs(x).max()
+    )
+
+
+def _ohlcv(n: int, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(rng.normal(0.0, 0.01, n).cumsum())
+    df = pd.DataFrame(
+        {
+            "ts": pd.date_range("2026-01-01", periods=n, freq="h", tz="UTC"),
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.uniform(1.0, 100.0, n),
+        }
+    )
+    # NaN closes / highs and a flat stretch exercise the ewm and max(axis=1) edge cases
+    df.loc[[50, 51, 300], "close"] = np.nan
+    df.loc[[700], "high"] = np.nan
+    df.loc[900:905, "close"] = df.loc[899, "close"]
+    return core.prepare_ohlcv(df)
+
+
+def _wilder(x: pd.Series, window: int) -> pd.Series:
+    return x.ewm(alpha=1.0 / window, adjust=False, min_periods=window).mean()
+
+
+def _pandas_rsi(close: pd.Series, window: int) -> pd.Series:
+    delta = close.diff()
+    rs = _wilder(delta.clip(lower=0.0), window) / _wilder((-delta).clip(lower=0.0), window)
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+def _pandas_true_range(x: pd.DataFrame) -> pd.Series:
+    prev_close = x["close"].shift(1)
+    parts = [
+        (x["high"] - x["low"]).abs(),
+        (x["high"] - prev_close).abs(),
+        (x["low"] - prev_close).abs(),
+    ]
+    return pd.concat(parts, axis=1).max(axis=1)
+
+
+def _pandas_features(x: pd.DataFrame) -> dict[str, np.ndarray]:
+    # pandas for the recursions; rolling columns use the window-local sums
+    # (checked against pandas' rolling separately, with a tolerance)
+    close = x["close"].to_numpy()
+    ret = np.log(x["close"]).diff().to_numpy()
+    pv = ((x["high"] + x["low"] + x["close"]) / 3.0 * x["volume"]).to_numpy()
+    vwap = fi.window_sums(pv, 20) / fi.window_sums(x["volume"].to_numpy(), 20)
+    return {
+        "ret_1": ret,
+        "vol_20": fi.window_std(ret, 20),
+        "sma_20": fi.window_sums(close, 20) / 20,
+        "ema_20": x["close"].ewm(span=20, adjust=False, min_periods=20).mean().to_numpy(),
+        "rsi_14": _pandas_rsi(x["close"], 14).to_numpy(),
+        "atr_14": _wilder(_pandas_true_range(x), 14).to_numpy(),
+        "vwap_20": vwap,
+        "vwap_dist_20": (close - vwap) / close,
+    }
+
+
+def _use_native(monkeypatch, native: bool, name: str) -> None:
+    if native and not hasattr(fi._cpp, name):
+        pytest.skip(f"_fast_indicators extension with {name} not built")
+    if not native:
+        monkeypatch.setattr(fi, "_cpp", None)
+
+
+@pytest.mark.parametrize("native", [False, True])
+def test_core_features_bit_identical_to_pandas_path(monkeypatch, native) -> None:
+    _use_native(monkeypatch, native, "core_features")
+
+    x = _ohlcv(3_000)
+    expected = _pandas_features(x)
+    out = np.empty((len(fi.CORE_FEATURES), len(x)))
+    got = fi.core_features(x["high"], x["low"], x["close"], x["volume"], out=out)
+
+    assert got is out
+    for name, row in zip(fi.CORE_FEATURES, got, strict=True):
+        np.testing.assert_array_equal(row, expected[name], err_msg=name)
+
+
+def test_core_features_short_and_empty() -> None:
+    x = _ohlcv(3_000).iloc[:10]
+    out = fi.core_features(x["high"], x["low"], x["close"], x["volume"])
+    assert np.isnan(out[[1, 2, 6, 7]]).all()
+    assert fi.core_features(*(np.empty(0),) * 4).shape == (len(fi.CORE_FEATURES), 0)
+    with pytest.raises(ValueError):
+        fi.core_features(x["high"], x["low"], x["close"], x["volume"], out=np.empty((8, 3)))
+
+
+@pytest.mark.parametrize("native", [False, True])
+def test_indicators_match_pandas(monkeypatch, native) -> None:
+    _use_native(monkeypatch, native, "rolling_vwap")
+    x = _ohlcv(3_000)
+    h, lo, c, v = (x[col].to_numpy() for col in ("high", "low", "close", "volume"))
+
+    # Wilder recursions: same bits as pandas' ewm
+    np.testing.assert_array_equal(fi.rsi(c, 14), _pandas_rsi(x["close"], 14).to_numpy())
+    np.testing.assert_array_equal(fi.true_range(h, lo, c), _pandas_true_range(x).to_numpy())
+    np.testing.assert_array_equal(fi.atr(h, lo, c, 5), _wilder(_pandas_true_range(x), 5).to_numpy())
+
+    # Windowed: pandas' warm-up NaNs, values to rounding
+    pv = (x["high"] + x["low"] + x["close"]) / 3.0 * x["volume"]
+    expected = {
+        "sma": x["close"].rolling(7).mean(),
+        "std": x["close"].rolling(7).std(),
+        "vwap": pv.rolling(7).sum() / x["volume"].rolling(7).sum(),
+    }
+    got = {
+        "sma": fi.sma(c, 7),
+        "std": fi.rolling_std(c, 7),
+        "vwap": fi.rolling_vwap(h, lo, c, v, 7),
+    }
+    for name, exp in expected.items():
+        # pandas' running sums leave ~1e-6 of cancellation error on the flat
+        # stretch (bars 899..905); the per-window std is ~0 there
+        np.testing.assert_allclose(got[name], exp.to_numpy(), rtol=1e-9, atol=1e-5, err_msg=name)
+    assert got["std"][905] < 1e-12
+
+
+def test_indicators_native_matches_fallback(monkeypatch) -> None:
+    if not hasattr(fi._cpp, "rolling_vwap"):
+        pytest.skip("_fast_indicators extension with rolling_vwap not built")
+    x = _ohlcv(3_000)
+    h, lo, c, v = (x[col].to_numpy() for col in ("high", "low", "close", "volume"))
+    calls = {
+        "sma": lambda: fi.sma(c, 20),
+        "rolling_std": lambda: fi.rolling_std(c, 20),
+        "rsi": lambda: fi.rsi(c, 14),
+        "true_range": lambda: fi.true_range(h, lo, c),
+        "atr": lambda: fi.atr(h, lo, c, 14),
+        "rolling_vwap": lambda: fi.rolling_vwap(h, lo, c, v, 20),
+    }
+    native = {name: call() for name, call in calls.items()}
+    monkeypatch.setattr(fi, "_cpp", None)
+    for name, call in calls.items():
+        np.testing.assert_array_equal(native[name], call(), err_msg=name)
+
+
+@pytest.mark.parametrize("window", [1, 2, 3, 7, 16, 20, 33, 200])
+def test_window_stats_are_window_local(monkeypatch, window) -> None:
+    # Price-like data across several fallback blocks, with a NaN in the middle.
+    monkeypatch.setattr(fi, "_WINDOW_BLOCK", 256)
+    x = np.random.default_rng(window).normal(size=1_000).cumsum() + 1_000.0
+    x[500] = np.nan
+    sums, std = fi.window_sums(x, window), fi.window_std(x, window)
+
+    # Same bits from any later start (what incremental features rely on).
+    for start in (1, 37, 300):
+        full = start + window - 1
+        np.testing.assert_array_equal(fi.window_sums(x[start:], window)[window - 1 :], sums[full:])
+        np.testing.assert_array_equal(fi.window_std(x[start:], window)[window - 1 :], std[full:])
+
+    windows = np.lib.stride_tricks.sliding_window_view(x, window)
+    dev = windows - windows.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        two_pass = np.sqrt((dev * dev).sum(axis=1) / (window - 1))
+    assert np.isnan(sums[: window - 1]).all() and np.isnan(std[: window - 1]).all()
+    np.testing.assert_allclose(sums[window - 1 :], windows.sum(axis=1), rtol=1e-14)
+    # Mean rounding bounds the error by ~eps * |x|, not by the std itself.
+    atol = 1e-14 * np.nanmax(np.abs(x))
+    np.testing.assert_allclose(std[window - 1 :], two_pass, rtol=1e-12, atol=atol)
+
+    if hasattr(fi._cpp, "rolling_std"):
+        np.testing.assert_array_equal(fi._cpp.sma(x, window), sums / window)
+        np.testing.assert_array_equal(fi._cpp.rolling_std(x, window), std)
+
+
+def test_indicator_window_validation() -> None:
+    with pytest.raises(ValueError):
+        fi.sma(np.ones(5), 0)
+    assert np.isnan(fi.rolling_std(np.ones(3), 5)).all()
+
+
+@pytest.mark.parametrize("native", [False, True])
+@pytest.mark.parametrize("threads", [None, 1, 3])
+def test_ema_batch_matches_ema_per_row(monkeypatch, native, threads) -> None:
+    _use_native(monkeypatch, native, "ema_batch")
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=(7, 500)).cumsum(axis=1)
+    spans = [20, 50, 200]
+
+    out = fi.ema_batch(x, spans, threads=threads)
+
+    assert out.shape == (7, 3, 500)
+    for r in range(x.shape[0]):
+        for k, span in enumerate(spans):
+            np.testing.assert_array_equal(out[r, k], ema(x[r], span))
+
+
+def test_ema_batch_validation() -> None:
+    assert fi.ema_batch(np.empty((2, 0)), [3]).shape == (2, 1, 0)
+    with pytest.raises(ValueError):
+        fi.ema_batch(np.ones(5), [3])
+    with pytest.raises(ValueError):
+        fi.ema_batch(np.ones((2, 5)), [0])
+    with pytest.raises(ValueError):
+        fi.ema_batch(np.ones((2, 5)), [3], threads=0)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 import subprocess
 import sys
@@ -9,7 +10,17 @@ import pandas as pd
 import pytest
 from dotenv import load_dotenv
 
-from src.features.core import atr, build_features, log_return, rolling_vwap, rsi
+from src.features.core import (
+    FeatureState,
+    atr,
+    build_features,
+    build_features_incremental,
+    log_return,
+    rolling_vol,
+    rolling_vwap,
+    rsi,
+    sma,
+)
 
 
 def make_df(n: int = 60) -> pd.DataFrame:
@@ -89,6 +100,53 @@ def test_no_lookahead_on_sma() -> None:
     assert np.isclose(sma_i, manual)
 
 
+def make_random_df(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(rng.normal(0.0, 0.01, n).cumsum())
+    df = pd.DataFrame(
+        {
+            "ts": pd.date_range("2026-01-01", periods=n, freq="h", tz="UTC"),
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.uniform(1.0, 100.0, n),
+        }
+    )
+    df.loc[[50, 51, 300], "close"] = np.nan
+    return df
+
+
+def test_window_features_match_pandas_rolling() -> None:
+    df = make_random_df(400)
+    x = df["close"].ffill()
+
+    pd.testing.assert_series_equal(sma(x, 20), x.rolling(20).mean())
+    pd.testing.assert_series_equal(rolling_vol(x, 20), x.rolling(20).std())
+    pd.testing.assert_series_equal(rolling_vol(df["close"], 20), df["close"].rolling(20).std())
+
+
+def test_incremental_features_bit_identical_to_full() -> None:
+    df = make_random_df(500)
+    full = build_features(df)
+
+    state = None
+    parts = []
+    # Chunks overlap the watermark, cross the NaN closes and include a one-bar refresh.
+    for a, b in [(0, 7), (7, 30), (30, 31), (31, 52), (52, 53), (53, 400), (400, 500)]:
+        out, state = build_features_incremental(df.iloc[max(0, a - 3) : b], state)
+        state = FeatureState.from_dict(json.loads(json.dumps(state.to_dict())))
+        parts.append(out)
+    inc = pd.concat(parts, ignore_index=True)
+
+    assert (inc["ts"] == full["ts"]).all()
+    for c in [c for c in full.columns if c.startswith("feature__")]:
+        np.testing.assert_array_equal(inc[c].to_numpy(), full[c].to_numpy(), err_msg=c)
+
+    again, _ = build_features_incremental(df, state)
+    assert again.empty
+
+
 @pytest.mark.integration
 def test_e2e_build_features_script_writes_to_db() -> None:
     """End-to-end smoke test: run the feature builder script and confirm DB has rows."""
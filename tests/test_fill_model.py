@@ -1,4 +1,14 @@
-from src.backtest.fill_model import check_fill, place_limit_order, step_age_and_expire
+import numpy as np
+import pytest
+
+from src.backtest.fill_model import (
+    NO_FILL,
+    check_fill,
+    first_fill_index,
+    first_fill_indices,
+    place_limit_order,
+    step_age_and_expire,
+)
 from src.strategies.v1.spec import ReasonCode, Side
 
 
@@ -160,3 +170,54 @@ def test_limit_expires_after_n_bars():
     assert expired is True
     assert order.expired is True
     assert ReasonCode.LIMIT_EXPIRED in order.reasons
+
+
+def _loop_fill_index(low, high, placed_idx, limit_px, expiry_bars):
+    # Engine-like loop: check fill on each bar after placement, then age.
+    order = place_limit_order(
+        next_bar_ts=placed_idx, side=Side.LONG, limit_px=limit_px, expiry_bars=expiry_bars
+    )
+    for j in range(placed_idx + 1, len(low)):
+        order, filled = check_fill(order, bar_ts=j, bar={"low": low[j], "high": high[j]})
+        if filled:
+            return j
+        order, expired = step_age_and_expire(order)
+        if expired:
+            return NO_FILL
+    return NO_FILL
+
+
+@pytest.mark.parametrize("expiry_bars", [0, 1, 3, 7])
+def test_first_fill_index_matches_per_bar_loop(expiry_bars):
+    rng = np.random.default_rng(3)
+    mid = 10.0 + np.cumsum(rng.normal(0.0, 0.05, 300))
+    low = mid - rng.uniform(0.0, 0.1, mid.size)
+    high = mid + rng.uniform(0.0, 0.1, mid.size)
+
+    placed = np.arange(0, mid.size, 3)
+    limits = mid[placed] + rng.normal(0.0, 0.1, placed.size)
+
+    expected = [
+        _loop_fill_index(low, high, int(p), float(px), expiry_bars)
+        for p, px in zip(placed, limits, strict=True)
+    ]
+    single = [
+        first_fill_index(low, high, int(p), float(px), expiry_bars)
+        for p, px in zip(placed, limits, strict=True)
+    ]
+    batched = first_fill_indices(low, high, placed, limits, expiry_bars)
+
+    assert NO_FILL in expected and any(i != NO_FILL for i in expected)
+    assert single == expected
+    assert batched.tolist() == expected
+
+
+def test_first_fill_indices_per_order_expiry_and_empty():
+    low = np.array([9.0, 10.5, 10.4, 9.9, 9.0])
+    high = np.array([11.0, 11.0, 11.0, 10.1, 11.0])
+
+    got = first_fill_indices(low, high, np.array([0, 0]), np.array([10.0, 10.0]), np.array([2, 3]))
+    assert got.tolist() == [NO_FILL, 3]
+
+    empty = first_fill_indices(low, high, np.array([], dtype=np.int64), np.array([]), 3)
+    assert empty.size == 0
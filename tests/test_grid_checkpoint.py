@@ -0,0 +1,83 @@
+import pytest
+
+import src.backtest.grid as grid_mod
+from src.backtest.arrays import BarArrays
+from src.backtest.checkpoint import GridCheckpoint, config_hash
+from src.backtest.grid import run_grid_on_train, run_walkforward_folds
+from src.backtest.splits import make_walkforward_folds
+
+
+def _grid() -> list[dict]:
+    return [
+        {"strategy": {"atr_stop_mult": atrm, "take_profit_r": tpr}, "entry": {}}
+        for atrm in (1.0, 1.5, 2.0)
+        for tpr in (1.0, 2.0, 3.0)
+    ]
+
+
+def test_config_hash_ignores_key_order():
+    assert config_hash({"a": 1, "b": [1, 2]}) == config_hash({"b": [1, 2], "a": 1})
+    assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+
+def test_checkpoint_resumes_interrupted_grid(make_v1_frame, tmp_path, monkeypatch):
+    df = make_v1_frame(3_000, seed=3)
+    expected = run_grid_on_train(df, symbol="SYN", grid=_grid())
+
+    monkeypatch.setattr(grid_mod, "_CHECKPOINT_BLOCK", 2)
+    real = grid_mod._net_pnl_one
+    calls = []
+
+    def crashing(*args, **kw):
+        if len(calls) == 5:
+            raise KeyboardInterrupt
+        calls.append(1)
+        return real(*args, **kw)
+
+    monkeypatch.setattr(grid_mod, "_net_pnl_one", crashing)
+    with pytest.raises(KeyboardInterrupt):
+        with GridCheckpoint(tmp_path, job="job") as ckpt:
+            run_grid_on_train(df, symbol="SYN", grid=_grid(), checkpoint=ckpt)
+    # Items are logged in blocks of 2: the 5th finished item was not yet written.
+    assert len(GridCheckpoint(tmp_path, job="job")) == 4
+
+    calls.clear()
+    monkeypatch.setattr(
+        grid_mod, "_net_pnl_one", lambda *a, **kw: calls.append(1) or real(*a, **kw)
+    )
+    with GridCheckpoint(tmp_path, job="job") as ckpt:
+        resumed = run_grid_on_train(df, symbol="SYN", grid=_grid(), checkpoint=ckpt)
+    assert resumed == expected
+    assert len(calls) == len(_grid()) - 4
+    assert len(GridCheckpoint(tmp_path, job="job")) == len(_grid())
+
+
+def test_checkpoint_ignores_torn_line(tmp_path):
+    with GridCheckpoint(tmp_path, job="job") as ckpt:
+        ckpt.put("a", {"x": 1})
+    with open(ckpt.path, "a") as f:
+        f.write('\n{"key": "b", "val')
+    with GridCheckpoint(tmp_path, job="job") as ckpt:
+        assert ckpt.get("a") == {"x": 1}
+        assert "b" not in ckpt
+        ckpt.put("c", {"x": 3})
+    assert GridCheckpoint(tmp_path, job="job").get("c") == {"x": 3}
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_walkforward_folds_with_checkpoint(make_v1_frame, tmp_path, workers):
+    bars = BarArrays.from_frame(make_v1_frame(2_000, seed=4))
+    folds = make_walkforward_folds(len(bars), 600, 200, 200, mode="rolling")
+    plain = run_walkforward_folds(bars, "SYN", _grid(), folds)
+
+    with GridCheckpoint(tmp_path, job="wf") as ckpt:
+        first = run_walkforward_folds(bars, "SYN", _grid(), folds, workers=workers, checkpoint=ckpt)
+    n_logged = len(GridCheckpoint(tmp_path, job="wf"))
+    with GridCheckpoint(tmp_path, job="wf") as ckpt:
+        again = run_walkforward_folds(bars, "SYN", _grid(), folds, workers=workers, checkpoint=ckpt)
+
+    assert n_logged > 0
+    assert len(GridCheckpoint(tmp_path, job="wf")) == n_logged
+    for result in (first, again):
+        assert result.fold_metrics.equals(plain.fold_metrics)
+        assert result.oos_trades.equals(plain.oos_trades)
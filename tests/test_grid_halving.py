@@ -0,0 +1,95 @@
+import itertools
+
+import pytest
+
+from src.backtest.grid import (
+    _halving_schedule,
+    run_grid_halving,
+    run_grid_on_train,
+    run_walkforward_abc,
+)
+
+
+def _grid() -> list[dict]:
+    return [
+        {
+            "strategy": {
+                "limit_expiry_bars": leb,
+                "atr_stop_mult": atrm,
+                "take_profit_r": tpr,
+                "time_stop_bars": tsb,
+            },
+            "entry": {},
+        }
+        for leb, atrm, tpr, tsb in itertools.product(
+            [3, 4, 5], [1.0, 1.5, 2.0], [1.0, 2.0], [None, 24]
+        )
+    ]
+
+
+def test_halving_schedule():
+    assert _halving_schedule(4_000, 36, top_k=10, eta=2, min_bars=200) == [1_000, 2_000, 4_000]
+    assert _halving_schedule(4_000, 36, top_k=10, eta=2, min_bars=1_500) == [2_000, 4_000]
+    assert _halving_schedule(4_000, 8, top_k=10, eta=2, min_bars=200) == [4_000]
+
+
+def test_halving_prunes_and_reports_savings(make_v1_frame):
+    df = make_v1_frame(4_000, seed=12)
+    grid = _grid()
+
+    results, best, report = run_grid_halving(df, "SYN", grid, top_k=10)
+
+    assert [(r.n_bars, r.n_candidates) for r in report.rungs] == [
+        (1_000, 36),
+        (2_000, 18),
+        (4_000, 10),
+    ]
+    assert report.full_bar_evaluations == 36 * 4_000
+    assert report.bar_evaluations == 36_000 + 36_000 + 40_000
+    assert report.saved_bar_evaluations == 144_000 - 112_000
+
+    # Survivors are scored exactly as a plain grid run on the full window.
+    survivors = [r.params for r in results]
+    assert len(survivors) == 10
+    full_results, full_best = run_grid_on_train(df, "SYN", survivors)
+    assert full_results == results
+    assert full_best is best
+
+
+def test_halving_without_pruning_matches_grid(make_v1_frame):
+    df = make_v1_frame(3_000, seed=2)
+    grid = _grid()
+
+    results, best, report = run_grid_halving(df, "SYN", grid, selection_metric="win_rate", top_k=36)
+    full_results, full_best = run_grid_on_train(df, "SYN", grid)
+
+    assert len(report.rungs) == 1
+    assert report.saved_bar_evaluations == 0
+    assert results == full_results
+    assert best == max(grid, key=lambda g: results[grid.index(g)].metrics["win_rate"])
+
+
+def test_walkforward_halving_search(make_v1_frame):
+    df = make_v1_frame(5_000, seed=4)
+    parts = (df.iloc[:3_000], df.iloc[3_000:4_000], df.iloc[4_000:])
+
+    out = run_walkforward_abc(*parts, symbol="SYN", grid=_grid(), search="halving", top_k=5)
+    assert out["halving_report"].saved_bar_evaluations > 0
+    assert len(out["train_grid_runs"]) >= 5
+    assert out["best_params"] in _grid()
+
+    with pytest.raises(ValueError):
+        run_walkforward_abc(*parts, symbol="SYN", grid=_grid(), search="random")
+
+
+@pytest.mark.parametrize("search", ["grid", "halving"])
+def test_unknown_selection_metric_is_rejected(make_v1_frame, search):
+    df = make_v1_frame(1_500, seed=4)
+    parts = (df.iloc[:900], df.iloc[900:1_200], df.iloc[1_200:])
+
+    with pytest.raises(ValueError, match="selection_metric"):
+        run_walkforward_abc(
+            *parts, symbol="SYN", grid=_grid(), selection_metric="sharpe", search=search
+        )
+    with pytest.raises(ValueError, match="selection_metric"):
+        run_grid_halving(parts[0], "SYN", _grid(), selection_metric="sharpe")
@@ -0,0 +1,89 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+import src.backtest.grid as grid_mod
+from src.backtest.arrays import BarArrays
+from src.backtest.engine import run_backtest_v1
+from src.backtest.grid import run_grid_on_train, run_walkforward_abc
+from src.backtest.parallel import SharedBars, attach_bars
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+
+def _grid() -> list[dict]:
+    grid = [
+        {
+            "strategy": {
+                "limit_expiry_bars": leb,
+                "atr_stop_mult": atrm,
+                "take_profit_r": tpr,
+                "maker_fee_bps": 2.0,
+                "slippage_bps": 1.0,
+            },
+            "entry": {"min_vol_ratio": mvr},
+        }
+        for leb, atrm, tpr, mvr in itertools.product([2, 4], [1.0, 2.0], [1.0, 2.0], [None, 1.0])
+    ]
+    # Duplicates score the same as the original: the first one must stay best.
+    return grid + [dict(item) for item in grid]
+
+
+def test_shared_bars_roundtrip(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(500, seed=4))
+    with SharedBars(bars) as shared:
+        shm, attached = attach_bars(shared.handle)
+        try:
+            for name in ("ts", "high", "low", "close", "vwap", "atr", "vol_ratio"):
+                np.testing.assert_array_equal(getattr(attached, name), getattr(bars, name))
+            assert not attached.close.flags.writeable
+        finally:
+            del attached
+            shm.close()
+
+
+def test_parallel_grid_matches_serial(make_v1_frame):
+    df = make_v1_frame(4_000, seed=8)
+    grid = _grid()
+
+    serial_results, serial_best = run_grid_on_train(df, symbol="SYN", grid=grid)
+    par_results, par_best = run_grid_on_train(df, symbol="SYN", grid=grid, workers=2)
+
+    assert par_results == serial_results
+    assert par_best is serial_best
+
+
+def test_parallel_walkforward_matches_serial(make_v1_frame):
+    df = make_v1_frame(6_000, seed=9)
+    train, validate, test = df.iloc[:3_600], df.iloc[3_600:4_800], df.iloc[4_800:]
+
+    serial = run_walkforward_abc(train, validate, test, symbol="SYN", grid=_grid())
+    par = run_walkforward_abc(train, validate, test, symbol="SYN", grid=_grid(), workers=2)
+
+    assert par["best_params"] == serial["best_params"]
+    assert par["validate_metrics"] == serial["validate_metrics"]
+    assert par["test_metrics"] == serial["test_metrics"]
+    pd.testing.assert_frame_equal(par["train_grid_runs"], serial["train_grid_runs"])
+
+
+def test_grid_computes_entry_signal_once_per_entry_group(make_v1_frame, monkeypatch):
+    df = make_v1_frame(3_000, seed=6)
+    grid = _grid()
+
+    calls = []
+    real = grid_mod.bar_entry_candidates
+
+    def counting(bars, entry_params):
+        calls.append(entry_params)
+        return real(bars, entry_params)
+
+    monkeypatch.setattr(grid_mod, "bar_entry_candidates", counting)
+    results, _ = run_grid_on_train(df, symbol="SYN", grid=grid)
+
+    assert len(calls) == 2  # min_vol_ratio None / 1.0
+    for r in results[:4]:
+        strat = StrategyParams(**r.params["strategy"])
+        entry = EntryRuleParams(**r.params["entry"])
+        trades = run_backtest_v1(df, "SYN", strat, entry)
+        assert r.metrics["trades"] == len(trades)
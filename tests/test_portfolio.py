@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from src.backtest.arrays import BarArrays
+from src.backtest.costs import apply_costs
+from src.backtest.engine import run_backtest_v1_bars
+from src.backtest.portfolio import AlignedBars, run_portfolio_v1
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+
+def _symbol_bars(make_v1_frame) -> dict[str, BarArrays]:
+    a = make_v1_frame(4_000, seed=1)
+    b = make_v1_frame(3_000, seed=2)
+    c = make_v1_frame(3_500, seed=3)
+    # Different calendars: B starts later, C has gaps.
+    b["ts"] = b["ts"] + 700 * 60
+    c = c.drop(index=c.index[500:800]).drop(index=c.index[2_000:2_050]).reset_index(drop=True)
+    return {name: BarArrays.from_frame(df) for name, df in (("AAA", a), ("BBB", b), ("CCC", c))}
+
+
+@pytest.mark.parametrize(
+    "params,entry",
+    [
+        (
+            StrategyParams(time_stop_bars=24, maker_fee_bps=1.0, taker_fee_bps=4.0),
+            EntryRuleParams(),
+        ),
+        (
+            StrategyParams(limit_expiry_bars=1, time_stop_bars=None),
+            EntryRuleParams(min_vol_ratio=1.0),
+        ),
+    ],
+)
+def test_portfolio_matches_per_symbol_engine(make_v1_frame, params, entry):
+    bars = _symbol_bars(make_v1_frame)
+    result = run_portfolio_v1(bars, params, entry)
+    table = result.trades
+
+    assert table.symbols == ("AAA", "BBB", "CCC")
+    assert np.all(np.diff(table.exit_ts) >= 0)
+    for s, (name, b) in enumerate(bars.items()):
+        expected = run_backtest_v1_bars(b, name, params, entry)
+        assert len(expected) > 0
+        assert table[table.symbol_id == s].to_trades() == expected
+
+    net = [apply_costs(t, params).net_pnl for t in table]
+    np.testing.assert_array_equal(result.pnl.net_pnl, net)
+
+    eq = result.equity_frame()
+    assert len(eq) == len(AlignedBars.from_bars(bars).ts)
+    assert eq["equity"].iloc[-1] == pytest.approx(sum(net))
+    at_exit = np.searchsorted(result.ts, table.exit_ts[-1])
+    assert result.equity[at_exit] == pytest.approx(sum(net))
+
+
+def test_aligned_bars_layout(make_v1_frame):
+    bars = _symbol_bars(make_v1_frame)
+    al = AlignedBars.from_bars(bars)
+
+    assert al.high.shape == (3, al.ts.shape[0])
+    assert al.present.sum(axis=1).tolist() == [len(b) for b in bars.values()]
+    assert np.isnan(al.close[~al.present]).all()
+    np.testing.assert_array_equal(al.close[1, al.present[1]], bars["BBB"].close)
+
+
+def test_empty_portfolio():
+    result = run_portfolio_v1({}, StrategyParams())
+    assert len(result.trades) == 0
+    assert result.equity.shape == (0,)
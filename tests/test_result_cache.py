@@ -0,0 +1,96 @@
+import os
+
+import src.backtest.grid as grid_mod
+from src.backtest.arrays import BarArrays
+from src.backtest.cache import ResultCache, bars_digest, result_key
+from src.backtest.grid import run_grid_on_train, run_walkforward_abc
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import StrategyParams
+
+
+def _grid(tprs=(1.0, 2.0)) -> list[dict]:
+    return [
+        {"strategy": {"atr_stop_mult": atrm, "take_profit_r": tpr}, "entry": {}}
+        for atrm in (1.0, 2.0)
+        for tpr in tprs
+    ]
+
+
+def _count_computed(monkeypatch) -> list[int]:
+    computed = []
+    real = grid_mod._compute_grid_metrics
+
+    def counting(bars, symbol, grid, **kw):
+        computed.append(len(grid))
+        return real(bars, symbol, grid, **kw)
+
+    monkeypatch.setattr(grid_mod, "_compute_grid_metrics", counting)
+    return computed
+
+
+def test_grid_cache_only_computes_new_items(make_v1_frame, tmp_path, monkeypatch):
+    df = make_v1_frame(3_000, seed=3)
+    computed = _count_computed(monkeypatch)
+    cache = ResultCache(tmp_path)
+
+    uncached = run_grid_on_train(df, symbol="SYN", grid=_grid())
+    first = run_grid_on_train(df, symbol="SYN", grid=_grid(), cache=cache)
+    again = run_grid_on_train(df, symbol="SYN", grid=_grid(), cache=ResultCache(tmp_path))
+    assert first == uncached
+    assert again == uncached
+    assert computed == [4, 4]
+
+    run_grid_on_train(df, symbol="SYN", grid=_grid(tprs=(1.0, 3.0)), cache=cache)
+    assert computed == [4, 4, 2]
+
+    # Different bars or symbol: nothing is reused.
+    run_grid_on_train(df.iloc[:-1], symbol="SYN", grid=_grid(), cache=cache)
+    run_grid_on_train(df, symbol="OTHER", grid=_grid(), cache=cache)
+    assert computed == [4, 4, 2, 4, 4]
+
+
+def test_walkforward_cache_matches_uncached(make_v1_frame, tmp_path):
+    df = make_v1_frame(3_000, seed=9)
+    parts = (df.iloc[:1500], df.iloc[1500:2200], df.iloc[2200:])
+
+    plain = run_walkforward_abc(*parts, symbol="SYN", grid=_grid())
+    for _ in range(2):
+        cached = run_walkforward_abc(
+            *parts, symbol="SYN", grid=_grid(), cache=ResultCache(tmp_path)
+        )
+        assert cached["best_params"] == plain["best_params"]
+        assert cached["validate_metrics"] == plain["validate_metrics"]
+        assert cached["test_metrics"] == plain["test_metrics"]
+        assert cached["train_grid_runs"].equals(plain["train_grid_runs"])
+
+
+def test_result_key_covers_inputs(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(200, seed=1))
+    h = bars_digest(bars)
+    base = result_key(h, "SYN", StrategyParams(), EntryRuleParams(), "v1")
+
+    assert base == result_key(h, "SYN", StrategyParams(), EntryRuleParams(), "v1")
+    assert base != result_key(h, "SYN", StrategyParams(), EntryRuleParams(), "v2")
+    assert base != result_key(h, "SYN", StrategyParams(slippage_bps=1.0), EntryRuleParams(), "v1")
+    assert base != result_key(h, "SYN", StrategyParams(), EntryRuleParams(min_vol_ratio=1.0), "v1")
+
+    bumped = bars.close.copy()
+    bumped[100] = bumped[100] + 1e-9
+    assert bars_digest(BarArrays(**{**bars.__dict__, "close": bumped})) != h
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=2_500)
+    payload = {"x": "a" * 1_000}
+    cache.put("a", payload)
+    cache.put("b", payload)
+    os.utime(tmp_path / "a.json", ns=(1, 1))
+    os.utime(tmp_path / "b.json", ns=(2, 2))
+
+    assert cache.get("a") == payload  # refreshes a, so b is now the oldest
+    cache.put("c", payload)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == payload
+    assert cache.get("c") == payload
+    assert cache.get("missing") is None
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.backtest.metrics import compute_metrics
+from src.backtest.robustness import bootstrap_metrics
+
+
+def _pnl(n=250, seed=0):
+    return np.random.default_rng(seed).normal(0.05, 1.0, size=n)
+
+
+@pytest.mark.parametrize("method", ["iid", "block"])
+def test_bootstrap_is_seeded_and_memory_independent(method):
+    pnl = _pnl()
+    a = bootstrap_metrics(pnl, n_resamples=3_000, method=method, seed=42)
+    b = bootstrap_metrics(pnl, n_resamples=3_000, method=method, seed=42, memory_bytes=50_000)
+    c = bootstrap_metrics(pnl, n_resamples=3_000, method=method, seed=43)
+
+    assert len(a) == 3_000
+    for name in ("total_net_pnl", "mdd", "profit_factor"):
+        np.testing.assert_array_equal(getattr(a, name), getattr(b, name))
+    assert not np.array_equal(a.total_net_pnl, c.total_net_pnl)
+
+
+def test_bootstrap_resamples_match_compute_metrics():
+    pnl = _pnl(n=60, seed=1)
+    res = bootstrap_metrics(pnl, n_resamples=20, method="block", block_size=7, seed=5)
+
+    # Re-draw the same indices and score them one by one.
+    rng = np.random.default_rng(5)
+    starts = rng.integers(0, 60, size=(20, 9))
+    idx = ((starts[:, :, None] + np.arange(7)) % 60).reshape(20, 63)[:, :60]
+    for k in range(20):
+        m = compute_metrics(pnl[idx[k]].tolist())
+        assert res.total_net_pnl[k] == m.total_net_pnl
+        assert res.mdd[k] == m.mdd
+        assert res.profit_factor[k] == m.profit_factor
+
+
+def test_bootstrap_distribution_and_summary():
+    pnl = _pnl(n=400, seed=2)
+    res = bootstrap_metrics(pnl, n_resamples=5_000, seed=0)
+
+    # iid resampling keeps the mean total close to the observed total.
+    assert res.total_net_pnl.mean() == pytest.approx(
+        pnl.sum(), abs=3 * pnl.std() * np.sqrt(400) / 50
+    )
+    assert (res.mdd <= 0).all()
+
+    summary = res.summary()
+    assert list(summary.index) == ["total_net_pnl", "mdd", "profit_factor"]
+    assert summary.loc["total_net_pnl", "q0.05"] <= summary.loc["total_net_pnl", "q0.95"]
+
+    wins_only = bootstrap_metrics([1.0, 2.0], n_resamples=10)
+    assert np.isinf(wins_only.profit_factor).all()
+    assert wins_only.summary().loc["profit_factor", "q0.5"] == np.inf
+
+
+def test_bootstrap_rejects_bad_input():
+    with pytest.raises(ValueError):
+        bootstrap_metrics([], n_resamples=10)
+    with pytest.raises(ValueError):
+        bootstrap_metrics([1.0], method="stationary")
+    with pytest.raises(ValueError):
+        bootstrap_metrics([1.0, -1.0], method="block", block_size=0)
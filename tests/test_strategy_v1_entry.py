@@ -1,4 +1,7 @@
-from src.strategies.v1.entry import EntryRuleParams, build_entry_signal
+import numpy as np
+import pytest
+
+from src.strategies.v1.entry import EntryRuleParams, build_entry_signal, entry_candidates
 from src.strategies.v1.spec import ReasonCode, Side
 
 
@@ -47,3 +50,50 @@ def test_entry_signal_passes_when_vol_confirm_met():
     )
     assert sig is not None
     assert ReasonCode.VOL_CONFIRM in sig.reasons
+
+
+@pytest.mark.parametrize("min_vol_ratio", [None, 1.0])
+def test_entry_candidates_match_per_bar_signal(make_v1_frame, min_vol_ratio):
+    df = make_v1_frame(2_000, seed=1)
+    df.loc[50:60, "vol_ratio"] = np.nan
+    params = EntryRuleParams(min_vol_ratio=min_vol_ratio)
+
+    expected = []
+    for i in range(1, len(df)):
+        if not df.loc[i, "ema50_1h"] > df.loc[i, "ema200_1h"]:
+            continue
+        sig = build_entry_signal(
+            ts=int(df.loc[i - 1, "ts"]),
+            prev_close=df.loc[i - 1, "close"],
+            prev_vwap=df.loc[i - 1, "vwap"],
+            close=df.loc[i, "close"],
+            vwap=df.loc[i, "vwap"],
+            vol_ratio=df.loc[i, "vol_ratio"],
+            params=params,
+        )
+        if sig is not None:
+            expected.append(i)
+
+    got = entry_candidates(
+        close=df["close"].to_numpy(),
+        vwap=df["vwap"].to_numpy(),
+        ema50_1h=df["ema50_1h"].to_numpy(),
+        ema200_1h=df["ema200_1h"].to_numpy(),
+        vol_ratio=df["vol_ratio"].to_numpy(),
+        params=params,
+    )
+
+    assert got.tolist() == expected
+
+
+def test_entry_candidates_without_vol_ratio_column_are_empty_when_confirm_required():
+    x = np.array([9.9, 10.1])
+    got = entry_candidates(
+        close=x,
+        vwap=np.array([10.0, 10.0]),
+        ema50_1h=np.array([101.0, 101.0]),
+        ema200_1h=np.array([100.0, 100.0]),
+        vol_ratio=None,
+        params=EntryRuleParams(min_vol_ratio=1.0),
+    )
+    assert got.size == 0
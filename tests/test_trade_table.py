@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.arrays import BarArrays
+from src.backtest.batch import run_backtest_v1_batch
+from src.backtest.engine import ENGINE_MODES, run_backtest_v1_bars, run_backtest_v1_table
+from src.backtest.types import TradeTable
+from src.strategies.v1.entry import EntryRuleParams
+from src.strategies.v1.spec import ReasonCode, Side, StrategyParams, mask_to_reasons
+
+PARAMS = StrategyParams(limit_expiry_bars=4, time_stop_bars=24)
+
+
+@pytest.mark.parametrize("mode", ENGINE_MODES)
+def test_engine_table_matches_trade_list(make_v1_frame, mode):
+    bars = BarArrays.from_frame(make_v1_frame(5_000, seed=8))
+    entry = EntryRuleParams(min_vol_ratio=1.0)
+
+    table = run_backtest_v1_table(bars, "SYN", PARAMS, entry, mode=mode)
+    trades = run_backtest_v1_bars(bars, "SYN", PARAMS, entry, mode="bar")
+
+    assert len(table) == len(trades) > 0
+    assert table.to_trades() == trades
+    assert table[3] == trades[3]
+    assert table[-1] == trades[-1]
+    assert table[np.int64(-len(trades))] == trades[0]
+    for bad in (len(trades), -len(trades) - 1):
+        with pytest.raises(IndexError):
+            table[bad]
+    with pytest.raises(IndexError):
+        TradeTable.concat([])[5]
+    assert table[2:5].to_trades() == trades[2:5]
+    assert TradeTable.from_trades(trades).to_trades() == trades
+
+
+def test_table_reason_mask_and_taker_flag(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(5_000, seed=8))
+    table = run_backtest_v1_table(bars, "SYN", PARAMS, mode="event")
+
+    for mask, taker in zip(table.reasons.tolist(), table.exit_is_taker.tolist(), strict=True):
+        reasons = mask_to_reasons(mask)
+        assert reasons[:3] == [
+            ReasonCode.ENTRY_CROSS,
+            ReasonCode.ORDER_PLACED,
+            ReasonCode.LIMIT_FILLED,
+        ]
+        assert taker == (
+            reasons[-1] in (ReasonCode.STOP, ReasonCode.TAKE_PROFIT, ReasonCode.TIME_STOP)
+        )
+
+
+def test_table_frame_and_csv(make_v1_frame, tmp_path):
+    bars = BarArrays.from_frame(make_v1_frame(3_000, seed=2))
+    table = run_backtest_v1_table(bars, "SYN", PARAMS, mode="event")
+
+    df = table.to_frame()
+    assert list(df.columns) == [
+        "symbol",
+        "side",
+        "entry_ts",
+        "entry_px",
+        "exit_ts",
+        "exit_px",
+        "reason_mask",
+    ]
+    assert (df["symbol"] == "SYN").all()
+    assert (df["side"] == Side.LONG.value).all()
+    np.testing.assert_array_equal(df["exit_px"].to_numpy(), table.exit_px)
+
+    path = tmp_path / "trades.csv"
+    table.to_csv(path)
+    back = pd.read_csv(path)
+    assert len(back) == len(table)
+    np.testing.assert_array_equal(back["entry_ts"].to_numpy(), table.entry_ts)
+    np.testing.assert_array_equal(back["reason_mask"].to_numpy(), table.reasons)
+
+
+def test_table_parquet_roundtrip(make_v1_frame, tmp_path):
+    pytest.importorskip("pyarrow")
+    bars = BarArrays.from_frame(make_v1_frame(3_000, seed=2))
+    table = run_backtest_v1_table(bars, "SYN", PARAMS, mode="event")
+
+    path = tmp_path / "trades.parquet"
+    table.to_parquet(path)
+    back = pd.read_parquet(path)
+    np.testing.assert_array_equal(back["exit_px"].to_numpy(), table.exit_px)
+
+
+def test_concat_remaps_symbols(make_v1_frame):
+    a = run_backtest_v1_table(BarArrays.from_frame(make_v1_frame(3_000, seed=1)), "AAA", PARAMS)
+    b = run_backtest_v1_table(BarArrays.from_frame(make_v1_frame(3_000, seed=2)), "BBB", PARAMS)
+
+    both = TradeTable.concat([a, TradeTable.empty(), b, a])
+    assert both.symbols == ("AAA", "BBB")
+    assert both.to_trades() == a.to_trades() + b.to_trades() + a.to_trades()
+    assert len(TradeTable.concat([])) == 0
+
+
+def test_batch_table_for_matches_trades_for(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(4_000, seed=5))
+    grid = [PARAMS, StrategyParams(atr_stop_mult=2.0, time_stop_bars=None)]
+    batch = run_backtest_v1_batch(bars, "SYN", grid)
+
+    for k, p in enumerate(grid):
+        assert batch.table_for(k).to_trades() == run_backtest_v1_bars(bars, "SYN", p)
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest.arrays import BarArrays
+from src.backtest.grid import run_walkforward_abc, run_walkforward_folds
+from src.backtest.metrics import compute_metrics, metrics_to_dict
+from src.backtest.splits import Fold, folds_from_config, make_walkforward_folds
+
+
+def _grid() -> list[dict]:
+    return [
+        {
+            "strategy": {"atr_stop_mult": atrm, "take_profit_r": tpr, "slippage_bps": 1.0},
+            "entry": {},
+        }
+        for atrm in (1.0, 2.0)
+        for tpr in (1.0, 2.0)
+    ]
+
+
+def test_rolling_and_anchored_fold_layout():
+    rolling = make_walkforward_folds(1_000, train_bars=400, validate_bars=100, test_bars=100)
+    assert [(f.train, f.validate, f.test) for f in rolling] == [
+        ((0, 400), (400, 500), (500, 600)),
+        ((100, 500), (500, 600), (600, 700)),
+        ((200, 600), (600, 700), (700, 800)),
+        ((300, 700), (700, 800), (800, 900)),
+        ((400, 800), (800, 900), (900, 1_000)),
+    ]
+
+    anchored = make_walkforward_folds(
+        1_000, 400, 100, 100, mode="anchored", n_folds=2, step_bars=250
+    )
+    assert anchored == [
+        Fold(index=0, train_start=0, train_stop=400, validate_stop=500, test_stop=600),
+        Fold(index=1, train_start=0, train_stop=650, validate_stop=750, test_stop=850),
+    ]
+
+    with pytest.raises(ValueError):
+        make_walkforward_folds(1_000, 400, 100, 100, n_folds=6)
+    with pytest.raises(ValueError):
+        make_walkforward_folds(1_000, 400, 100, 100, mode="expanding")
+    assert make_walkforward_folds(500, 400, 100, 100) == []
+
+
+def test_folds_from_config():
+    cfg = {
+        "mode": "anchored",
+        "folds": {"n_folds": 3, "train_bars": 200, "validate_bars": 50, "test_bars": 50},
+    }
+    folds = folds_from_config(cfg, 1_000)
+    assert len(folds) == 3
+    assert all(f.train_start == 0 for f in folds)
+    assert [f.test for f in folds] == [(250, 300), (300, 350), (350, 400)]
+
+
+def test_folds_match_abc_on_copied_frames(make_v1_frame):
+    df = make_v1_frame(4_000, seed=17)
+    bars = BarArrays.from_frame(df)
+    folds = make_walkforward_folds(len(bars), 1_500, 500, 500, mode="rolling")
+    assert len(folds) == 4
+
+    result = run_walkforward_folds(bars, "SYN", _grid(), folds)
+
+    for r in result.folds:
+        f = r.fold
+        abc = run_walkforward_abc(
+            df.iloc[slice(*f.train)].copy(),
+            df.iloc[slice(*f.validate)].copy(),
+            df.iloc[slice(*f.test)].copy(),
+            symbol="SYN",
+            grid=_grid(),
+        )
+        assert r.best_params == abc["best_params"]
+        assert r.validate_metrics == abc["validate_metrics"]
+        # Fold test metrics come from the running accumulator (sequential sums).
+        assert r.test_metrics == metrics_to_dict(r.test_accumulator.to_metrics())
+        assert r.test_metrics == pytest.approx(abc["test_metrics"], rel=1e-12, abs=1e-12)
+        assert np.all(r.test_trades.entry_ts >= bars.ts[f.validate_stop])
+
+    oos = result.oos_trades
+    assert len(oos) == sum(len(r.test_trades) for r in result.folds)
+    assert oos["fold"].is_monotonic_increasing
+    assert oos["entry_ts"].is_monotonic_increasing  # test windows tile in time
+    np.testing.assert_array_equal(
+        oos["net_pnl"].to_numpy(), np.concatenate([r.test_pnl.net_pnl for r in result.folds])
+    )
+
+    fm = result.fold_metrics
+    assert fm["fold"].tolist() == [0, 1, 2, 3]
+    assert fm["test_total_net_pnl"].tolist() == [
+        r.test_metrics["total_net_pnl"] for r in result.folds
+    ]
+
+
+def test_concurrent_folds_match_serial(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(3_000, seed=5))
+    folds = make_walkforward_folds(len(bars), 1_000, 400, 400, mode="anchored")
+
+    serial = run_walkforward_folds(bars, "SYN", _grid(), folds)
+    concurrent = run_walkforward_folds(bars, "SYN", _grid(), folds, workers=2)
+
+    pd.testing.assert_frame_equal(concurrent.fold_metrics, serial.fold_metrics)
+    pd.testing.assert_frame_equal(concurrent.oos_trades, serial.oos_trades)
+
+
+def test_bar_slices_are_views(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(500, seed=1))
+    part = bars.slice(100, 300)
+    assert len(part) == 200
+    assert np.shares_memory(part.close, bars.close)
+    assert np.shares_memory(part.vol_ratio, bars.vol_ratio)
+
+
+def test_oos_metrics_merge_fold_accumulators(make_v1_frame):
+    bars = BarArrays.from_frame(make_v1_frame(4_000, seed=23))
+    folds = make_walkforward_folds(len(bars), 1_000, 300, 300)
+    result = run_walkforward_folds(bars, "SYN", _grid(), folds)
+
+    expected = compute_metrics(result.oos_trades["net_pnl"].tolist())
+    got = result.oos_metrics
+    assert got.trades == expected.trades > 0
+    assert got.mdd == pytest.approx(expected.mdd, abs=1e-9)
+    assert got.total_net_pnl == pytest.approx(expected.total_net_pnl, abs=1e-9)